@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+OmniTasker API - Local HTTP/JSON interface to the engine
+Bulk task submission, project creation, state queries, request batching and a
+streaming task-status feed, served by Flask on a background thread
+"""
+
+import json
+import logging
+import threading
+from typing import Dict, Optional, Any
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+from OmniTasker_Events import EVENT_TOPICS
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on tasks per bulk submission and sub-requests per /api/batch call
+MAX_BATCH_SIZE = 1000
+
+# Upper bound on the tasks returned by one GET /api/tasks
+MAX_LIST_LIMIT = 1000
+
+# Per-client buffer of the event streams; a slow reader loses the oldest updates
+STREAM_BUFFER_SIZE = 1000
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+# Fields the engine sets while a task runs; clients cannot supply them
+ENGINE_TASK_FIELDS = ("minion_id", "assigned_at", "resume_status", "outcome", "finished_at", "error")
+
+
+class ApiError(Exception):
+    """Client error returned as ``{"error": message}`` with an HTTP status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def create_app(engine, max_batch: int = MAX_BATCH_SIZE) -> Flask:
+    """Build the Flask app serving ``engine`` (an OmniTaskerEngine)"""
+    app = Flask("omnitasker")
+
+    @app.errorhandler(ApiError)
+    def handle_api_error(error: ApiError):
+        return jsonify({"error": error.message}), error.status
+
+    def json_body() -> Any:
+        payload = request.get_json(silent=True)
+        if payload is None:
+            raise ApiError("Request body must be JSON")
+        return payload
+
+    def parse_task(item: Any) -> Dict[str, Any]:
+        if not isinstance(item, dict):
+            raise ApiError("Each task must be a JSON object")
+        if engine.get_task_handler(item.get("type")) is None:
+            raise ApiError(f"Unknown task type: {item.get('type')}")
+        task = {key: value for key, value in item.items() if key not in ENGINE_TASK_FIELDS}
+        if "id" in task and not (isinstance(task["id"], str) and task["id"]):
+            raise ApiError("id must be a non-empty string")
+        if "priority" in task:
+            try:
+                task["priority"] = int(task["priority"])
+            except (TypeError, ValueError):
+                raise ApiError("priority must be an integer")
+        return task
+
+    @app.route("/api/tasks", methods=["POST"])
+    def submit_tasks():
+        """Submit one task, a list of tasks, or ``{"tasks": [...]}``"""
+        payload = json_body()
+        if isinstance(payload, dict) and "tasks" in payload:
+            payload = payload["tasks"]
+        items = payload if isinstance(payload, list) else [payload]
+        if len(items) > max_batch:
+            raise ApiError(f"At most {max_batch} tasks per request", 413)
+
+        # Validate everything first so a bad item rejects the whole batch
+        tasks = [parse_task(item) for item in items]
+        client_ids = [task["id"] for task in tasks if "id" in task]
+        if len(set(client_ids)) != len(client_ids):
+            raise ApiError("Task ids must be unique", 409)
+        for task_id in client_ids:
+            if engine.task_exists(task_id):
+                raise ApiError(f"Task already exists: {task_id}", 409)
+        task_ids = engine.submit_tasks(tasks)
+        return jsonify({"accepted": len(task_ids), "task_ids": task_ids}), 202
+
+    @app.route("/api/tasks", methods=["GET"])
+    def list_tasks():
+        status = request.args.get("status")
+        project_id = request.args.get("project_id")
+        try:
+            limit = int(request.args.get("limit", 100))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ApiError("limit must be a positive integer")
+        limit = min(limit, MAX_LIST_LIMIT)
+        matching = engine.list_task_statuses(status=status, project_id=project_id)
+        return jsonify({"tasks": matching[:limit], "total": len(matching)})
+
+    @app.route("/api/tasks/<task_id>", methods=["GET"])
+    def get_task(task_id: str):
+        status = engine.get_task_status(task_id)
+        if status is None:
+            raise ApiError(f"Unknown task: {task_id}", 404)
+        return jsonify(status)
+
+    @app.route("/api/tasks/stream", methods=["GET"])
+    def stream_tasks():
+        """Newline-delimited JSON of task status changes
+
+        Optional ``task_id`` (comma-separated) and ``project_id`` filters.
+        Requested task ids are first sent with their current state.
+        """
+        task_ids = {task_id for task_id in request.args.get("task_id", "").split(",") if task_id}
+        project_id = request.args.get("project_id")
+
+        # Subscribe before reading current state so no transition is missed
+        subscription = engine.events.subscribe(("task",), capacity=STREAM_BUFFER_SIZE)
+
+        def wanted(update: Dict[str, Any]) -> bool:
+            return ((not task_ids or update["id"] in task_ids)
+                    and (not project_id or update.get("project_id") == project_id))
+
+        def generate():
+            with subscription:
+                for task_id in task_ids:
+                    status = engine.get_task_status(task_id)
+                    if status is not None:
+                        yield json.dumps(status) + "\n"
+                while True:
+                    events = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                    if not events:
+                        yield "\n"  # Heartbeat; also detects closed connections
+                        continue
+                    # Everything buffered since the last write goes out in one chunk
+                    yield "".join(json.dumps(event.payload) + "\n" for event in events if wanted(event.payload))
+
+        return Response(generate(), mimetype="application/x-ndjson")
+
+    @app.route("/api/events", methods=["GET"])
+    def stream_events():
+        """Server-Sent Events feed of task, minion and metric events
+
+        ``topics`` (comma-separated) narrows the feed. Each subscriber has its
+        own bounded buffer; a client that falls behind loses the oldest events,
+        and the ``dropped`` event field reports how many so far.
+        """
+        topics = [topic for topic in request.args.get("topics", "").split(",") if topic]
+        unknown = set(topics) - set(EVENT_TOPICS)
+        if unknown:
+            raise ApiError(f"Unknown topics: {', '.join(sorted(unknown))}")
+        subscription = engine.events.subscribe(topics, capacity=STREAM_BUFFER_SIZE)
+
+        def generate():
+            with subscription:
+                yield "retry: 2000\n\n"
+                while True:
+                    events = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                    if not events:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield "".join(
+                        f"id: {event.id}\nevent: {event.topic}\n"
+                        f"data: {json.dumps(dict(event.as_dict(), dropped=subscription.dropped))}\n\n"
+                        for event in events
+                    )
+
+        response = Response(generate(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    @app.route("/api/projects", methods=["POST"])
+    def create_project():
+        payload = json_body()
+        if not isinstance(payload, dict) or not str(payload.get("name", "")).strip():
+            raise ApiError("Project name is required")
+        assigned = payload.get("assigned_minions")
+        if assigned is not None and (
+                not isinstance(assigned, list) or any(minion_id not in engine.omni_minions for minion_id in assigned)):
+            raise ApiError("assigned_minions must be a list of known minion ids")
+
+        project_id = engine.create_project(
+            payload["name"].strip(),
+            payload.get("description", ""),
+            payload.get("tech_stack", ""),
+            assigned_minions=assigned,
+            pipeline=bool(payload.get("pipeline", True))
+        )
+        return jsonify({"project_id": project_id}), 201
+
+    @app.route("/api/projects", methods=["GET"])
+    def list_projects():
+        projects = [dict(project, id=project_id) for project_id, project in list(engine.active_projects.items())]
+        return jsonify({"projects": projects})
+
+    @app.route("/api/projects/<project_id>", methods=["GET"])
+    def get_project(project_id: str):
+        project = engine.active_projects.get(project_id)
+        if project is None:
+            raise ApiError(f"Unknown project: {project_id}", 404)
+        return jsonify(dict(project, id=project_id))
+
+    @app.route("/api/projects/<project_id>/pipeline", methods=["GET"])
+    def get_project_pipeline(project_id: str):
+        """Pipeline task counts and the planned and measured critical path"""
+        if project_id not in engine.active_projects:
+            raise ApiError(f"Unknown project: {project_id}", 404)
+        return jsonify(engine.pipeline_report(project_id))
+
+    @app.route("/api/minions", methods=["GET"])
+    def list_minions():
+        minions = [
+            {
+                "id": minion.id,
+                "name": minion.name,
+                "role": minion.role,
+                "specialization": minion.specialization,
+                "status": minion.status,
+                "current_task": minion.current_task,
+                "capabilities": list(minion.capabilities),
+                "performance": dict(minion.performance_metrics)
+            }
+            for minion in list(engine.omni_minions.values())
+        ]
+        return jsonify({"minions": minions})
+
+    @app.route("/api/status", methods=["GET"])
+    def get_status():
+        return jsonify({
+            "system_metrics": json.loads(json.dumps(engine.system_metrics, default=str)),
+            "scheduler": engine.scheduler.get_stats(),
+            "execution": engine.execution_engine.get_stats(),
+            "events": engine.events.get_stats(),
+            "fleet": engine.omni_minions.get_stats(),
+            "task_queue": engine.durable_queue.get_stats(),
+            "processes": engine.process_pool.get_stats() if engine.process_pool is not None else None,
+            "broker": engine.broker.get_stats() if engine.broker is not None else None,
+            "llm": engine.llm.get_stats() if engine.llm is not None else None,
+            "active_projects": len(engine.active_projects)
+        })
+
+    @app.route("/api/batch", methods=["POST"])
+    def batch():
+        """Run several API calls in one round trip
+
+        Body: ``{"requests": [{"method": "POST", "path": "/api/tasks", "body": {...}}, ...]}``.
+        Sub-requests run in order; each gets its own status and body.
+        """
+        payload = json_body()
+        sub_requests = payload.get("requests") if isinstance(payload, dict) else payload
+        if not isinstance(sub_requests, list):
+            raise ApiError("Expected a list of requests")
+        if len(sub_requests) > max_batch:
+            raise ApiError(f"At most {max_batch} requests per batch", 413)
+
+        client = app.test_client()
+        responses = []
+        for item in sub_requests:
+            path = item.get("path", "") if isinstance(item, dict) else ""
+            if not path.startswith("/api/") or path.startswith(("/api/batch", "/api/tasks/stream", "/api/events")):
+                responses.append({"status": 400, "body": {"error": f"Cannot batch path: {path!r}"}})
+                continue
+            response = client.open(path, method=item.get("method", "GET").upper(), json=item.get("body"))
+            responses.append({"status": response.status_code, "body": response.get_json(silent=True)})
+        return jsonify({"responses": responses})
+
+    return app
+
+
+class ApiServer:
+    """Runs the API app on a threaded WSGI server in a daemon thread"""
+
+    def __init__(self, engine, host: str = "localhost", port: int = 8000):
+        self.app = create_app(engine)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        # Port 0 binds an ephemeral port; report the real one
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, name="omni-api", daemon=True)
+        self._thread.start()
+        logger.info(f"HTTP API listening on {self.url}")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+        logger.info("HTTP API stopped")
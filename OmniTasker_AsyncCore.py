@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Async Core - Single-threaded asyncio orchestration loop
+Schedules periodic orchestration jobs as independent coroutines with their own
+intervals and jitter, and wakes event-driven jobs as soon as work arrives
+"""
+
+import asyncio
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Optional, Any, Callable, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Failing jobs back off exponentially from their interval up to this many seconds,
+# never retrying sooner than their normal interval
+MAX_ERROR_BACKOFF = 60.0
+
+
+class _Job:
+    """Book-keeping for one scheduled orchestration job"""
+
+    def __init__(self, name: str, func: Callable, interval: float, jitter: float, triggers: Tuple[str, ...]):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.triggers = triggers
+        self.failures = 0
+        self.runs = 0
+        self.event: Optional[asyncio.Event] = None
+
+
+class AsyncOrchestrationCore:
+    """Runs orchestration jobs on one asyncio event loop in a background thread
+
+    Each job is its own coroutine, so an exception in one only backs off that
+    job. Plain functions run on a small helper pool so they cannot block the
+    loop; coroutine functions are awaited directly. ``wake`` runs a job early,
+    and a job's ``triggers`` are woken every time it completes.
+    """
+
+    def __init__(self, max_blocking_workers: int = 4):
+        self._jobs: Dict[str, _Job] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._blocking_executor = ThreadPoolExecutor(
+            max_workers=max_blocking_workers, thread_name_prefix="omni-async-job"
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def add_job(self, name: str, func: Callable, interval: float,
+                jitter: float = 0.1, triggers: Iterable[str] = ()):
+        """Register a job to run every ``interval`` seconds (+/- jitter fraction)"""
+        if self._thread is not None:
+            raise RuntimeError("Jobs must be added before the async core is started")
+        self._jobs[name] = _Job(name, func, interval, jitter, tuple(triggers))
+
+    def start(self):
+        """Start the event loop thread and wait until the jobs are scheduled"""
+        self._thread = threading.Thread(target=self._run_loop, name="omni-async-core", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        logger.info(f"Async orchestration core started with {len(self._jobs)} jobs")
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel all jobs and stop the event loop"""
+        if not self.running:
+            return
+        asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._blocking_executor.shutdown(wait=False)
+
+    def wake(self, *names: str):
+        """Run the named jobs now instead of at their next interval (thread-safe)"""
+        if not self.running:
+            return
+        for name in names:
+            job = self._jobs.get(name)
+            if job is not None and job.event is not None:
+                self._loop.call_soon_threadsafe(job.event.set)
+
+    def submit(self, coro, timeout: Optional[float] = None,
+               on_done: Optional[Callable[[str, Optional[BaseException]], None]] = None) -> Future:
+        """Run a coroutine on the loop, e.g. an I/O-bound task handler
+
+        ``on_done`` receives ``"completed"``, ``"failed"``, ``"timeout"`` or
+        ``"cancelled"`` plus the exception, mirroring TaskExecutionEngine.
+        """
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), self._loop)
+        if on_done is not None:
+            future.add_done_callback(lambda f: on_done(*self._outcome(f)))
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Run and failure counts per job"""
+        return {
+            name: {"runs": job.runs, "consecutive_failures": job.failures, "interval": job.interval}
+            for name, job in self._jobs.items()
+        }
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        for job in self._jobs.values():
+            job.event = asyncio.Event()
+            self._loop.create_task(self._run_job(job))
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _run_job(self, job: _Job):
+        loop = asyncio.get_event_loop()
+        while True:
+            job.event.clear()
+            try:
+                if asyncio.iscoroutinefunction(job.func):
+                    await job.func()
+                else:
+                    await loop.run_in_executor(self._blocking_executor, job.func)
+                job.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                logger.error(f"Async job '{job.name}' error: {e}")
+            job.runs += 1
+
+            if not job.failures:
+                for name in job.triggers:
+                    triggered = self._jobs.get(name)
+                    if triggered is not None:
+                        triggered.event.set()
+
+            delay = job.interval * (1 + random.uniform(-job.jitter, job.jitter))
+            if job.failures:
+                delay = max(delay, min(delay * 2 ** job.failures, MAX_ERROR_BACKOFF))
+            # A timer rather than wait_for: wait_for can swallow a cancel that races
+            # with the event being set, leaving stop() waiting on this job forever
+            timer = loop.call_later(delay, job.event.set)
+            try:
+                await job.event.wait()
+            finally:
+                timer.cancel()
+
+    async def _cancel_all(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _outcome(future: Future) -> Tuple[str, Optional[BaseException]]:
+        if future.cancelled():
+            return "cancelled", None
+        error = future.exception()
+        if error is None:
+            return "completed", None
+        if isinstance(error, asyncio.TimeoutError):
+            return "timeout", error
+        return "failed", error
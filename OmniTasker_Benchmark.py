@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Benchmark - Synthetic load for the headless orchestration core
+Drives generated projects and tasks through the durable queue, scheduler and
+execute_task dispatch, and writes latency, throughput, database write rate
+and memory figures as JSON that can be compared between versions
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from OmniTasker_Engine import OmniTaskerEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = "code_generation=5,testing=3,deployment=2"
+MEMORY_SAMPLE_TASKS = 10000
+
+# Metric -> True when higher is better; used by --compare
+METRIC_DIRECTIONS = {
+    "dispatch_latency_ms.p50": False,
+    "dispatch_latency_ms.p90": False,
+    "dispatch_latency_ms.p99": False,
+    "end_to_end_latency_ms.p50": False,
+    "end_to_end_latency_ms.p99": False,
+    "throughput_tasks_per_second": True,
+    "db_writes.operations_per_second": True,
+    "memory.bytes_per_10k_tasks": False,
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """``"code_generation=5,testing=3"`` -> task type weights"""
+    mix = {}
+    for part in spec.split(","):
+        task_type, _, weight = part.partition("=")
+        mix[task_type.strip()] = float(weight or 1)
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ValueError(f"Invalid task mix: {spec!r}")
+    return mix
+
+
+def priority_sampler(spec: str, rng: random.Random):
+    """Priority generator: ``uniform`` (1-10), ``skewed`` (mostly urgent) or a fixed number"""
+    if spec == "uniform":
+        return lambda: rng.randint(1, 10)
+    if spec == "skewed":
+        # P(priority = k) proportional to 1/k
+        weights = [1.0 / k for k in range(1, 11)]
+        return lambda: rng.choices(range(1, 11), weights)[0]
+    priority = int(spec)
+    return lambda: priority
+
+
+def generate_workload(projects: int, tasks_per_project: int, mix: Dict[str, float],
+                      priorities: str = "uniform", seed: int = 0) -> List[List[Dict[str, Any]]]:
+    """One list of task dicts per synthetic project"""
+    rng = random.Random(seed)
+    sample_priority = priority_sampler(priorities, rng)
+    types, weights = list(mix), list(mix.values())
+    workload = []
+    for p in range(projects):
+        project_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        workload.append([
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "type": task_type,
+                "project_id": project_id,
+                "title": f"bench-{p}-{t} {task_type}",
+                "description": f"Synthetic {task_type} task",
+                "priority": sample_priority(),
+            }
+            for t, task_type in enumerate(rng.choices(types, weights, k=tasks_per_project))
+        ])
+    return workload
+
+
+def percentiles(values: List[float], points=(50, 90, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles plus mean and max"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {f"p{point}": ordered[min(len(ordered) - 1, max(0, int(round(point / 100.0 * len(ordered))) - 1))]
+              for point in points}
+    result["mean"] = sum(ordered) / len(ordered)
+    result["max"] = ordered[-1]
+    return result
+
+
+@contextmanager
+def isolated_workdir(keep: bool = False) -> Iterator[str]:
+    """Run in a scratch directory so the engine's data/ files are the benchmark's own"""
+    previous = os.getcwd()
+    path = tempfile.mkdtemp(prefix="omnitasker-bench-")
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        if not keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class TaskTimeline:
+    """Follows task events and records when each task was queued, started and finished"""
+
+    FINAL = ("completed", "failed", "timeout", "cancelled")
+
+    def __init__(self, engine: OmniTaskerEngine, expected: int):
+        self.expected = expected
+        self.queued: Dict[str, float] = {}
+        self.started: Dict[str, float] = {}
+        self.finished: Dict[str, Tuple[float, str]] = {}
+        self.done = threading.Event()
+        self._subscription = engine.events.subscribe(("task",), capacity=4 * expected + 1024)
+        self._thread = threading.Thread(target=self._run, name="omni-bench-timeline", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float) -> bool:
+        return self.done.wait(timeout)
+
+    def close(self):
+        self._subscription.close()
+        self._thread.join(5.0)
+
+    @property
+    def dropped(self) -> int:
+        return self._subscription.dropped
+
+    def _run(self):
+        while not self._subscription.closed:
+            for event in self._subscription.get(timeout=0.5):
+                task = event.payload
+                status = task["status"]
+                if status == "pending":
+                    self.queued.setdefault(task["id"], task["updated_at"])
+                elif status == "running":
+                    self.started.setdefault(task["id"], task["updated_at"])
+                elif status in self.FINAL:
+                    self.finished[task["id"]] = (task["updated_at"], status)
+            if len(self.finished) >= self.expected:
+                self.done.set()
+
+
+def measure_memory(workload: List[List[Dict[str, Any]]], fleet_path: Optional[str]) -> Dict[str, Any]:
+    """Bytes the engine retains per 10k queued tasks (tracemalloc, no dispatch running)"""
+    tasks = [dict(task) for project in workload for task in project][:MEMORY_SAMPLE_TASKS]
+    with isolated_workdir():
+        engine = OmniTaskerEngine(fleet_path=fleet_path)
+        try:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            for start in range(0, len(tasks), 1000):
+                engine.submit_tasks(tasks[start:start + 1000])
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        finally:
+            engine.shutdown()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "sample_tasks": len(tasks),
+        "bytes_retained": retained,
+        "bytes_per_10k_tasks": retained * 10000 / len(tasks) if tasks else 0,
+    }
+
+
+def measure_throughput(workload: List[List[Dict[str, Any]]], fleet_path: Optional[str],
+                       use_async_core: bool = False, work_ms: float = 0.0, rate: float = 0.0,
+                       timeout: float = 600.0) -> Dict[str, Any]:
+    """Run the workload through a started engine until every task has finished"""
+    total = sum(len(project) for project in workload)
+    with isolated_workdir():
+        engine = OmniTaskerEngine(fleet_path=fleet_path)
+        if work_ms:
+            for name in ("handle_code_generation_task", "handle_testing_task",
+                         "handle_deployment_task", "handle_design_task"):
+                handler = getattr(engine, name)
+                setattr(engine, name, lambda task, handler=handler: (time.sleep(work_ms / 1000.0), handler(task))[1])
+        timeline = TaskTimeline(engine, total)
+        engine.start(use_async_core=use_async_core, process_workers=0, broker_path="",
+                     metrics_port=0)
+        try:
+            queue_before = engine.durable_queue.get_stats()
+            db_path = engine.project_database.db_path
+            started = time.perf_counter()
+            submitted = 0
+            for project in workload:
+                engine.submit_tasks([dict(task) for task in project])
+                submitted += len(project)
+                if rate:
+                    # Open-loop arrivals: hold the configured average rate
+                    delay = submitted / rate - (time.perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+            submit_seconds = time.perf_counter() - started
+            completed = timeline.wait(timeout)
+            elapsed = time.perf_counter() - started
+            queue_after = engine.durable_queue.get_stats()
+            db_bytes = sum(os.path.getsize(path) for path in (db_path, db_path + "-wal") if os.path.exists(path))
+        finally:
+            timeline.close()
+            engine.shutdown()
+
+    dispatch = [(timeline.started[task_id] - queued) * 1000.0
+                for task_id, queued in timeline.queued.items() if task_id in timeline.started]
+    end_to_end = [(timeline.finished[task_id][0] - queued) * 1000.0
+                  for task_id, queued in timeline.queued.items() if task_id in timeline.finished]
+    outcomes: Dict[str, int] = {}
+    for _, outcome in timeline.finished.values():
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    operations = queue_after["operations"] - queue_before["operations"]
+    commits = queue_after["commits"] - queue_before["commits"]
+    return {
+        "tasks": total,
+        "finished": len(timeline.finished),
+        "timed_out": not completed,
+        "outcomes": outcomes,
+        "events_dropped": timeline.dropped,
+        "submit_seconds": submit_seconds,
+        "elapsed_seconds": elapsed,
+        "throughput_tasks_per_second": len(timeline.finished) / elapsed if elapsed else 0.0,
+        "dispatch_latency_ms": percentiles(dispatch),
+        "end_to_end_latency_ms": percentiles(end_to_end),
+        "db_writes": {
+            "operations": operations,
+            "commits": commits,
+            "operations_per_commit": operations / commits if commits else 0.0,
+            "operations_per_second": operations / elapsed if elapsed else 0.0,
+            "commits_per_second": commits / elapsed if elapsed else 0.0,
+            "database_bytes": db_bytes,
+        },
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """What the numbers were measured on, so comparisons can be judged"""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ""
+    return {
+        "revision": revision or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics in ``current`` worse than ``baseline`` by more than ``tolerance`` (a fraction)"""
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    regressions = []
+    for metric, higher_is_better in METRIC_DIRECTIONS.items():
+        old, new = before.get(metric), now.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(f"{metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    fleet_path = os.path.abspath(args.fleet) if args.fleet else None
+    workload = generate_workload(args.projects, args.tasks_per_project, mix, args.priorities, args.seed)
+
+    results: Dict[str, Any] = {}
+    if not args.skip_memory:
+        results["memory"] = measure_memory(workload, fleet_path)
+    results.update(measure_throughput(
+        workload, fleet_path, use_async_core=args.async_core, work_ms=args.work_ms,
+        rate=args.rate, timeout=args.timeout
+    ))
+    return {
+        "benchmark": "orchestration_core",
+        "environment": environment(),
+        "config": {
+            "projects": args.projects,
+            "tasks_per_project": args.tasks_per_project,
+            "mix": mix,
+            "priorities": args.priorities,
+            "seed": args.seed,
+            "work_ms": args.work_ms,
+            "rate": args.rate,
+            "async_core": args.async_core,
+            "fleet": args.fleet,
+        },
+        "results": results,
+    }
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    results = report["results"]
+    dispatch = results["dispatch_latency_ms"]
+    end_to_end = results["end_to_end_latency_ms"]
+    lines = [
+        f"Tasks: {results['finished']}/{results['tasks']} finished in {results['elapsed_seconds']:.2f}s "
+        f"({results['throughput_tasks_per_second']:.0f} tasks/s) {results['outcomes']}",
+        f"Enqueue -> dispatch (ms): p50 {dispatch.get('p50', 0):.2f}  p90 {dispatch.get('p90', 0):.2f}  "
+        f"p99 {dispatch.get('p99', 0):.2f}  max {dispatch.get('max', 0):.2f}",
+        f"Enqueue -> finished (ms): p50 {end_to_end.get('p50', 0):.2f}  p99 {end_to_end.get('p99', 0):.2f}",
+        f"DB writes: {results['db_writes']['operations_per_second']:.0f} ops/s in "
+        f"{results['db_writes']['commits_per_second']:.0f} commits/s",
+    ]
+    if "memory" in results:
+        lines.append(f"Memory: {results['memory']['bytes_per_10k_tasks'] / 1e6:.1f} MB per 10k queued tasks")
+    return "\n".join(lines)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the OmniTasker orchestration core with synthetic load")
+    parser.add_argument("--projects", type=int, default=10, help="synthetic projects (default 10)")
+    parser.add_argument("--tasks-per-project", type=int, default=1000, help="tasks per project (default 1000)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"task type weights (default {DEFAULT_MIX})")
+    parser.add_argument("--priorities", default="uniform",
+                        help="priority distribution: uniform, skewed or a fixed priority (default uniform)")
+    parser.add_argument("--work-ms", type=float, default=0.0,
+                        help="simulated work per task in milliseconds (default 0: measure the core alone)")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="submit at this many tasks per second instead of all at once")
+    parser.add_argument("--async-core", action="store_true", help="orchestrate on the asyncio core")
+    parser.add_argument("--fleet", default=None, metavar="PATH", help="fleet definition YAML")
+    parser.add_argument("--seed", type=int, default=0, help="workload random seed (default 0)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="give up after this many seconds")
+    parser.add_argument("--skip-memory", action="store_true", help="skip the tracemalloc memory pass")
+    parser.add_argument("--output", metavar="PATH", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--compare", metavar="PATH",
+                        help="baseline results to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative regression for --compare (default 0.10)")
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    # Per-task INFO logging would dominate the measurement
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    report = run_benchmark(args)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+        print(format_summary(report))
+        print(f"Results written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print("WARNING baseline was run with a different workload configuration", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
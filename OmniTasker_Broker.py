@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Broker - SQLite-backed task broker for out-of-process OmniMinions
+Worker processes on the engine's host register their minions and
+capabilities, lease tasks, heartbeat to keep their leases, and report
+results; tasks whose lease expires are re-delivered to another worker
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Any, Callable, Iterator, Tuple
+
+from OmniTasker_Database import ConnectionPool
+from OmniTasker_Scheduler import DEFAULT_PRIORITY, TASK_TYPE_CAPABILITIES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BROKER_PATH = "data/omnitasker_broker.db"
+DEFAULT_LEASE_SECONDS = 60.0
+# A task is failed for good after this many deliveries
+DEFAULT_MAX_ATTEMPTS = 3
+# Workers heartbeat every lease/HEARTBEAT_FRACTION seconds
+HEARTBEAT_FRACTION = 3
+
+BROKER_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS broker_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO broker_meta (key, value) VALUES ('version', 0)",
+    """
+    CREATE TABLE IF NOT EXISTS broker_workers (
+        worker_id TEXT PRIMARY KEY,
+        node TEXT,
+        state TEXT NOT NULL DEFAULT 'active',
+        registered_at REAL NOT NULL,
+        last_heartbeat REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS broker_minions (
+        minion_id TEXT PRIMARY KEY,
+        worker_id TEXT NOT NULL,
+        name TEXT,
+        role TEXT,
+        capabilities TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS broker_tasks (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        capability TEXT,
+        priority INTEGER NOT NULL DEFAULT 5,
+        payload TEXT NOT NULL,
+        state TEXT NOT NULL DEFAULT 'queued',
+        worker_id TEXT,
+        minion_id TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        leased_at REAL,
+        lease_expires REAL,
+        result TEXT,
+        error TEXT,
+        enqueued_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_broker_tasks_ready ON broker_tasks (state, capability, priority, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_broker_tasks_lease ON broker_tasks (state, lease_expires)",
+    "CREATE INDEX IF NOT EXISTS idx_broker_tasks_version ON broker_tasks (version)",
+)
+
+SQL_NEXT_VERSION = "UPDATE broker_meta SET value = value + 1 WHERE key = 'version'"
+SQL_CURRENT_VERSION = "SELECT value FROM broker_meta WHERE key = 'version'"
+SQL_CURRENT_CURSOR = """
+    SELECT (SELECT value FROM broker_meta WHERE key = 'version'), (SELECT COALESCE(MAX(seq), 0) FROM broker_tasks)
+"""
+SQL_UPSERT_WORKER = """
+    INSERT INTO broker_workers (worker_id, node, state, registered_at, last_heartbeat)
+    VALUES (?, ?, 'active', ?, ?)
+    ON CONFLICT (worker_id) DO UPDATE SET node = excluded.node, state = 'active',
+        last_heartbeat = excluded.last_heartbeat
+"""
+SQL_UPSERT_MINION = """
+    INSERT INTO broker_minions (minion_id, worker_id, name, role, capabilities) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (minion_id) DO UPDATE SET worker_id = excluded.worker_id, name = excluded.name,
+        role = excluded.role, capabilities = excluded.capabilities
+"""
+SQL_HEARTBEAT = "UPDATE broker_workers SET last_heartbeat = ?, state = 'active' WHERE worker_id = ?"
+SQL_EXTEND_LEASES = "UPDATE broker_tasks SET lease_expires = ? WHERE state = 'leased' AND worker_id = ?"
+SQL_ENQUEUE = """
+    INSERT INTO broker_tasks (id, capability, priority, payload, enqueued_at, updated_at, version)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+# Expired leases go back to the queue, or fail once the attempts are used up
+SQL_REQUEUE_EXPIRED = """
+    UPDATE broker_tasks SET state = 'queued', worker_id = NULL, minion_id = NULL,
+        lease_expires = NULL, updated_at = ?, version = ?
+    WHERE state = 'leased' AND lease_expires < ? AND attempts < ?
+"""
+SQL_FAIL_EXPIRED = """
+    UPDATE broker_tasks SET state = 'failed', error = 'lease expired ' || attempts || ' times',
+        lease_expires = NULL, updated_at = ?, version = ?
+    WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+"""
+SQL_MARK_LOST_WORKERS = "UPDATE broker_workers SET state = 'lost' WHERE state = 'active' AND last_heartbeat < ?"
+# Read-only checks that let idle polls and reaps skip the write lock
+SQL_HAS_READY = "SELECT 1 FROM broker_tasks WHERE state = 'queued' AND capability IN ({placeholders}) LIMIT 1"
+SQL_HAS_EXPIRED = """
+    SELECT 1 FROM broker_tasks WHERE state = 'leased' AND lease_expires < ?
+    UNION ALL SELECT 1 FROM broker_workers WHERE state = 'active' AND last_heartbeat < ?
+    LIMIT 1
+"""
+SQL_LEASE = """
+    UPDATE broker_tasks SET state = 'leased', worker_id = ?, minion_id = ?, attempts = attempts + 1,
+        leased_at = ?, lease_expires = ?, updated_at = ?, version = ?
+    WHERE id IN (
+        SELECT id FROM broker_tasks WHERE state = 'queued' AND capability IN ({placeholders})
+        ORDER BY priority, seq LIMIT ?
+    )
+    RETURNING id, payload, attempts
+"""
+SQL_COMPLETE = """
+    UPDATE broker_tasks SET state = ?, result = ?, error = ?, lease_expires = NULL, updated_at = ?, version = ?
+    WHERE id = ? AND state = 'leased' AND worker_id = ? AND attempts = ?
+"""
+SQL_RELEASE_WORKER = """
+    UPDATE broker_tasks SET state = 'queued', worker_id = NULL, minion_id = NULL,
+        lease_expires = NULL, updated_at = ?, version = ?
+    WHERE state = 'leased' AND worker_id = ?
+"""
+# Paged by (version, seq): one version can stamp more rows than fit in a page
+SQL_CHANGES_SINCE = """
+    SELECT seq, id, capability, priority, payload, state, worker_id, minion_id, attempts,
+           leased_at, updated_at, error, version
+    FROM broker_tasks WHERE version >= ? AND (version > ? OR seq > ?) ORDER BY version, seq LIMIT ?
+"""
+SQL_LIST_MINIONS = """
+    SELECT m.minion_id, m.worker_id, m.name, m.role, m.capabilities, w.node, w.state AS worker_state,
+           w.last_heartbeat,
+           (SELECT t.id FROM broker_tasks t WHERE t.state = 'leased' AND t.minion_id = m.minion_id) AS task_id
+    FROM broker_minions m JOIN broker_workers w ON w.worker_id = m.worker_id
+"""
+SQL_TASK_COUNTS = "SELECT state, COUNT(*) AS count FROM broker_tasks GROUP BY state"
+SQL_WORKER_COUNTS = "SELECT state, COUNT(*) AS count FROM broker_workers GROUP BY state"
+
+
+class TaskBroker:
+    """Durable task queue shared by the engine and worker processes
+
+    Every state change runs in a ``BEGIN IMMEDIATE`` transaction, so the
+    engine and any number of worker processes can use it concurrently.
+    Single host only: the database is in WAL mode, whose shared-memory
+    index does not work over network filesystems, so every process must
+    open the file from a local disk. Each change also stamps the task with
+    a broker-wide version number, which lets the engine follow all
+    transitions cheaply with ``changes_since``.
+
+    Idle lease polls and reaps with nothing to do only read; the write
+    lock is taken when there is a task to lease or a lease to expire.
+
+    A lease is identified by (worker, attempt number): a worker whose lease
+    expired and was re-delivered can no longer complete the task.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_BROKER_PATH,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.pool = ConnectionPool(db_path, busy_timeout=30.0)
+
+    def initialize_schema(self):
+        with self._write() as conn:
+            for statement in BROKER_SCHEMA:
+                conn.execute(statement)
+
+    # -- worker side -------------------------------------------------------
+
+    def register_worker(self, worker_id: str, minions: Iterable[Dict[str, Any]], node: Optional[str] = None):
+        """Register (or re-register) a worker and the minions it hosts"""
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(SQL_UPSERT_WORKER, (worker_id, node or socket.gethostname(), now, now))
+            conn.executemany(SQL_UPSERT_MINION, [
+                (minion["id"], worker_id, minion.get("name"), minion.get("role"),
+                 json.dumps(list(minion.get("capabilities") or ())))
+                for minion in minions
+            ])
+        logger.info(f"Broker worker {worker_id} registered")
+
+    def heartbeat(self, worker_id: str) -> int:
+        """Mark the worker alive and extend all of its leases; returns leases extended"""
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(SQL_HEARTBEAT, (now, worker_id))
+            return conn.execute(SQL_EXTEND_LEASES, (now + self.lease_seconds, worker_id)).rowcount
+
+    def deregister_worker(self, worker_id: str):
+        """Remove a worker; tasks it still holds are re-queued immediately"""
+        now = time.time()
+        with self._write() as conn:
+            released = conn.execute(SQL_RELEASE_WORKER, (now, self._next_version(conn), worker_id)).rowcount
+            conn.execute("DELETE FROM broker_minions WHERE worker_id = ?", (worker_id,))
+            conn.execute("UPDATE broker_workers SET state = 'stopped' WHERE worker_id = ?", (worker_id,))
+        logger.info(f"Broker worker {worker_id} deregistered ({released} tasks re-queued)")
+
+    def lease(self, worker_id: str, minion_id: str, capabilities: Iterable[str], limit: int = 1) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` of the best queued tasks matching ``capabilities``"""
+        capabilities = list(capabilities)
+        if not capabilities:
+            return []
+        placeholders = ", ".join("?" * len(capabilities))
+        ready = self.pool.connection().execute(SQL_HAS_READY.format(placeholders=placeholders), capabilities)
+        if ready.fetchone() is None:
+            return []
+        now = time.time()
+        sql = SQL_LEASE.format(placeholders=placeholders)
+        with self._write() as conn:
+            rows = conn.execute(sql, (
+                worker_id, minion_id, now, now + self.lease_seconds, now, self._next_version(conn),
+                *capabilities, limit
+            )).fetchall()
+        tasks = []
+        for row in rows:
+            task = json.loads(row["payload"])
+            task["attempt"] = row["attempts"]
+            tasks.append(task)
+        return tasks
+
+    def complete(self, task_id: str, worker_id: str, attempt: int, outcome: str = "done",
+                 result: Any = None, error: Optional[str] = None) -> bool:
+        """Report a leased task as done or failed; False if the lease was lost"""
+        now = time.time()
+        with self._write() as conn:
+            updated = conn.execute(SQL_COMPLETE, (
+                outcome, json.dumps(result, default=str), error, now, self._next_version(conn),
+                task_id, worker_id, attempt
+            )).rowcount
+        if not updated:
+            logger.warning(f"Result for task {task_id} from {worker_id} ignored: lease no longer held")
+        return bool(updated)
+
+    # -- coordinator side --------------------------------------------------
+
+    def enqueue(self, tasks: Iterable[Dict[str, Any]]) -> List[str]:
+        """Append tasks to the queue in one transaction"""
+        now = time.time()
+        rows = []
+        for task in tasks:
+            task.setdefault("id", str(uuid.uuid4()))
+            task.setdefault("priority", DEFAULT_PRIORITY)
+            task.setdefault("capability", TASK_TYPE_CAPABILITIES.get(task.get("type"), task.get("type")))
+            rows.append((task["id"], task["capability"], int(task["priority"]), json.dumps(task, default=str), now, now))
+        if not rows:
+            return []
+        with self._write() as conn:
+            version = self._next_version(conn)
+            conn.executemany(SQL_ENQUEUE, [row + (version,) for row in rows])
+        return [row[0] for row in rows]
+
+    def reap(self) -> int:
+        """Re-queue (or fail) tasks whose lease expired and mark silent workers lost; returns tasks affected
+
+        Called periodically by the engine's broker sync and by each worker's
+        heartbeat thread.
+        """
+        now = time.time()
+        if self.pool.connection().execute(SQL_HAS_EXPIRED, (now, now - self.lease_seconds)).fetchone() is None:
+            return 0
+        with self._write() as conn:
+            return self._reap_locked(conn, now)
+
+    def changes_since(self, cursor: Tuple[int, int] = (0, 0),
+                      limit: int = 1000) -> Tuple[List[Dict[str, Any]], Tuple[int, int]]:
+        """Task rows changed after ``cursor``, oldest first, and the new cursor
+
+        A cursor is a (version, seq) pair, so a page may end part-way through
+        the rows one operation stamped with a single version.
+        """
+        version, seq = cursor
+        rows = [dict(row) for row in self.pool.connection().execute(SQL_CHANGES_SINCE, (version, version, seq, limit))]
+        return rows, ((rows[-1]["version"], rows[-1]["seq"]) if rows else cursor)
+
+    def current_cursor(self) -> Tuple[int, int]:
+        """A cursor past every change made so far"""
+        version, seq = self.pool.connection().execute(SQL_CURRENT_CURSOR).fetchone()
+        return version, seq
+
+    def list_minions(self) -> List[Dict[str, Any]]:
+        minions = []
+        for row in self.pool.connection().execute(SQL_LIST_MINIONS):
+            minion = dict(row)
+            minion["capabilities"] = json.loads(minion["capabilities"])
+            minions.append(minion)
+        return minions
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self.pool.connection()
+        return {
+            "tasks": {row["state"]: row["count"] for row in conn.execute(SQL_TASK_COUNTS)},
+            "workers": {row["state"]: row["count"] for row in conn.execute(SQL_WORKER_COUNTS)},
+        }
+
+    def close(self):
+        self.pool.close_all()
+
+    def _reap_locked(self, conn, now: float) -> int:
+        version = self._next_version(conn)
+        requeued = conn.execute(SQL_REQUEUE_EXPIRED, (now, version, now, self.max_attempts)).rowcount
+        failed = conn.execute(SQL_FAIL_EXPIRED, (now, version, now, self.max_attempts)).rowcount
+        conn.execute(SQL_MARK_LOST_WORKERS, (now - self.lease_seconds,))
+        if requeued or failed:
+            logger.warning(f"Broker re-queued {requeued} and failed {failed} tasks with expired leases")
+        return requeued + failed
+
+    def _next_version(self, conn) -> int:
+        conn.execute(SQL_NEXT_VERSION)
+        return conn.execute(SQL_CURRENT_VERSION).fetchone()[0]
+
+    @contextmanager
+    def _write(self) -> Iterator[Any]:
+        """Serialize writers across processes; the version counter relies on it"""
+        conn = self.pool.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+class BrokerWorker:
+    """Hosts minions on this node and runs the tasks they lease from a broker
+
+    One thread per minion pulls a task matching the minion's capabilities,
+    runs the handler for its type and reports the result; another thread
+    heartbeats so leases stay valid while handlers run. If the process
+    dies, its leases expire and the broker re-delivers the tasks.
+    """
+
+    def __init__(self, broker: TaskBroker, minions: List[Dict[str, Any]],
+                 handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+                 worker_id: Optional[str] = None, poll_interval: float = 0.5):
+        if handlers is None:
+            from OmniTasker_Handlers import TASK_HANDLERS
+            handlers = TASK_HANDLERS
+        self.broker = broker
+        self.minions = minions
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stats = {"completed": 0, "failed": 0, "lost_leases": 0}
+
+    def start(self):
+        self.broker.register_worker(self.worker_id, self.minions)
+        self._threads.append(threading.Thread(target=self._heartbeat_loop, name="omni-broker-heartbeat", daemon=True))
+        for minion in self.minions:
+            self._threads.append(threading.Thread(
+                target=self._minion_loop, args=(minion,), name=f"omni-minion-{minion['id']}", daemon=True
+            ))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Broker worker {self.worker_id} started with {len(self.minions)} minions")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self.broker.deregister_worker(self.worker_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _heartbeat_loop(self):
+        interval = self.broker.lease_seconds / HEARTBEAT_FRACTION
+        while not self._stop.wait(interval):
+            try:
+                self.broker.heartbeat(self.worker_id)
+                # Expired leases are re-delivered even when no engine is following the broker
+                self.broker.reap()
+            except Exception as e:
+                logger.error(f"Broker heartbeat error: {e}")
+
+    def _minion_loop(self, minion: Dict[str, Any]):
+        while not self._stop.is_set():
+            try:
+                tasks = self.broker.lease(self.worker_id, minion["id"], minion.get("capabilities") or ())
+            except Exception as e:
+                logger.error(f"Broker lease error ({minion['id']}): {e}")
+                tasks = []
+            if not tasks:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            task = tasks[0]
+            handler = self.handlers.get(task.get("type"))
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown task type: {task.get('type')}")
+                result = handler(task)
+            except Exception as e:
+                logger.error(f"Task execution error ({task['id']}): {e}")
+                reported = self.broker.complete(task["id"], self.worker_id, task["attempt"], "failed", error=str(e))
+                self._stats["failed"] += 1
+            else:
+                reported = self.broker.complete(task["id"], self.worker_id, task["attempt"], "done", result=result)
+                self._stats["completed"] += 1
+            if not reported:
+                self._stats["lost_leases"] += 1
+
+
+def default_minions(worker_id: str) -> List[Dict[str, Any]]:
+    """One minion per built-in task capability"""
+    return [
+        {"id": f"{worker_id}:{capability}", "name": f"Remote-{capability}", "role": "Remote Worker",
+         "capabilities": [capability]}
+        for capability in sorted(set(TASK_TYPE_CAPABILITIES.values()))
+    ]
+
+
+def parse_minion(spec: str) -> Dict[str, Any]:
+    """``id:cap1+cap2`` -> minion dict"""
+    minion_id, _, capabilities = spec.partition(":")
+    return {"id": minion_id, "name": minion_id, "role": "Remote Worker",
+            "capabilities": [capability for capability in capabilities.split("+") if capability]}
+
+
+def main():
+    """Worker node entry point: python OmniTasker_Broker.py --broker data/omnitasker_broker.db"""
+    from OmniTasker_Logging import configure_logging
+
+    parser = argparse.ArgumentParser(description="OmniTasker distributed worker")
+    parser.add_argument("--broker", default=os.getenv("OMNITASKER_BROKER", DEFAULT_BROKER_PATH),
+                        help="path to the broker database shared with the engine (on a local disk)")
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--minion", action="append", default=[], metavar="ID:CAP1+CAP2",
+                        help="minion to host (repeatable; default: one per built-in capability)")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    args = parser.parse_args()
+
+    configure_logging(filename="omnitasker_worker.log")
+    broker = TaskBroker(args.broker, lease_seconds=args.lease_seconds)
+    broker.initialize_schema()
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    minions = [parse_minion(spec) for spec in args.minion] or default_minions(worker_id)
+
+    worker = BrokerWorker(broker, minions, worker_id=worker_id)
+    worker.start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+        broker.close()
+
+if __name__ == "__main__":
+    main()
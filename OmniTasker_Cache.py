@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Cache - Content-addressed cache for LLM and analysis results
+A byte-bounded in-memory LRU in front of the response_cache table; entries
+are keyed by a hash of the normalized prompt, model and parameters
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any, Tuple
+
+from OmniTasker_Database import OmniDatabase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+
+def normalize_prompt(prompt: str) -> str:
+    """Fold the differences that do not change what is being asked: surrounding whitespace and line endings
+
+    Everything else is kept: in code-generation prompts case, indentation and
+    punctuation are part of the request ("getUser" is not "GetUser").
+    """
+    return prompt.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def cache_key(prompt: str, model: str = "", **params: Any) -> str:
+    """SHA-256 of the normalized prompt, the model and the (sorted) parameters"""
+    material = json.dumps([normalize_prompt(prompt), model, params], sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of string values
+
+    Lookups hit an OrderedDict LRU first, bounded by the total size of
+    the values it holds rather than their number, then the SQLite table,
+    which promotes what it finds into memory. Every entry carries its own
+    expiry. A repeated request is answered from memory in microseconds;
+    after a restart, from one indexed SQLite read.
+    """
+
+    def __init__(self, database: OmniDatabase,
+                 max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                 default_ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.database = database
+        self.max_memory_bytes = max_memory_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        # key -> (value, expires_at, size)
+        self._memory: "OrderedDict[str, Tuple[str, Optional[float], int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+                       "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[0]
+                self._discard_locked(key)
+                self._stats["expired"] += 1
+
+        try:
+            row = self.database.get_cached_response(key, now)
+        except Exception as e:
+            logger.error(f"Response cache read error: {e}")
+            row = None
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember_locked(key, row["value"], row["expires_at"])
+        return row["value"]
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store ``value`` for ``ttl`` seconds (default: ``default_ttl``; None there means no expiry)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._remember_locked(key, value, expires_at)
+            self._stats["stores"] += 1
+        try:
+            self.database.put_cached_response(key, value, expires_at)
+        except Exception as e:
+            logger.error(f"Response cache write error: {e}")
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one entry, or everything when ``key`` is None; returns stored entries removed"""
+        with self._lock:
+            if key is None:
+                self._memory.clear()
+                self._memory_bytes = 0
+            else:
+                self._discard_locked(key)
+            self._stats["invalidations"] += 1
+        return self.database.delete_cached_responses(None if key is None else [key])
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers; returns stored entries removed"""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, (_, expires_at, _) in self._memory.items()
+                        if expires_at is not None and expires_at <= now]:
+                self._discard_locked(key)
+                self._stats["expired"] += 1
+        return self.database.purge_cached_responses(now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _remember_locked(self, key: str, value: str, expires_at: Optional[float]):
+        self._discard_locked(key)
+        size = len(value.encode("utf-8")) + len(key)
+        if size > self.max_memory_bytes:
+            return  # Larger than the whole memory tier; served from disk only
+        self._memory[key] = (value, expires_at, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, _, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+            self._stats["evictions"] += 1
+
+    def _discard_locked(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Database - Pooled SQLite persistence layer
+Per-thread WAL-mode connections with tuned pragmas and cached prepared
+statements, plus typed repository methods for projects, tasks and metrics
+"""
+
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new connection; journal_mode=WAL persists in the file itself
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+)
+
+# sqlite3 caches compiled statements per connection keyed by SQL text, so all
+# queries are module constants to keep hitting that cache
+STATEMENT_CACHE_SIZE = 256
+
+# Per-minion pre-aggregated metric tables: (name suffix, bucket width in seconds)
+ROLLUP_GRANULARITIES = (
+    ("minute", 60),
+    ("hour", 3600),
+    ("day", 86400),
+)
+
+BASE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS projects (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'planning',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        assigned_minions TEXT,
+        progress REAL DEFAULT 0.0,
+        metadata TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        project_id TEXT,
+        minion_id TEXT,
+        title TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'pending',
+        priority INTEGER DEFAULT 5,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP,
+        estimated_hours REAL,
+        actual_hours REAL,
+        FOREIGN KEY (project_id) REFERENCES projects (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        minion_id TEXT,
+        metric_type TEXT,
+        value REAL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+ROLLUP_SCHEMA = tuple(
+    f"""
+    CREATE TABLE IF NOT EXISTS metrics_rollup_{name} (
+        minion_id TEXT NOT NULL,
+        metric_type TEXT NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        sample_count INTEGER NOT NULL,
+        value_sum REAL NOT NULL,
+        value_min REAL NOT NULL,
+        value_max REAL NOT NULL,
+        PRIMARY KEY (minion_id, metric_type, bucket_start)
+    ) WITHOUT ROWID
+    """
+    for name, _ in ROLLUP_GRANULARITIES
+)
+
+# Folds raw metrics rows with id > ? into a rollup table. The WHERE clause is
+# required by SQLite to parse an upsert on INSERT ... SELECT.
+SQL_ROLLUP_UPSERT = {
+    name: f"""
+    INSERT INTO metrics_rollup_{name}
+        (minion_id, metric_type, bucket_start, sample_count, value_sum, value_min, value_max)
+    SELECT minion_id, metric_type,
+           CAST(strftime('%s', timestamp) AS INTEGER) / {width} * {width},
+           COUNT(*), SUM(value), MIN(value), MAX(value)
+    FROM metrics
+    WHERE id > ? AND minion_id IS NOT NULL AND metric_type IS NOT NULL AND value IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (minion_id, metric_type, bucket_start) DO UPDATE SET
+        sample_count = sample_count + excluded.sample_count,
+        value_sum = value_sum + excluded.value_sum,
+        value_min = MIN(value_min, excluded.value_min),
+        value_max = MAX(value_max, excluded.value_max)
+    """
+    for name, width in ROLLUP_GRANULARITIES
+}
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = (
+    (1, BASE_SCHEMA),
+    (2, (
+        "CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks (project_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_minion ON tasks (minion_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks (status, priority, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_metrics_minion_type_time ON metrics (minion_id, metric_type, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics (timestamp)",
+    ) + ROLLUP_SCHEMA + tuple(
+        # Backfill rollups from samples recorded before this migration
+        SQL_ROLLUP_UPSERT[name].replace("id > ?", "id > 0") for name, _ in ROLLUP_GRANULARITIES
+    )),
+    # Durable task queue: the full task as JSON, plus delivery attempts and lease deadline
+    (3, (
+        "ALTER TABLE tasks ADD COLUMN task_type TEXT",
+        "ALTER TABLE tasks ADD COLUMN payload TEXT",
+        "ALTER TABLE tasks ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE tasks ADD COLUMN lease_expires REAL",
+        "ALTER TABLE tasks ADD COLUMN updated_at REAL",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires)",
+    )),
+    # Project pipelines: edges of each project's task DAG
+    (4, (
+        """
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            task_id TEXT NOT NULL,
+            depends_on TEXT NOT NULL,
+            PRIMARY KEY (task_id, depends_on)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on ON task_dependencies (depends_on)",
+    )),
+    # Response cache: LLM and analysis results keyed by a hash of the request
+    (5, (
+        """
+        CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_response_cache_expires ON response_cache (expires_at)",
+    )),
+)
+
+PROJECT_COLUMNS = "id, name, description, status, created_at, updated_at, assigned_minions, progress, metadata"
+TASK_COLUMNS = ("id, project_id, minion_id, title, description, status, priority, "
+                "created_at, completed_at, estimated_hours, actual_hours")
+
+SQL_INSERT_PROJECT = """
+    INSERT INTO projects (id, name, description, status, assigned_minions, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_UPDATE_PROJECT = """
+    UPDATE projects
+    SET status = COALESCE(?, status),
+        progress = COALESCE(?, progress),
+        assigned_minions = COALESCE(?, assigned_minions),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+SQL_SELECT_PROJECT = f"SELECT {PROJECT_COLUMNS} FROM projects WHERE id = ?"
+SQL_SELECT_PROJECTS = f"SELECT {PROJECT_COLUMNS} FROM projects ORDER BY created_at"
+SQL_SELECT_PROJECTS_BY_STATUS = f"SELECT {PROJECT_COLUMNS} FROM projects WHERE status = ? ORDER BY created_at"
+SQL_COUNT_PROJECTS = "SELECT COUNT(*) FROM projects"
+SQL_DELETE_PROJECT = "DELETE FROM projects WHERE id = ?"
+
+SQL_INSERT_TASK = f"""
+    INSERT INTO tasks ({TASK_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?)
+"""
+SQL_UPDATE_TASK_STATUS = """
+    UPDATE tasks
+    SET status = ?,
+        minion_id = COALESCE(?, minion_id),
+        completed_at = COALESCE(?, completed_at),
+        actual_hours = COALESCE(?, actual_hours)
+    WHERE id = ?
+"""
+SQL_SELECT_TASK = f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?"
+SQL_SELECT_TASKS_BY_PROJECT = f"SELECT {TASK_COLUMNS} FROM tasks WHERE project_id = ? ORDER BY priority, created_at"
+SQL_SELECT_TASKS_BY_STATUS = f"SELECT {TASK_COLUMNS} FROM tasks WHERE status = ? ORDER BY priority, created_at"
+
+# Durable queue operations, applied in batches by OmniTasker_TaskQueue
+# An existing row is only taken over while blocked (a pipeline task being released)
+SQL_QUEUE_ENQUEUE = """
+    INSERT INTO tasks (id, project_id, title, description, status, priority, task_type, payload, attempts, updated_at)
+    VALUES (?, ?, ?, ?, 'pending', ?, ?, ?, 0, ?)
+    ON CONFLICT (id) DO UPDATE SET status = 'pending', priority = excluded.priority, payload = excluded.payload,
+        minion_id = NULL, lease_expires = NULL, updated_at = excluded.updated_at
+    WHERE tasks.status = 'blocked'
+"""
+SQL_QUEUE_LEASE = """
+    UPDATE tasks SET status = 'assigned', minion_id = ?, attempts = attempts + 1, lease_expires = ?, updated_at = ?
+    WHERE id = ?
+"""
+SQL_QUEUE_FINISH = """
+    UPDATE tasks SET status = ?, completed_at = CURRENT_TIMESTAMP, actual_hours = ?, lease_expires = NULL, updated_at = ?
+    WHERE id = ?
+"""
+SQL_QUEUE_RELEASE = """
+    UPDATE tasks SET status = 'pending', minion_id = NULL, lease_expires = NULL, updated_at = ?
+    WHERE id = ? AND status = 'assigned'
+"""
+TASK_QUEUE_OPERATIONS = {
+    "enqueue": SQL_QUEUE_ENQUEUE,
+    "lease": SQL_QUEUE_LEASE,
+    "finish": SQL_QUEUE_FINISH,
+    "release": SQL_QUEUE_RELEASE,
+}
+SQL_QUEUE_REPLAY = """
+    SELECT id, payload, status, attempts FROM tasks
+    WHERE payload IS NOT NULL AND status IN ('pending', 'assigned')
+    ORDER BY priority, created_at
+"""
+SQL_QUEUE_EXPIRED = """
+    SELECT id, payload, status, attempts FROM tasks
+    WHERE status = 'assigned' AND lease_expires < ? AND payload IS NOT NULL
+"""
+SQL_INSERT_PIPELINE_TASK = """
+    INSERT INTO tasks (id, project_id, title, description, status, priority, task_type, payload,
+                       estimated_hours, updated_at)
+    VALUES (?, ?, ?, ?, 'blocked', ?, ?, ?, ?, ?)
+"""
+SQL_INSERT_DEPENDENCY = "INSERT OR IGNORE INTO task_dependencies (task_id, depends_on) VALUES (?, ?)"
+SQL_SELECT_PIPELINE_TASKS = """
+    SELECT id, project_id, title, status, task_type, payload, estimated_hours, actual_hours, updated_at
+    FROM tasks WHERE project_id = ? AND estimated_hours IS NOT NULL AND payload IS NOT NULL
+"""
+SQL_SELECT_PIPELINE_EDGES = """
+    SELECT d.task_id, d.depends_on FROM task_dependencies d JOIN tasks t ON t.id = d.task_id
+    WHERE t.project_id = ?
+"""
+SQL_SKIP_TASK = "UPDATE tasks SET status = 'skipped', updated_at = ? WHERE id = ? AND status = 'blocked'"
+SQL_QUEUE_COUNTS = "SELECT status, COUNT(*) AS count FROM tasks WHERE payload IS NOT NULL GROUP BY status"
+
+SQL_CACHE_GET = "SELECT value, expires_at FROM response_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)"
+SQL_CACHE_PUT = "INSERT OR REPLACE INTO response_cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)"
+SQL_CACHE_DELETE = "DELETE FROM response_cache WHERE key = ?"
+SQL_CACHE_CLEAR = "DELETE FROM response_cache"
+SQL_CACHE_PURGE = "DELETE FROM response_cache WHERE expires_at <= ?"
+SQL_CACHE_COUNT = "SELECT COUNT(*) FROM response_cache"
+
+SQL_INSERT_METRIC = "INSERT INTO metrics (minion_id, metric_type, value, timestamp) VALUES (?, ?, ?, ?)"
+SQL_MAX_METRIC_ID = "SELECT COALESCE(MAX(id), 0) FROM metrics"
+SQL_DELETE_METRICS_BEFORE = """
+    DELETE FROM metrics WHERE id IN (
+        SELECT id FROM metrics WHERE timestamp < ? LIMIT ?
+    )
+"""
+SQL_DELETE_ROLLUP_BEFORE = {
+    name: f"DELETE FROM metrics_rollup_{name} WHERE bucket_start < ?"
+    for name, _ in ROLLUP_GRANULARITIES
+}
+SQL_ROLLUP_SUMMARY = {
+    name: f"""
+    SELECT minion_id, metric_type, SUM(sample_count) AS samples,
+           SUM(value_sum) / SUM(sample_count) AS average,
+           MIN(value_min) AS minimum, MAX(value_max) AS maximum
+    FROM metrics_rollup_{name}
+    WHERE bucket_start >= ?
+    GROUP BY minion_id, metric_type
+    """
+    for name, _ in ROLLUP_GRANULARITIES
+}
+SQL_SELECT_METRICS = """
+    SELECT minion_id, metric_type, value, timestamp FROM metrics
+    WHERE minion_id = ? AND metric_type = ?
+    ORDER BY timestamp DESC LIMIT ?
+"""
+
+
+@dataclass
+class ProjectRecord:
+    """Row of the projects table"""
+    id: str
+    name: str
+    description: str = ""
+    status: str = "planning"
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    assigned_minions: List[str] = field(default_factory=list)
+    progress: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "ProjectRecord":
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"] or "",
+            status=row["status"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            assigned_minions=json.loads(row["assigned_minions"] or "[]"),
+            progress=row["progress"] or 0.0,
+            metadata=json.loads(row["metadata"] or "{}")
+        )
+
+
+@dataclass
+class TaskRecord:
+    """Row of the tasks table"""
+    id: str
+    title: str
+    project_id: Optional[str] = None
+    minion_id: Optional[str] = None
+    description: str = ""
+    status: str = "pending"
+    priority: int = 5
+    created_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    estimated_hours: Optional[float] = None
+    actual_hours: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "TaskRecord":
+        return cls(**{key: row[key] for key in row.keys()})
+
+    def as_params(self) -> tuple:
+        return (
+            self.id, self.project_id, self.minion_id, self.title, self.description,
+            self.status, self.priority, self.created_at, self.completed_at,
+            self.estimated_hours, self.actual_hours
+        )
+
+
+@dataclass
+class MetricSample:
+    """Row of the metrics table"""
+    minion_id: str
+    metric_type: str
+    value: float
+    timestamp: str
+
+
+class ConnectionPool:
+    """Hands each thread its own long-lived SQLite connection
+
+    SQLite connections must not be shared between threads without external
+    locking, so the pool keeps one per thread and opens it on first use.
+    WAL mode lets the GUI and monitoring readers run alongside the
+    orchestration writer instead of serialising on the rollback journal.
+    Connections of threads that have exited (e.g. the per-request threads
+    of the HTTP API) are closed whenever a new one is opened, so the pool
+    does not grow with the number of threads that ever used it.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: float = 5.0):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                dead = [thread for thread in self._connections if not thread.is_alive()]
+                stale = [self._connections.pop(thread) for thread in dead]
+                self._connections[threading.current_thread()] = conn
+            self._close(stale)
+        return conn
+
+    def release(self):
+        """Close the calling thread's connection; the next call opens a fresh one"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._connections.pop(threading.current_thread(), None)
+        self._close([conn])
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit on success, roll back on error"""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close_all(self):
+        """Close every connection the pool has opened"""
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+        self._close(connections)
+        self._local = threading.local()
+
+    @staticmethod
+    def _close(connections: List[sqlite3.Connection]):
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+
+
+class OmniDatabase:
+    """Repository for the projects, tasks and metrics tables"""
+
+    def __init__(self, db_path: str = "data/omnitasker_ultimate.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.pool = ConnectionPool(db_path)
+
+    def initialize_schema(self):
+        """Bring the schema up to date by applying any pending migrations"""
+        conn = self.pool.connection()
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        for version, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            # sqlite3 opens transactions only for DML, so DDL would commit statement by statement;
+            # an explicit BEGIN makes the whole migration, version bump included, roll back together
+            with self.pool.transaction() as conn:
+                conn.execute("BEGIN")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+            logger.info(f"Applied database migration {version}")
+
+    def check(self) -> bool:
+        """Cheap connectivity check used by the health monitor"""
+        try:
+            self.pool.connection().execute(SQL_COUNT_PROJECTS).fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Database health check failed: {e}")
+            return False
+
+    def close(self):
+        self.pool.close_all()
+
+    # Projects
+
+    def create_project(self, project_id: str, name: str, description: str = "",
+                       status: str = "planning", assigned_minions: Optional[List[str]] = None,
+                       metadata: Optional[Dict[str, Any]] = None):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_INSERT_PROJECT, (
+                project_id, name, description, status,
+                json.dumps(assigned_minions or []), json.dumps(metadata or {})
+            ))
+
+    def update_project(self, project_id: str, status: Optional[str] = None,
+                       progress: Optional[float] = None,
+                       assigned_minions: Optional[List[str]] = None):
+        minions_json = json.dumps(assigned_minions) if assigned_minions is not None else None
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_UPDATE_PROJECT, (status, progress, minions_json, project_id))
+
+    def get_project(self, project_id: str) -> Optional[ProjectRecord]:
+        row = self.pool.connection().execute(SQL_SELECT_PROJECT, (project_id,)).fetchone()
+        return ProjectRecord.from_row(row) if row else None
+
+    def list_projects(self, status: Optional[str] = None) -> List[ProjectRecord]:
+        conn = self.pool.connection()
+        if status is None:
+            rows = conn.execute(SQL_SELECT_PROJECTS).fetchall()
+        else:
+            rows = conn.execute(SQL_SELECT_PROJECTS_BY_STATUS, (status,)).fetchall()
+        return [ProjectRecord.from_row(row) for row in rows]
+
+    def count_projects(self) -> int:
+        return self.pool.connection().execute(SQL_COUNT_PROJECTS).fetchone()[0]
+
+    def delete_project(self, project_id: str):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_DELETE_PROJECT, (project_id,))
+
+    # Tasks
+
+    def create_tasks(self, tasks: Iterable[TaskRecord]):
+        with self.pool.transaction() as conn:
+            conn.executemany(SQL_INSERT_TASK, (task.as_params() for task in tasks))
+
+    def update_task_status(self, task_id: str, status: str, minion_id: Optional[str] = None,
+                           completed_at: Optional[str] = None, actual_hours: Optional[float] = None):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_UPDATE_TASK_STATUS, (status, minion_id, completed_at, actual_hours, task_id))
+
+    def get_task(self, task_id: str) -> Optional[TaskRecord]:
+        row = self.pool.connection().execute(SQL_SELECT_TASK, (task_id,)).fetchone()
+        return TaskRecord.from_row(row) if row else None
+
+    def list_tasks(self, project_id: Optional[str] = None, status: Optional[str] = None) -> List[TaskRecord]:
+        conn = self.pool.connection()
+        if project_id is not None:
+            rows = conn.execute(SQL_SELECT_TASKS_BY_PROJECT, (project_id,)).fetchall()
+            if status is not None:
+                rows = [row for row in rows if row["status"] == status]
+        elif status is not None:
+            rows = conn.execute(SQL_SELECT_TASKS_BY_STATUS, (status,)).fetchall()
+        else:
+            raise ValueError("list_tasks needs a project_id or a status")
+        return [TaskRecord.from_row(row) for row in rows]
+
+    def apply_task_operations(self, operations: List[Tuple[str, tuple]]):
+        """Apply durable-queue operations (see TASK_QUEUE_OPERATIONS) in one transaction
+
+        Runs of the same operation go through a single executemany.
+        """
+        with self.pool.transaction() as conn:
+            for name, group in itertools.groupby(operations, key=lambda operation: operation[0]):
+                conn.executemany(TASK_QUEUE_OPERATIONS[name], [params for _, params in group])
+
+    def replayable_tasks(self) -> List[sqlite3.Row]:
+        """Queued and leased tasks, in dispatch order"""
+        return self.pool.connection().execute(SQL_QUEUE_REPLAY).fetchall()
+
+    def expired_task_leases(self, now: float) -> List[sqlite3.Row]:
+        return self.pool.connection().execute(SQL_QUEUE_EXPIRED, (now,)).fetchall()
+
+    def count_queued_tasks(self) -> Dict[str, int]:
+        return {row["status"]: row["count"] for row in self.pool.connection().execute(SQL_QUEUE_COUNTS)}
+
+    def create_pipeline(self, tasks: List[Dict[str, Any]]):
+        """Store a project's task DAG: every task (blocked until released) and its edges"""
+        now = time.time()
+        with self.pool.transaction() as conn:
+            conn.executemany(SQL_INSERT_PIPELINE_TASK, [
+                (task["id"], task.get("project_id"), task["title"], task.get("description", ""),
+                 task.get("priority"), task.get("type"), json.dumps(task, default=str),
+                 task.get("estimated_hours"), now)
+                for task in tasks
+            ])
+            conn.executemany(SQL_INSERT_DEPENDENCY, [
+                (task["id"], dependency) for task in tasks for dependency in task.get("depends_on", ())
+            ])
+
+    def get_pipeline(self, project_id: str) -> Tuple[List[sqlite3.Row], List[Tuple[str, str]]]:
+        """A project's pipeline tasks and its (task_id, depends_on) edges"""
+        conn = self.pool.connection()
+        tasks = conn.execute(SQL_SELECT_PIPELINE_TASKS, (project_id,)).fetchall()
+        edges = [(row["task_id"], row["depends_on"]) for row in conn.execute(SQL_SELECT_PIPELINE_EDGES, (project_id,))]
+        return tasks, edges
+
+    def skip_tasks(self, task_ids: Iterable[str]):
+        """Mark blocked tasks that can never run (a dependency failed)"""
+        now = time.time()
+        with self.pool.transaction() as conn:
+            conn.executemany(SQL_SKIP_TASK, [(now, task_id) for task_id in task_ids])
+
+    # Response cache
+
+    def get_cached_response(self, key: str, now: float) -> Optional[sqlite3.Row]:
+        """The unexpired cache entry for ``key`` (value, expires_at), if any"""
+        return self.pool.connection().execute(SQL_CACHE_GET, (key, now)).fetchone()
+
+    def put_cached_response(self, key: str, value: str, expires_at: Optional[float]):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_CACHE_PUT, (key, value, time.time(), expires_at))
+
+    def delete_cached_responses(self, keys: Optional[Iterable[str]] = None) -> int:
+        """Drop the given cache entries, or every entry; returns rows deleted"""
+        with self.pool.transaction() as conn:
+            if keys is None:
+                return conn.execute(SQL_CACHE_CLEAR).rowcount
+            return conn.executemany(SQL_CACHE_DELETE, [(key,) for key in keys]).rowcount
+
+    def purge_cached_responses(self, now: float) -> int:
+        """Drop expired cache entries; returns rows deleted"""
+        with self.pool.transaction() as conn:
+            return conn.execute(SQL_CACHE_PURGE, (now,)).rowcount
+
+    def count_cached_responses(self) -> int:
+        return self.pool.connection().execute(SQL_CACHE_COUNT).fetchone()[0]
+
+    # Metrics
+
+    def insert_metrics(self, samples: Iterable[MetricSample]) -> int:
+        """Insert raw samples and fold them into the rollups in one transaction"""
+        with self.pool.transaction() as conn:
+            last_id = conn.execute(SQL_MAX_METRIC_ID).fetchone()[0]
+            cursor = conn.executemany(SQL_INSERT_METRIC, (
+                (sample.minion_id, sample.metric_type, sample.value, sample.timestamp)
+                for sample in samples
+            ))
+            for name, _ in ROLLUP_GRANULARITIES:
+                conn.execute(SQL_ROLLUP_UPSERT[name], (last_id,))
+            return cursor.rowcount
+
+    def compact_metrics(self, raw_max_age: float, rollup_max_age: Optional[Dict[str, float]] = None,
+                        chunk_size: int = 5000) -> int:
+        """Delete raw samples (already rolled up) older than raw_max_age seconds
+
+        Deletes in chunks so each write transaction stays short. Rollup
+        tables are pruned with their own ages from ``rollup_max_age``, keyed
+        by granularity name; granularities not listed are kept forever.
+        """
+        now = time.time()
+        cutoff = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - raw_max_age))
+        deleted = 0
+        while True:
+            with self.pool.transaction() as conn:
+                removed = conn.execute(SQL_DELETE_METRICS_BEFORE, (cutoff, chunk_size)).rowcount
+            deleted += removed
+            if removed < chunk_size:
+                break
+
+        for name, max_age in (rollup_max_age or {}).items():
+            with self.pool.transaction() as conn:
+                conn.execute(SQL_DELETE_ROLLUP_BEFORE[name], (int(now - max_age),))
+        return deleted
+
+    def rollup_summary(self, granularity: str, since: float) -> List[Dict[str, Any]]:
+        """Per-minion, per-metric aggregates from a rollup table since an epoch time"""
+        rows = self.pool.connection().execute(SQL_ROLLUP_SUMMARY[granularity], (int(since),)).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent_metrics(self, minion_id: str, metric_type: str, limit: int = 100) -> List[MetricSample]:
+        rows = self.pool.connection().execute(SQL_SELECT_METRICS, (minion_id, metric_type, limit)).fetchall()
+        return [MetricSample(**{key: row[key] for key in row.keys()}) for row in rows]
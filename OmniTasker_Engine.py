@@ -0,0 +1,1065 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Engine - Headless orchestration core
+Owns the OmniMinions, scheduler, execution engine, database and monitoring;
+runs as a daemon on its own or with the Tk GUI attached as a client
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable
+
+from OmniTasker_Scheduler import TaskScheduler, DEFAULT_PRIORITY
+from OmniTasker_Executor import TaskExecutionEngine
+from OmniTasker_Database import OmniDatabase
+from OmniTasker_Metrics import MetricsRecorder
+from OmniTasker_Pipeline import PipelineExecutor
+from OmniTasker_TaskQueue import DurableTaskQueue
+from OmniTasker_Events import EventBus
+from OmniTasker_Fleet import FleetAutoscaler, RoleSpec, load_fleet_config
+from OmniTasker_Registry import MinionRegistry, OmniMinion
+from OmniTasker_Handlers import handle_design, handle_code_generation, handle_testing, handle_deployment
+from OmniTasker_Logging import configure_logging
+from OmniTasker_Startup import startup_profiler
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_PATH = "config/settings.json"
+
+# Most recent task states kept in memory for status queries and streams
+TASK_STATUS_HISTORY = 100000
+
+# How often the engine follows task and minion changes in the broker
+BROKER_SYNC_INTERVAL = 1.0
+
+# Broker task states as engine task statuses
+BROKER_TASK_STATUSES = {"queued": "pending", "leased": "assigned", "done": "completed", "failed": "failed"}
+
+# Project states a pipeline never leaves; other projects are recovered on start
+FINISHED_PROJECT_STATUSES = ("completed", "failed")
+
+
+class OmniTaskerEngine:
+    """Orchestration core for the OmniMinion fleet, independent of any GUI
+    
+    Clients (the Tk app, the HTTP API) read the shared state dicts and
+    register listeners with ``add_listener``; listeners are called from
+    background threads with a coarse event name ("minions", "projects",
+    "metrics") and must hand any widget work to their own thread. Per-item
+    task, minion and metric events are published on ``events`` (an
+    EventBus) for streaming consumers.
+    """
+    
+    def __init__(self, fleet_path: Optional[str] = None):
+        # Initialize system components
+        self.fleet_config = load_fleet_config(fleet_path)
+        self.omni_minions = self._initialize_omni_minions()
+        self.autoscaler = FleetAutoscaler(self.fleet_config)
+        self.scheduler = TaskScheduler(self.omni_minions)
+        self.task_queue = queue.Queue()
+        self.completed_tasks = queue.Queue()
+        self.active_tasks = {}
+        self.execution_engine = TaskExecutionEngine(
+            self.execute_task,
+            max_workers=25,
+            on_complete=self._on_task_finished
+        )
+        self.async_core = None
+        self.process_pool = None
+        self.broker = None
+        self._broker_cursor = (0, 0)
+        self.project_database = self._initialize_database()
+        self.metrics_recorder = MetricsRecorder(self.project_database)
+        self.durable_queue = DurableTaskQueue(
+            self.project_database,
+            visibility_timeout=self.execution_engine.default_timeout
+        )
+        self.pipelines = PipelineExecutor(self.project_database, self.submit_tasks, self._on_pipeline_progress)
+        self.metrics_retention_hours = 168
+        self.last_retention_run = 0.0
+        self.active_projects = {}
+        self.system_metrics = {
+            "total_projects": 0,
+            "completed_projects": 0,
+            "active_agents": self._count_active_agents(),
+            "system_uptime": datetime.now(),
+            "success_rate": 100.0
+        }
+        self.task_status: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._task_status_lock = threading.Lock()
+        self.events = EventBus()
+        self.api_server = None
+        self.metrics_exporter = None
+        self.llm = None  # Shared LLMClient, created on first use
+        self._llm_lock = threading.Lock()
+        self.settings = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._started = False
+        self._stop_event = threading.Event()
+    
+    def start(self, use_async_core: Optional[bool] = None, process_workers: Optional[int] = None,
+              broker_path: Optional[str] = None, metrics_port: Optional[int] = None):
+        """Start the background monitoring and orchestration workers"""
+        if self._started:
+            return
+        self._started = True
+        
+        if metrics_port is None:
+            monitoring = os.getenv("MONITORING_ENABLED", "false").lower() in ("1", "true", "yes")
+            metrics_port = int(os.getenv("METRICS_PORT", "9181")) if monitoring else 0
+        # Instrumentation has to be in place before the loops pick up the methods it wraps
+        if metrics_port:
+            self.start_metrics_exporter(metrics_port)
+        
+        if use_async_core is None:
+            use_async_core = os.getenv("OMNITASKER_ASYNC_CORE", "false").lower() in ("1", "true", "yes")
+        if process_workers is None:
+            process_workers = int(os.getenv("OMNITASKER_PROCESS_WORKERS", "0"))
+        if broker_path is None:
+            broker_path = os.getenv("OMNITASKER_BROKER")
+        
+        if process_workers:
+            self.start_process_pool(process_workers)
+        if broker_path:
+            self.start_broker(broker_path)
+        self.metrics_recorder.start()
+        self.durable_queue.start()
+        # Nothing executes before the loops below start, so no replayed task can
+        # finish before the pipelines waiting on it are rebuilt
+        self.load_projects()
+        self.recover_tasks()
+        # Tasks replay failed for good must read as failed before pipelines are rebuilt
+        self.durable_queue.flush()
+        self.pipelines.recover([project_id for project_id, project in self.active_projects.items()
+                                if project["status"] not in FINISHED_PROJECT_STATUSES])
+        if use_async_core:
+            self.start_async_orchestration()
+        else:
+            self.setup_monitoring()
+            self.start_agent_orchestration()
+        
+        logger.info(f"OmniTasker engine started with {len(self.omni_minions)} OmniMinions")
+    
+    def add_listener(self, callback: Callable[[str], None]):
+        """Register a client callback for state-change events"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str], None]):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+    
+    def _notify(self, event: str):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Engine listener error: {e}")
+    
+    def _minions_changed(self, *minions: OmniMinion):
+        """Publish minion status changes and keep the dashboard counters current"""
+        for minion in minions:
+            self.events.publish("minion", {
+                "id": minion.id,
+                "status": minion.status,
+                "current_task": minion.current_task
+            })
+        self.system_metrics["active_agents"] = self._count_active_agents()
+        self._notify("minions")
+    
+    def _count_active_agents(self) -> int:
+        return self.omni_minions.count_status("active", "assigned", "working")
+    
+    def _record_metric(self, minion_id: str, metric_type: str, value: float):
+        """Buffer a metric sample for the database and publish it live"""
+        self.metrics_recorder.record(minion_id, metric_type, value)
+        self.events.publish("metric", {"minion_id": minion_id, "metric_type": metric_type, "value": value})
+    
+    def start_process_pool(self, max_workers: int = -1):
+        """Run CPU-bound task types in worker processes (-1 = one per core)"""
+        from OmniTasker_Processes import ProcessTaskPool
+        
+        self.process_pool = ProcessTaskPool(max_workers=None if max_workers < 0 else max_workers)
+        self.process_pool.start()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.instrument_process_pool(self.process_pool)
+        # Enough threads to keep every worker process busy
+        if self.execution_engine.max_workers < self.process_pool.max_workers:
+            self.execution_engine.resize(self.process_pool.max_workers)
+        return self.process_pool
+    
+    def start_broker(self, db_path: str):
+        """Hand submitted tasks to remote workers through a broker (see OmniTasker_Broker)"""
+        from OmniTasker_Broker import TaskBroker
+        
+        self.broker = TaskBroker(db_path)
+        self.broker.initialize_schema()
+        # Follow changes from now on; earlier history belongs to a previous run
+        self._broker_cursor = self.broker.current_cursor()
+        
+        def follow_broker():
+            while not self._stop_event.wait(BROKER_SYNC_INTERVAL):
+                try:
+                    self.sync_broker()
+                except Exception as e:
+                    logger.error(f"Broker sync error: {e}")
+        
+        threading.Thread(target=follow_broker, name="omni-broker-sync", daemon=True).start()
+        logger.info(f"Distributing tasks through broker {db_path}")
+        return self.broker
+    
+    def sync_broker(self):
+        """Mirror remote minions and task transitions from the broker into engine state"""
+        self.broker.reap()
+        
+        changed = []
+        for remote in self.broker.list_minions():
+            if remote["worker_state"] != "active":
+                status = "offline"
+            else:
+                status = "working" if remote["task_id"] else "idle"
+            minion = self.omni_minions.get(remote["minion_id"])
+            if minion is None:
+                minion = self.omni_minions.add(OmniMinion(
+                    id=remote["minion_id"],
+                    name=remote["name"] or remote["minion_id"],
+                    role=remote["role"] or "Remote Worker",
+                    specialization=remote["node"] or "",
+                    status=status,
+                    capabilities=remote["capabilities"]
+                ))
+                changed.append(minion)
+            elif minion.status != status:
+                minion.status = status
+                changed.append(minion)
+        
+        while True:
+            rows, self._broker_cursor = self.broker.changes_since(self._broker_cursor)
+            if not rows:
+                break
+            for row in rows:
+                task = json.loads(row["payload"])
+                task["minion_id"] = row["minion_id"]
+                task["error"] = row["error"]
+                status = BROKER_TASK_STATUSES[row["state"]]
+                self._set_task_status(task, status)
+                
+                minion = self.omni_minions.get(row["minion_id"])
+                if status in ("completed", "failed"):
+                    self.pipelines.task_finished(task, status)
+                if minion is not None and status in ("completed", "failed"):
+                    self._record_task_outcome(minion, {
+                        "outcome": status,
+                        "assigned_at": row["leased_at"] or row["updated_at"],
+                        "finished_at": row["updated_at"]
+                    })
+        
+        if changed:
+            self._minions_changed(*changed)
+    
+    def start_api(self, host: Optional[str] = None, port: Optional[int] = None):
+        """Serve the local HTTP/JSON API (see OmniTasker_API) on a background thread"""
+        try:
+            from OmniTasker_API import ApiServer
+        except ImportError as e:
+            logger.error(f"HTTP API unavailable, install Flask to enable it: {e}")
+            return None
+        
+        self.api_server = ApiServer(
+            self,
+            host=host or os.getenv("HOST", "localhost"),
+            port=int(port or os.getenv("PORT", "8000"))
+        )
+        self.api_server.start()
+        return self.api_server
+    
+    def get_llm_client(self):
+        """The LLM client shared by every caller, built from the saved API keys on first use"""
+        with self._llm_lock:
+            if self.llm is None:
+                from OmniTasker_Cache import ResponseCache
+                from OmniTasker_LLM import LLMClient, provider_configs
+                cache = ResponseCache(self.project_database,
+                                      max_memory_bytes=int(os.getenv("LLM_CACHE_MEMORY_BYTES", 16 * 1024 * 1024)),
+                                      default_ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)))
+                cache.purge_expired()
+                self.llm = LLMClient(
+                    provider_configs(self.settings),
+                    max_concurrency=int(self.settings.get("llm_max_concurrency") or os.getenv("LLM_MAX_CONCURRENCY", "8")),
+                    cache=cache
+                )
+            return self.llm
+    
+    def analyze_project_idea(self, idea: str, refresh: bool = False) -> Future:
+        """Ask the LLM for a project analysis; resolves to an LLMResponse (or raises LLMError)
+
+        A previously analyzed idea is answered from the response cache unless ``refresh``.
+        """
+        from OmniTasker_LLM import PROJECT_ANALYSIS_SYSTEM_PROMPT
+        return self.get_llm_client().submit(idea, system=PROJECT_ANALYSIS_SYSTEM_PROMPT, use_cache=not refresh)
+    
+    def stream_project_analysis(self, idea: str, on_chunk: Callable[[str], None],
+                                cancel: Optional[threading.Event] = None, refresh: bool = False) -> Future:
+        """``analyze_project_idea`` delivering the text to ``on_chunk`` (on a worker thread) as it arrives"""
+        from OmniTasker_LLM import PROJECT_ANALYSIS_SYSTEM_PROMPT
+        return self.get_llm_client().submit_stream(idea, on_chunk, cancel=cancel,
+                                                   system=PROJECT_ANALYSIS_SYSTEM_PROMPT, use_cache=not refresh)
+    
+    def start_metrics_exporter(self, port: int, host: Optional[str] = None):
+        """Time the orchestration steps and serve Prometheus metrics on /metrics (see OmniTasker_Prometheus)"""
+        try:
+            from OmniTasker_Prometheus import PrometheusExporter
+        except ImportError as e:
+            logger.error(f"Metrics exporter unavailable, install prometheus-client to enable it: {e}")
+            return None
+        
+        self.metrics_exporter = PrometheusExporter(self)
+        self.metrics_exporter.start(port, host or os.getenv("METRICS_HOST", "localhost"))
+        return self.metrics_exporter
+    
+    @startup_profiler.timed
+    def _initialize_omni_minions(self) -> MinionRegistry:
+        """Create each fleet role's initial OmniMinions (see OmniTasker_Fleet)"""
+        minions = MinionRegistry(capacity=max(64, self.fleet_config.initial_size))
+        for spec in self.fleet_config.roles:
+            for i in range(1, spec.count + 1):
+                minions.add(OmniMinion(**spec.minion_fields(i)))
+        return minions
+    
+    def run_autoscaler(self):
+        """Resize fleet roles to the task backlog (at most once per autoscaler interval)"""
+        if not self.autoscaler.due():
+            return
+        
+        members: Dict[str, List] = {}
+        for minion in list(self.omni_minions.values()):
+            spec = self.fleet_config.role_for(minion.id)
+            if spec is not None:
+                members.setdefault(spec.key, []).append((minion.id, minion.status))
+        
+        for decision in self.autoscaler.evaluate(self.scheduler.get_backlog(), members):
+            if decision.delta > 0:
+                added = self.scale_up_role(decision.role, decision.delta)
+                logger.info(f"Autoscaler added {len(added)} {decision.role.key} minions ({decision.reason})")
+            else:
+                removed = self.retire_minions(decision.remove)
+                logger.info(f"Autoscaler retired {len(removed)} {decision.role.key} minions ({decision.reason})")
+    
+    def scale_up_role(self, spec: RoleSpec, count: int) -> List[OmniMinion]:
+        """Add ``count`` minions to a fleet role; they pick up queued work immediately"""
+        used = {int(minion_id.rpartition("_")[2]) for minion_id in list(self.omni_minions)
+                if self.fleet_config.role_for(minion_id) is spec}
+        added = []
+        index = 1
+        while len(added) < count:
+            if index not in used:
+                minion = self.omni_minions.add(OmniMinion(**spec.minion_fields(index)))
+                self.scheduler.add_minion(minion)
+                added.append(minion)
+            index += 1
+        self._minions_changed(*added)
+        return added
+    
+    def retire_minions(self, minion_ids: List[str]) -> List[str]:
+        """Remove idle minions from the fleet; busy ones are left alone"""
+        removed = [minion_id for minion_id in minion_ids if self.scheduler.remove_minion(minion_id)]
+        for minion_id in removed:
+            del self.omni_minions[minion_id]
+            self.events.publish("minion", {"id": minion_id, "status": "retired", "current_task": None})
+        if removed:
+            self._minions_changed()
+        return removed
+    
+    @startup_profiler.timed
+    def _initialize_database(self) -> OmniDatabase:
+        """Initialize SQLite database for project management"""
+        database = OmniDatabase("data/omnitasker_ultimate.db")
+        database.initialize_schema()
+        return database
+    
+    def setup_monitoring(self):
+        """Setup background monitoring"""
+        def monitor_system():
+            while True:
+                try:
+                    # Update system metrics
+                    self.update_system_metrics()
+                    
+                    # Check agent health
+                    self.check_agent_health()
+                    
+                    # Process task queue
+                    self.process_task_queue()
+                    
+                    # Compact old metric samples
+                    self.run_metrics_retention()
+                    
+                    # Re-deliver tasks whose lease ran out
+                    self.reclaim_expired_tasks()
+                    
+                    time.sleep(30)  # Update every 30 seconds
+                except Exception as e:
+                    logger.error(f"Monitoring error: {e}")
+                    time.sleep(60)
+        
+        monitor_thread = threading.Thread(target=monitor_system, daemon=True)
+        monitor_thread.start()
+    
+    def start_agent_orchestration(self):
+        """Start the agent orchestration system"""
+        def orchestrate():
+            while True:
+                try:
+                    # Assign tasks to available minions
+                    self.assign_tasks_to_minions()
+                    
+                    # Monitor task progress
+                    self.monitor_task_progress()
+                    
+                    # Handle completed tasks
+                    self.handle_completed_tasks()
+                    
+                    # Grow or shrink fleet roles to match the backlog
+                    self.run_autoscaler()
+                    
+                    # Hand newly assigned tasks to the worker pool
+                    self.process_task_queue()
+                    
+                    # Sleep until a task is matched or a minion frees up
+                    self.scheduler.wait_for_work(timeout=10)
+                except Exception as e:
+                    logger.error(f"Orchestration error: {e}")
+                    time.sleep(30)
+        
+        orchestration_thread = threading.Thread(target=orchestrate, daemon=True)
+        orchestration_thread.start()
+    
+    def start_async_orchestration(self):
+        """Run the monitoring and orchestration jobs on the asyncio core instead of threads"""
+        from OmniTasker_AsyncCore import AsyncOrchestrationCore
+        
+        self.async_core = AsyncOrchestrationCore()
+        
+        # Periodic jobs, each on its own interval
+        self.async_core.add_job("metrics", self.update_system_metrics, interval=30)
+        self.async_core.add_job("health", self.check_agent_health, interval=30)
+        self.async_core.add_job("retention", self.run_metrics_retention, interval=3600)
+        self.async_core.add_job("leases", self.reclaim_expired_tasks, interval=30)
+        self.async_core.add_job("autoscale", self.run_autoscaler, interval=self.fleet_config.autoscaler.interval)
+        self.async_core.add_job("progress", self.monitor_task_progress, interval=5)
+        
+        # Event-driven jobs; the interval is only a safety net
+        self.async_core.add_job("completion", self.handle_completed_tasks, interval=10)
+        self.async_core.add_job("assignment", self.assign_tasks_to_minions, interval=10, triggers=("task_queue",))
+        self.async_core.add_job("task_queue", self.process_task_queue, interval=30)
+        
+        # Scheduler notifications (new task, freed minion, finished task) wake dispatch
+        self.scheduler.add_listener(lambda: self.async_core.wake("completion", "assignment"))
+        self.async_core.start()
+    
+    def create_project(self, name: str, description: str = "", tech_stack: str = "",
+                       assigned_minions: Optional[List[str]] = None, pipeline: bool = True) -> str:
+        """Persist a new project, assign minions and start its task pipeline; returns the project id"""
+        project_id = str(uuid.uuid4())
+        
+        # Save to database
+        self.project_database.create_project(
+            project_id, name, description, "planning",
+            assigned_minions=assigned_minions or [], metadata={"tech_stack": tech_stack}
+        )
+        
+        # Add to active projects
+        self.active_projects[project_id] = {
+            "name": name,
+            "description": description,
+            "status": "planning",
+            "tech_stack": tech_stack,
+            "assigned_minions": list(assigned_minions or []),
+            "progress": 0.0,
+            "created_at": datetime.now().strftime("%Y-%m-%d")
+        }
+        
+        # Auto-assign minions unless the caller picked the team
+        if assigned_minions is None:
+            self.auto_assign_minions(project_id)
+        
+        if pipeline:
+            self.start_pipeline(project_id)
+        
+        self.system_metrics["active_projects"] = len(self.active_projects)
+        self._notify("projects")
+        logger.info(f"Created new project: {name} (ID: {project_id})")
+        return project_id
+    
+    def load_projects(self):
+        """Fill active_projects from the database (projects of earlier runs)"""
+        for record in self.project_database.list_projects():
+            if record.id in self.active_projects:
+                continue
+            self.active_projects[record.id] = {
+                "name": record.name,
+                "description": record.description,
+                "status": record.status,
+                "tech_stack": record.metadata.get("tech_stack", ""),
+                "assigned_minions": list(record.assigned_minions),
+                "progress": record.progress,
+                "created_at": (record.created_at or "")[:10]
+            }
+            if record.status == "completed":
+                self.system_metrics["completed_projects"] += 1
+        self.system_metrics["active_projects"] = len(self.active_projects)
+    
+    def start_pipeline(self, project_id: str) -> List[Dict[str, Any]]:
+        """Expand a project into its design/code/test/deploy task DAG and start it"""
+        project = self.active_projects[project_id]
+        project["status"] = "in_progress"
+        self.project_database.update_project(project_id, status="in_progress")
+        return self.pipelines.start_project(project_id, project["name"], project.get("tech_stack", ""))
+    
+    def pipeline_report(self, project_id: str) -> Dict[str, Any]:
+        """Pipeline task counts and critical path (planned, and measured once tasks ran)"""
+        return self.pipelines.report(project_id)
+    
+    def _on_pipeline_progress(self, project_id: str, counts: Dict[str, int]):
+        project = self.active_projects.get(project_id)
+        if project is None:
+            return
+        finished = counts["completed"] + counts["failed"] + counts["skipped"]
+        project["progress"] = 100.0 * counts["completed"] / counts["total"]
+        if finished >= counts["total"]:
+            project["status"] = "completed" if counts["failed"] == 0 else "failed"
+            if project["status"] == "completed":
+                self.system_metrics["completed_projects"] += 1
+            logger.info(f"Project {project['name']} pipeline {project['status']}")
+        self.project_database.update_project(project_id, status=project["status"], progress=project["progress"])
+        self._notify("projects")
+    
+    def auto_assign_minions(self, project_id: str):
+        """Automatically assign appropriate minions to a project"""
+        project = self.active_projects.get(project_id)
+        if not project:
+            return
+        
+        # Assign based on project requirements
+        assigned_minions = []
+        
+        # Always assign core team
+        core_roles = ['coder_1', 'tester_1', 'designer_1', 'devops_1', 'liaison_1']
+        assigned_minions.extend(core_roles)
+        
+        # Assign based on tech stack
+        tech_stack = project.get('tech_stack', '')
+        if 'React' in tech_stack or 'JavaScript' in tech_stack:
+            assigned_minions.append('coder_2')  # JavaScript specialist
+        if 'Python' in tech_stack or 'Django' in tech_stack or 'Flask' in tech_stack:
+            assigned_minions.append('coder_1')  # Python specialist
+        
+        # Update project
+        project['assigned_minions'] = assigned_minions
+        
+        # Update minion status
+        for minion_id in assigned_minions:
+            if minion_id in self.omni_minions:
+                self.omni_minions[minion_id].status = "assigned"
+                self.omni_minions[minion_id].current_task = f"Working on {project['name']}"
+        self._minions_changed(*(self.omni_minions[minion_id] for minion_id in assigned_minions
+                                if minion_id in self.omni_minions))
+        
+        logger.info(f"Auto-assigned {len(assigned_minions)} minions to project {project_id}")
+    
+    def deploy_all_minions(self) -> int:
+        """Activate every idle OmniMinion; returns how many were deployed"""
+        deployed = []
+        for minion_id, minion in list(self.omni_minions.items()):
+            if minion.status == "idle":
+                minion.status = "active"
+                deployed.append(minion)
+        
+        self._minions_changed(*deployed)
+        logger.info(f"Deployed {len(deployed)} OmniMinions")
+        return len(deployed)
+    
+    def generate_report(self) -> str:
+        """Write a comprehensive system report; returns its path"""
+        report_data = {
+            "timestamp": datetime.now().isoformat(),
+            "system_metrics": self.system_metrics,
+            "active_projects": len(self.active_projects),
+            "fleet": self.omni_minions.get_stats(),
+            "minion_status": {},
+            # Last 24h per minion, read from the hourly rollups rather than raw samples
+            "metrics_24h": self.project_database.rollup_summary("hour", time.time() - 86400)
+        }
+        
+        # Collect minion data
+        for minion_id, minion in list(self.omni_minions.items()):
+            report_data["minion_status"][minion_id] = {
+                "name": minion.name,
+                "role": minion.role,
+                "status": minion.status,
+                "performance": dict(minion.performance_metrics)
+            }
+        
+        # Generate report file
+        report_path = f"reports/system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        os.makedirs("reports", exist_ok=True)
+        
+        with open(report_path, 'w') as f:
+            json.dump(report_data, f, indent=2, default=str)
+        
+        logger.info(f"Generated comprehensive report: {report_path}")
+        return report_path
+    
+    def run_health_checks(self) -> Dict[str, bool]:
+        """Run every component health check"""
+        health_status = {
+            "database": self.check_database_health(),
+            "minions": self.check_minions_health(),
+            "resources": self.check_system_resources(),
+            "logs": self.check_log_health()
+        }
+        logger.info("System health check completed")
+        return health_status
+    
+    def check_database_health(self) -> bool:
+        """Check database connectivity and integrity"""
+        return self.project_database.check()
+    
+    def check_minions_health(self) -> bool:
+        """Check if all minions are responsive"""
+        try:
+            total = len(self.omni_minions)
+            active_count = total - self.omni_minions.count_status("error")
+            return active_count >= 0.8 * total  # At least 80% should be healthy
+        except Exception:
+            return False
+    
+    def check_system_resources(self) -> bool:
+        """Check system resource availability"""
+        try:
+            import psutil
+            cpu_percent = psutil.cpu_percent(interval=1)
+            memory_percent = psutil.virtual_memory().percent
+            disk_percent = psutil.disk_usage('/').percent
+            
+            return cpu_percent < 90 and memory_percent < 90 and disk_percent < 90
+        except Exception:
+            return True  # Assume healthy if can't check
+    
+    def check_log_health(self) -> bool:
+        """Check log file accessibility"""
+        try:
+            log_path = "logs/omnitasker_ultimate.log"
+            return os.path.exists(log_path) and os.access(log_path, os.W_OK)
+        except Exception:
+            return False
+    
+    def run_metrics_retention(self):
+        """Drop raw metric samples older than the retention window (at most hourly)"""
+        if time.time() - self.last_retention_run < 3600:
+            return
+        self.last_retention_run = time.time()
+        
+        try:
+            # Minute rollups are kept for a week; hourly and daily ones forever
+            deleted = self.project_database.compact_metrics(
+                self.metrics_retention_hours * 3600,
+                rollup_max_age={"minute": 7 * 86400}
+            )
+            if deleted:
+                logger.info(f"Metrics retention removed {deleted} raw samples")
+        except Exception as e:
+            logger.error(f"Metrics retention error: {e}")
+    
+    def update_system_metrics(self):
+        """Recompute system metrics and notify clients"""
+        try:
+            # Update metrics
+            self.system_metrics["active_projects"] = len(self.active_projects)
+            self.system_metrics["active_agents"] = self._count_active_agents()
+            
+            engine_stats = self.execution_engine.get_stats()
+            self.system_metrics["task_queue_depth"] = engine_stats["queue_depth"] + self.task_queue.qsize()
+            self.system_metrics["tasks_in_flight"] = engine_stats["in_flight"]
+            
+            for key in ("active_agents", "task_queue_depth", "tasks_in_flight"):
+                self._record_metric("system", key, self.system_metrics[key])
+            
+            self._notify("metrics")
+            
+        except Exception as e:
+            logger.error(f"Metrics update error: {e}")
+    
+    def process_task_queue(self):
+        """Hand pending tasks in the queue to the execution engine"""
+        try:
+            # Leave tasks queued once the pool is past its high-water mark
+            while self.execution_engine.has_capacity():
+                task = self.task_queue.get_nowait()
+                handler = self.get_task_handler(task.get("type"))
+                
+                # Coroutine handlers await their I/O on the async core instead of holding a worker thread
+                if self.async_core is not None and inspect.iscoroutinefunction(handler):
+                    self.async_core.submit(
+                        handler(task),
+                        timeout=task.get("timeout") or self.execution_engine.default_timeout,
+                        on_done=lambda outcome, error, task=task: self._on_task_finished(task, outcome, error)
+                    )
+                elif not self.execution_engine.submit(task, block=False):
+                    # The other dispatch loop filled the pool after the capacity check;
+                    # requeue rather than lose the task (and leave its minion working)
+                    self.task_queue.put(task)
+                    break
+        except queue.Empty:
+            pass
+        except Exception as e:
+            logger.error(f"Task queue processing error: {e}")
+    
+    def get_task_handler(self, task_type: Optional[str]):
+        """Look up the handle_*_task method for a task type"""
+        return {
+            "design": self.handle_design_task,
+            "code_generation": self.handle_code_generation_task,
+            "testing": self.handle_testing_task,
+            "deployment": self.handle_deployment_task
+        }.get(task_type)
+    
+    def execute_task(self, task: Dict[str, Any]):
+        """Execute a specific task (runs on an execution engine worker)"""
+        task_type = task.get("type")
+        handler = self.get_task_handler(task_type)
+        if handler is None:
+            raise ValueError(f"Unknown task type: {task_type}")
+        
+        self._set_task_status(task, "running")
+        if self.process_pool is not None and self.process_pool.handles(task_type):
+            # CPU-bound work runs in a worker process; this thread only waits
+            return self.process_pool.run(task, timeout=task.get("timeout") or self.execution_engine.default_timeout)
+        
+        result = handler(task)
+        if inspect.iscoroutine(result):
+            # Async handler without the async core running
+            import asyncio
+            result = asyncio.run(result)
+        return result
+    
+    def _on_task_finished(self, task: Dict[str, Any], outcome: str, error: Optional[BaseException]):
+        """Execution engine callback, run on the thread that executed the task
+
+        Records the outcome durably, releases pipeline dependents (submitting
+        them from this thread, so they start without waiting for a loop pass)
+        and queues the task for handle_completed_tasks, which frees the minion
+        and updates its metrics on the orchestration thread.
+        """
+        task["outcome"] = outcome
+        task["finished_at"] = time.time()
+        if error is not None:
+            task["error"] = str(error)
+        self._set_task_status(task, outcome)
+        self.durable_queue.finish(task, outcome)
+        self.pipelines.task_finished(task, outcome)
+        self.completed_tasks.put(task)
+        self.scheduler.wake()
+    
+    def handle_design_task(self, task: Dict[str, Any]):
+        """Handle design tasks"""
+        return handle_design(task)
+    
+    def handle_code_generation_task(self, task: Dict[str, Any]):
+        """Handle code generation tasks"""
+        return handle_code_generation(task)
+    
+    def handle_testing_task(self, task: Dict[str, Any]):
+        """Handle testing tasks"""
+        return handle_testing(task)
+    
+    def handle_deployment_task(self, task: Dict[str, Any]):
+        """Handle deployment tasks"""
+        return handle_deployment(task)
+    
+    def submit_task(self, task: Dict[str, Any]) -> str:
+        """Queue a task for priority-ordered dispatch to a capable minion"""
+        # Published before the scheduler can match it, so "pending" never lands after "assigned"
+        self._set_task_status(self._prepare_task(task), "pending")
+        if self.broker is not None:
+            task_id = self.broker.enqueue([task])[0]
+        else:
+            # Durable before it can be dispatched; returns after the group commit
+            self.durable_queue.enqueue([task])
+            task_id = self.scheduler.submit(task)
+        logger.info(f"Queued {task.get('type')} task {task_id} (priority {task['priority']})")
+        return task_id
+    
+    def submit_tasks(self, tasks: List[Dict[str, Any]]) -> List[str]:
+        """Queue a batch of tasks with a single scheduler wakeup"""
+        for task in tasks:
+            self._set_task_status(self._prepare_task(task), "pending")
+        if self.broker is not None:
+            task_ids = self.broker.enqueue(tasks)
+        else:
+            self.durable_queue.enqueue(tasks)
+            task_ids = self.scheduler.submit_many(tasks)
+        logger.info(f"Queued {len(task_ids)} tasks")
+        return task_ids
+    
+    def recover_tasks(self) -> int:
+        """Re-submit the tasks a previous run left queued or in flight; returns how many"""
+        return self._resubmit(*self.durable_queue.replay())
+    
+    def reclaim_expired_tasks(self) -> int:
+        """Re-submit leased tasks that outlived their visibility timeout; returns how many"""
+        return self._resubmit(*self.durable_queue.expired(exclude=list(self.active_tasks)))
+    
+    def _resubmit(self, tasks: List[Dict[str, Any]], exhausted: List[Dict[str, Any]]) -> int:
+        for task in exhausted:
+            self._on_task_finished(task, "failed", TimeoutError(
+                f"lease expired {self.durable_queue.max_attempts} times"))
+        for task in tasks:
+            self._set_task_status(self._prepare_task(task), "pending")
+        if tasks:
+            self.scheduler.submit_many(tasks)
+        return len(tasks)
+    
+    def task_exists(self, task_id: str) -> bool:
+        """Whether a task with this id was ever submitted (or planned by a pipeline)"""
+        return self.get_task_status(task_id) is not None or self.project_database.get_task(task_id) is not None
+    
+    def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._task_status_lock:
+            status = self.task_status.get(task_id)
+            return dict(status) if status else None
+    
+    def list_task_statuses(self, status: Optional[str] = None,
+                           project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recent task states, newest first, optionally filtered"""
+        with self._task_status_lock:
+            snapshots = list(self.task_status.values())
+        return [
+            dict(snapshot) for snapshot in reversed(snapshots)
+            if (status is None or snapshot["status"] == status)
+            and (project_id is None or snapshot["project_id"] == project_id)
+        ]
+    
+    def _prepare_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        task.setdefault("id", str(uuid.uuid4()))
+        task.setdefault("priority", DEFAULT_PRIORITY)
+        return task
+    
+    def _set_task_status(self, task: Dict[str, Any], status: str):
+        """Record a task state transition and publish it to listeners"""
+        snapshot = {
+            "id": task["id"],
+            "type": task.get("type"),
+            "project_id": task.get("project_id"),
+            "priority": task.get("priority"),
+            "minion_id": task.get("minion_id"),
+            "status": status,
+            "error": task.get("error"),
+            "updated_at": time.time()
+        }
+        with self._task_status_lock:
+            self.task_status.pop(task["id"], None)
+            self.task_status[task["id"]] = snapshot
+            while len(self.task_status) > TASK_STATUS_HISTORY:
+                self.task_status.popitem(last=False)
+        self.events.publish("task", snapshot)
+    
+    def assign_tasks_to_minions(self):
+        """Assign pending tasks to available minions"""
+        for task, minion_id in self.scheduler.take_ready():
+            minion = self.omni_minions.get(minion_id)
+            if minion is None:
+                continue
+            
+            task["minion_id"] = minion_id
+            task["assigned_at"] = time.time()
+            task["resume_status"] = minion.status
+            
+            minion.status = "working"
+            minion.current_task = task.get("title") or task.get("description")
+            
+            self.active_tasks[task["id"]] = task
+            self.durable_queue.lease(task, minion_id)
+            self.task_queue.put(task)
+            self._set_task_status(task, "assigned")
+            self._minions_changed(minion)
+    
+    def monitor_task_progress(self):
+        """Monitor progress of active tasks"""
+        self.execution_engine.reap_timeouts()
+    
+    def handle_completed_tasks(self):
+        """Handle tasks that have been completed"""
+        try:
+            while True:
+                task = self.completed_tasks.get_nowait()
+                self.active_tasks.pop(task.get("id"), None)
+                
+                minion_id = task.get("minion_id")
+                minion = self.omni_minions.get(minion_id)
+                if minion is None:
+                    continue
+                
+                if minion.status == "working":
+                    minion.status = task.get("resume_status", "idle")
+                minion.current_task = None
+                self._record_task_outcome(minion, task)
+                self._minions_changed(minion)
+                
+                self.scheduler.release_minion(minion_id)
+        except queue.Empty:
+            pass
+    
+    def _record_task_outcome(self, minion: OmniMinion, task: Dict[str, Any]):
+        """Fold a finished task into the minion's performance metrics"""
+        metrics = minion.performance_metrics
+        succeeded = task.get("outcome") == "completed"
+        duration = task.get("finished_at", time.time()) - task.get("assigned_at", time.time())
+        if succeeded:
+            metrics["tasks_completed"] += 1
+            completed = metrics["tasks_completed"]
+            metrics["avg_completion_time"] += (duration - metrics["avg_completion_time"]) / completed
+        else:
+            metrics["tasks_failed"] += 1
+        
+        attempts = metrics["tasks_completed"] + metrics["tasks_failed"]
+        metrics["success_rate"] = 100.0 * metrics["tasks_completed"] / attempts
+        
+        self._record_metric(minion.id, "task_duration", duration)
+        self._record_metric(minion.id, "task_success", 1.0 if succeeded else 0.0)
+    
+    def check_agent_health(self):
+        """Check health status of all agents"""
+        # Implementation for agent health checking
+        pass
+    
+    @startup_profiler.timed
+    def load_settings(self) -> Dict[str, Any]:
+        """Load and apply saved settings; returns them for clients to display"""
+        try:
+            if os.path.exists(SETTINGS_PATH):
+                with open(SETTINGS_PATH, 'r') as f:
+                    self.apply_settings(json.load(f))
+        except Exception as e:
+            logger.error(f"Settings load error: {e}")
+        return dict(self.settings)
+    
+    def save_settings(self, settings: Dict[str, Any]):
+        """Apply and persist settings"""
+        self.apply_settings(settings)
+        os.makedirs(os.path.dirname(SETTINGS_PATH), exist_ok=True)
+        with open(SETTINGS_PATH, 'w') as f:
+            json.dump(self.settings, f, indent=2)
+        logger.info("System settings saved")
+    
+    def apply_settings(self, settings: Dict[str, Any]):
+        """Push settings into the running components"""
+        self.settings.update(settings)
+        self.execution_engine.resize(self.settings.get("max_concurrent_tasks", 25))
+        self.metrics_retention_hours = self.settings.get("metrics_retention_hours", 168)
+        if self.llm is not None:
+            from OmniTasker_LLM import provider_configs
+            self.llm.configure(provider_configs(self.settings))
+    
+    def run_forever(self):
+        """Block the calling thread until SIGINT/SIGTERM, then shut down (daemon mode)"""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: self._stop_event.set())
+        try:
+            while not self._stop_event.wait(1.0):
+                pass
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop background workers and persist buffered metrics"""
+        self._stop_event.set()
+        if self.api_server is not None:
+            self.api_server.stop()
+        if self.async_core is not None:
+            self.async_core.stop()
+        self.execution_engine.shutdown(wait=False)
+        # Unfinished tasks go back to the queue and are replayed on the next start
+        self.durable_queue.release(list(self.active_tasks))
+        self.durable_queue.stop()
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False)
+        if self.broker is not None:
+            self.broker.close()
+        if self.llm is not None:
+            self.llm.close()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        self.metrics_recorder.stop()
+        self.project_database.close()
+        logger.info("OmniTasker engine shut down")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="OmniTasker orchestration engine")
+    parser.add_argument("--async-core", action="store_true", default=None,
+                        help="run orchestration on the asyncio core instead of threads")
+    parser.add_argument("--log-json", action="store_true", default=None,
+                        help="write the log file as JSON lines")
+    parser.add_argument("--process-workers", type=int, default=None, metavar="N",
+                        help="run CPU-bound task types in N worker processes (-1: one per core, "
+                             "default: $OMNITASKER_PROCESS_WORKERS or 0 = threads only)")
+    parser.add_argument("--fleet", default=None, metavar="PATH",
+                        help="fleet definition YAML (default: $OMNITASKER_FLEET or config/fleet.yaml)")
+    parser.add_argument("--broker", default=None, metavar="PATH",
+                        help="distribute tasks to worker processes through the broker database at PATH "
+                             "(default: $OMNITASKER_BROKER; workers: python OmniTasker_Broker.py)")
+    parser.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                        help="serve Prometheus metrics on /metrics at PORT, 0 to disable "
+                             "(default: $METRICS_PORT when $MONITORING_ENABLED is true)")
+    parser.add_argument("--api", action="store_true",
+                        help="serve the local HTTP/JSON API")
+    parser.add_argument("--api-host", default=None,
+                        help="API bind address (default: $HOST or localhost)")
+    parser.add_argument("--api-port", type=int, default=None,
+                        help="API port (default: $PORT or 8000)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import and init-phase timing breakdown, then exit")
+    return parser
+
+
+def run_headless(args: argparse.Namespace):
+    """Run the engine as a GUI-less daemon"""
+    configure_logging(json_lines=args.log_json)
+    for directory in ['logs', 'data', 'reports', 'config', 'backups']:
+        os.makedirs(directory, exist_ok=True)
+    
+    engine = OmniTaskerEngine(fleet_path=args.fleet)
+    engine.load_settings()
+    engine.start(use_async_core=args.async_core, process_workers=args.process_workers,
+                 broker_path=args.broker, metrics_port=args.metrics_port)
+    if args.api:
+        engine.start_api(args.api_host, args.api_port)
+    
+    if args.profile_startup:
+        print(startup_profiler.format_report("OmniTasker_Engine"))
+        engine.shutdown()
+        return
+    
+    logger.info("OmniTasker engine running headless (Ctrl+C to stop)")
+    engine.run_forever()
+
+
+def main():
+    """Headless daemon entry point"""
+    run_headless(build_arg_parser().parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Events - In-process publish/subscribe event stream
+Task transitions, minion status changes and metric samples fan out to
+subscribers with bounded, drop-oldest buffers
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Topics the engine publishes
+EVENT_TOPICS = ("task", "minion", "metric")
+
+DEFAULT_SUBSCRIBER_CAPACITY = 1000
+
+
+@dataclass(frozen=True)
+class Event:
+    """One published event; ``id`` increases monotonically per bus"""
+    id: int
+    topic: str
+    timestamp: float
+    payload: Any
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "topic": self.topic, "timestamp": self.timestamp, "payload": self.payload}
+
+
+class Subscription:
+    """A subscriber's private buffer of events
+
+    The buffer is a ``deque(maxlen=capacity)``: when the consumer falls
+    behind, the oldest events are overwritten and counted in ``dropped``.
+    Publishing therefore never waits on a consumer.
+    """
+
+    def __init__(self, bus: "EventBus", topics: Iterable[str] = (), capacity: int = DEFAULT_SUBSCRIBER_CAPACITY):
+        self.bus = bus
+        self.topics = frozenset(topics) or None
+        self.capacity = capacity
+        self.dropped = 0
+        self.closed = False
+        self._events = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def get(self, timeout: Optional[float] = None) -> List[Event]:
+        """Block until events arrive (or timeout/close) and return all buffered ones"""
+        with self._condition:
+            if not self._events and not self.closed:
+                self._condition.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def close(self):
+        self.bus.unsubscribe(self)
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def _offer(self, event: Event):
+        with self._condition:
+            if len(self._events) == self.capacity:
+                self.dropped += 1
+            self._events.append(event)
+            self._condition.notify()
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventBus:
+    """Fans published events out to every subscription that wants the topic
+
+    The subscriber list is copy-on-write, so ``publish`` takes no bus-wide
+    lock and costs almost nothing when nobody is subscribed.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_SUBSCRIBER_CAPACITY):
+        self.capacity = capacity
+        self._subscriptions: tuple = ()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._published = 0
+
+    def subscribe(self, topics: Iterable[str] = (), capacity: Optional[int] = None) -> Subscription:
+        """Subscribe to ``topics`` (all topics if empty)"""
+        subscription = Subscription(self, topics, capacity or self.capacity)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = tuple(sub for sub in self._subscriptions if sub is not subscription)
+
+    def publish(self, topic: str, payload: Any):
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+        event = Event(next(self._sequence), topic, time.time(), payload)
+        self._published += 1
+        for subscription in subscriptions:
+            if subscription.wants(topic):
+                subscription._offer(event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        subscriptions = self._subscriptions
+        return {
+            "published": self._published,
+            "subscribers": len(subscriptions),
+            "dropped": sum(subscription.dropped for subscription in subscriptions),
+        }
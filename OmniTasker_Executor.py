@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Executor - Bounded worker pool for task execution
+Runs task handlers concurrently with per-task timeouts, cancellation and
+backpressure once the number of outstanding tasks passes a high-water mark
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_TIMEOUT = 300.0
+
+
+class TaskExecutionEngine:
+    """Executes tasks on a thread pool sized from max_concurrent_tasks
+
+    ``handler`` is called with the task dict on a worker thread. When a task
+    finishes, fails, times out or is cancelled, ``on_complete`` is called with
+    the task, an outcome string and the exception (if any). Threads cannot be
+    killed, so a timed-out task is reported as finished and its cancel event
+    is set; the handler may poll ``cancel_requested`` to stop early.
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any],
+                 max_workers: int = 25,
+                 high_water_mark: Optional[int] = None,
+                 default_timeout: float = DEFAULT_TASK_TIMEOUT,
+                 on_complete: Optional[Callable[[Dict[str, Any], str, Optional[BaseException]], None]] = None):
+        self._handler = handler
+        self._on_complete = on_complete
+        self.default_timeout = default_timeout
+
+        self._condition = threading.Condition()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._reported = set()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "rejected": 0,
+        }
+
+        self.max_workers = max(1, int(max_workers))
+        self.high_water_mark = high_water_mark or self.max_workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="omni-task")
+
+    def has_capacity(self) -> bool:
+        """True while the outstanding task count is below the high-water mark"""
+        with self._condition:
+            return len(self._futures) < self.high_water_mark
+
+    def submit(self, task: Dict[str, Any], block: bool = True, timeout: Optional[float] = None) -> bool:
+        """Schedule a task, waiting for room when the pool is past its high-water mark"""
+        task_id = task["id"]
+        with self._condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while len(self._futures) >= self.high_water_mark:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    self._stats["rejected"] += 1
+                    return False
+                self._condition.wait(remaining)
+
+            self._tasks[task_id] = task
+            self._cancel_events[task_id] = threading.Event()
+            self._futures[task_id] = self._executor.submit(self._run, task)
+            self._stats["submitted"] += 1
+        return True
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued task, or signal a running one to stop"""
+        with self._condition:
+            future = self._futures.get(task_id)
+            if future is None:
+                return False
+            task = self._tasks[task_id]
+            self._cancel_events[task_id].set()
+            cancelled = future.cancel()
+
+        if cancelled:
+            self._finish(task, "cancelled", None)
+        return cancelled
+
+    def cancel_requested(self, task_id: str) -> bool:
+        """Whether a running task has been asked to stop"""
+        event = self._cancel_events.get(task_id)
+        return event is not None and event.is_set()
+
+    def reap_timeouts(self) -> int:
+        """Report tasks that have run past their deadline as timed out"""
+        now = time.monotonic()
+        with self._condition:
+            expired = [
+                task_id for task_id, deadline in self._deadlines.items()
+                if deadline <= now and task_id not in self._reported
+            ]
+            for task_id in expired:
+                self._cancel_events[task_id].set()
+            tasks = [self._tasks[task_id] for task_id in expired]
+
+        for task in tasks:
+            logger.warning(f"Task {task['id']} exceeded its timeout")
+            self._finish(task, "timeout", None)
+        return len(tasks)
+
+    def resize(self, max_workers: int):
+        """Swap in a pool of a new size; running tasks finish on the old one"""
+        max_workers = max(1, int(max_workers))
+        with self._condition:
+            if max_workers == self.max_workers:
+                return
+            old_executor = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="omni-task")
+            self.high_water_mark = max(self.high_water_mark * max_workers // self.max_workers, max_workers)
+            self.max_workers = max_workers
+            self._condition.notify_all()
+        old_executor.shutdown(wait=False)
+        logger.info(f"Task execution pool resized to {max_workers} workers")
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release the worker threads"""
+        with self._condition:
+            pending = list(self._futures)
+        for task_id in pending:
+            self.cancel(task_id)
+        self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and lifetime counters"""
+        with self._condition:
+            in_flight = len(self._deadlines)
+            stats = dict(self._stats)
+            stats.update({
+                "queue_depth": len(self._futures) - in_flight,
+                "in_flight": in_flight,
+                "max_workers": self.max_workers,
+                "high_water_mark": self.high_water_mark,
+            })
+        return stats
+
+    def _run(self, task: Dict[str, Any]):
+        task_id = task["id"]
+        with self._condition:
+            cancelled = self._cancel_events[task_id].is_set()
+            if not cancelled:
+                self._deadlines[task_id] = time.monotonic() + float(task.get("timeout") or self.default_timeout)
+        if cancelled:
+            self._finish(task, "cancelled", None)
+            return
+
+        try:
+            self._handler(task)
+        except Exception as e:
+            logger.error(f"Task execution error ({task_id}): {e}")
+            self._finish(task, "failed", e)
+        else:
+            self._finish(task, "cancelled" if self.cancel_requested(task_id) else "completed", None)
+        finally:
+            with self._condition:
+                self._deadlines.pop(task_id, None)
+                if task_id in self._reported:
+                    self._forget_locked(task_id)
+
+    def _finish(self, task: Dict[str, Any], outcome: str, error: Optional[BaseException]):
+        task_id = task["id"]
+        with self._condition:
+            if task_id in self._reported:
+                return
+            self._reported.add(task_id)
+            self._stats[{"completed": "completed", "failed": "failed",
+                         "timeout": "timed_out", "cancelled": "cancelled"}[outcome]] += 1
+            if task_id not in self._deadlines:
+                self._forget_locked(task_id)
+
+        if self._on_complete is not None:
+            try:
+                self._on_complete(task, outcome, error)
+            except Exception as e:
+                logger.error(f"Task completion callback error: {e}")
+
+    def _forget_locked(self, task_id: str):
+        self._tasks.pop(task_id, None)
+        self._futures.pop(task_id, None)
+        self._cancel_events.pop(task_id, None)
+        self._reported.discard(task_id)
+        self._condition.notify_all()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Fleet - YAML-defined minion fleet and per-role autoscaler
+Roles, their capabilities and size bounds come from config/fleet.yaml; the
+autoscaler grows a role whose tasks queue up and shrinks it again when idle
+"""
+
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLEET_PATH = "config/fleet.yaml"
+
+# The original fixed fleet of 25; used when no fleet file exists
+DEFAULT_FLEET = {
+    "roles": {
+        "coder": {
+            "name": "CodeMaster",
+            "role": "Developer",
+            "specializations": ["Python", "JavaScript", "Java", "C++", "Go"],
+            "capabilities": ["code_generation", "debugging", "optimization",
+                             "testing", "documentation", "refactoring"],
+            "count": 5, "min": 2, "max": 15,
+        },
+        "tester": {
+            "name": "TestGuardian",
+            "role": "Quality Assurance",
+            "specializations": ["Unit Testing", "Integration Testing", "Load Testing", "Security Testing"],
+            "capabilities": ["test_design", "automation", "performance_analysis",
+                             "security_scanning", "regression_testing"],
+            "count": 4, "min": 2, "max": 12,
+        },
+        "designer": {
+            "name": "DesignMaestro",
+            "role": "Designer",
+            "specializations": ["UI/UX Design", "Wireframing", "Prototyping"],
+            "capabilities": ["visual_design", "user_experience", "accessibility",
+                             "responsive_design", "brand_consistency"],
+            "count": 3, "min": 1, "max": 6,
+        },
+        "devops": {
+            "name": "DeployMaster",
+            "role": "DevOps Engineer",
+            "specializations": ["CI/CD", "Deployment", "Monitoring"],
+            "capabilities": ["infrastructure", "automation", "scaling",
+                             "security", "monitoring", "optimization"],
+            "count": 3, "min": 1, "max": 8,
+        },
+        "liaison": {
+            "name": "ClientBridge",
+            "role": "Client Relations",
+            "specializations": ["Communication", "Documentation", "Reporting"],
+            "capabilities": ["client_communication", "requirement_analysis",
+                             "project_reporting", "stakeholder_management"],
+            "count": 3, "min": 1, "max": 6,
+        },
+        "researcher": {
+            "name": "InsightSeeker",
+            "role": "Researcher",
+            "specializations": ["Market Analysis", "Technology Trends"],
+            "capabilities": ["market_research", "trend_analysis", "competitive_analysis",
+                             "technology_evaluation", "feasibility_assessment"],
+            "count": 2, "min": 1, "max": 4,
+        },
+        "integrator": {
+            "name": "ConnectMaster",
+            "role": "Integration Specialist",
+            "specializations": ["API Integration", "Third-party Services"],
+            "capabilities": ["api_integration", "service_connection", "data_mapping",
+                             "authentication", "error_handling"],
+            "count": 2, "min": 1, "max": 4,
+        },
+        "maintainer": {
+            "name": "SystemKeeper",
+            "role": "Maintenance Specialist",
+            "specializations": ["Updates", "Optimization", "Support"],
+            "capabilities": ["system_maintenance", "performance_optimization",
+                             "bug_fixing", "user_support", "documentation_updates"],
+            "count": 3, "min": 1, "max": 6,
+        },
+    },
+    "autoscaler": {},
+}
+
+
+@dataclass
+class RoleSpec:
+    """One role of the fleet; minion ids are ``<key>_<n>``"""
+    key: str
+    name: str
+    role: str
+    capabilities: List[str]
+    specializations: List[str]
+    count: int
+    min_count: int
+    max_count: int
+
+    def minion_fields(self, index: int) -> Dict[str, Any]:
+        """Constructor arguments for the role's ``index``-th (1-based) OmniMinion"""
+        specializations = self.specializations or [self.role]
+        return {
+            "id": f"{self.key}_{index}",
+            "name": f"{self.name}-{index}",
+            "role": self.role,
+            "specialization": specializations[(index - 1) % len(specializations)],
+            "capabilities": list(self.capabilities),
+        }
+
+
+@dataclass
+class AutoscalerConfig:
+    enabled: bool = True
+    # Seconds between evaluations
+    interval: float = 15.0
+    # Scale up once a role has more queued tasks than this per minion...
+    target_backlog_per_minion: float = 2.0
+    # ...or its oldest queued task has waited longer than this
+    max_wait_seconds: float = 30.0
+    # Most minions added to one role per evaluation
+    scale_up_step: int = 2
+    # Minimum seconds between two scale-ups / since any change before a scale-down
+    scale_up_cooldown: float = 30.0
+    scale_down_cooldown: float = 120.0
+
+
+@dataclass
+class FleetConfig:
+    roles: List[RoleSpec]
+    autoscaler: AutoscalerConfig = field(default_factory=AutoscalerConfig)
+
+    def role_for(self, minion_id: str) -> Optional[RoleSpec]:
+        """The fleet role that created ``minion_id``, if any"""
+        key, _, index = minion_id.rpartition("_")
+        if not index.isdigit():
+            return None
+        for spec in self.roles:
+            if spec.key == key:
+                return spec
+        return None
+
+    @property
+    def initial_size(self) -> int:
+        return sum(spec.count for spec in self.roles)
+
+
+def parse_fleet_config(data: Dict[str, Any]) -> FleetConfig:
+    """Build a FleetConfig from the fleet file's mapping, validating the bounds"""
+    roles = []
+    for key, role in (data.get("roles") or {}).items():
+        count = int(role.get("count", 1))
+        min_count = int(role.get("min", count))
+        max_count = int(role.get("max", count))
+        if not 0 <= min_count <= count <= max_count:
+            raise ValueError(f"Fleet role {key!r} needs 0 <= min <= count <= max")
+        roles.append(RoleSpec(
+            key=key,
+            name=role.get("name", key.title()),
+            role=role.get("role", key.title()),
+            capabilities=list(role.get("capabilities") or []),
+            specializations=list(role.get("specializations") or []),
+            count=count,
+            min_count=min_count,
+            max_count=max_count
+        ))
+
+    autoscaler = AutoscalerConfig()
+    for name, value in (data.get("autoscaler") or {}).items():
+        if not hasattr(autoscaler, name):
+            raise ValueError(f"Unknown autoscaler setting: {name}")
+        setattr(autoscaler, name, type(getattr(autoscaler, name))(value))
+    return FleetConfig(roles, autoscaler)
+
+
+def load_fleet_config(path: Optional[str] = None) -> FleetConfig:
+    """Read the fleet file ($OMNITASKER_FLEET or config/fleet.yaml), else the default fleet"""
+    path = path or os.getenv("OMNITASKER_FLEET", DEFAULT_FLEET_PATH)
+    if not os.path.exists(path):
+        return parse_fleet_config(DEFAULT_FLEET)
+    try:
+        import yaml
+    except ImportError:
+        logger.error(f"PyYAML not installed, ignoring fleet file {path}")
+        return parse_fleet_config(DEFAULT_FLEET)
+
+    with open(path, 'r') as f:
+        config = parse_fleet_config(yaml.safe_load(f) or {})
+    logger.info(f"Loaded fleet of {config.initial_size} minions in {len(config.roles)} roles from {path}")
+    return config
+
+
+@dataclass
+class ScaleDecision:
+    """Grow ``role`` by ``delta`` minions, or remove ``remove`` (idle minion ids)"""
+    role: RoleSpec
+    delta: int
+    reason: str
+    remove: List[str] = field(default_factory=list)
+
+
+class FleetAutoscaler:
+    """Sizes each role from its share of the task backlog
+
+    A role's demand is the queued tasks needing any of its capabilities
+    and how long the oldest of them has waited. Too many per minion, or
+    too long a wait, adds up to ``scale_up_step`` minions; a role with
+    nothing queued gives back one idle minion per evaluation. Cooldowns
+    keep a burst from making the fleet oscillate, and the role's min/max
+    always hold.
+    """
+
+    def __init__(self, config: FleetConfig):
+        self.config = config
+        self.settings = config.autoscaler
+        self._last_scale_up: Dict[str, float] = {}
+        # The configured sizes hold for one cooldown before anything is retired
+        started = time.time()
+        self._last_change: Dict[str, float] = {spec.key: started for spec in config.roles}
+        self._last_run = 0.0
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Rate-limit evaluations to the configured interval"""
+        now = now or time.time()
+        if not self.settings.enabled or now - self._last_run < self.settings.interval:
+            return False
+        self._last_run = now
+        return True
+
+    def evaluate(self, backlog: Dict[str, Tuple[int, float]],
+                 members: Dict[str, List[Tuple[str, str]]],
+                 now: Optional[float] = None) -> List[ScaleDecision]:
+        """Decide scale changes
+
+        ``backlog`` maps capability -> (queued tasks, oldest enqueue time);
+        ``members`` maps role key -> [(minion_id, status), ...].
+        """
+        now = now or time.time()
+        settings = self.settings
+        decisions = []
+        for spec in self.config.roles:
+            minions = members.get(spec.key, [])
+            size = len(minions)
+            demand = [backlog[capability] for capability in spec.capabilities if capability in backlog]
+            depth = sum(count for count, _ in demand)
+            wait = now - min(oldest for _, oldest in demand) if depth else 0.0
+
+            if size < spec.min_count:
+                decisions.append(ScaleDecision(spec, spec.min_count - size, "below minimum"))
+            elif (depth > size * settings.target_backlog_per_minion or wait > settings.max_wait_seconds) \
+                    and size < spec.max_count \
+                    and now - self._last_scale_up.get(spec.key, 0.0) >= settings.scale_up_cooldown:
+                wanted = math.ceil(depth / settings.target_backlog_per_minion) - size
+                delta = max(1, min(settings.scale_up_step, wanted, spec.max_count - size))
+                decisions.append(ScaleDecision(spec, delta, f"{depth} queued, oldest waited {wait:.0f}s"))
+                self._last_scale_up[spec.key] = now
+            elif depth == 0 and size > spec.min_count \
+                    and now - self._last_change.get(spec.key, 0.0) >= settings.scale_down_cooldown:
+                idle = [minion_id for minion_id, status in minions if status == "idle"]
+                if not idle:
+                    continue
+                decisions.append(ScaleDecision(spec, -1, "no queued tasks", remove=idle[-1:]))
+            else:
+                continue
+            self._last_change[spec.key] = now
+        return decisions
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Handlers - Implementations of the built-in task types
+Plain module-level functions, so the same code runs on the engine's worker
+threads or inside the worker processes of OmniTasker_Processes
+"""
+
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+def handle_design(task: Dict[str, Any]):
+    """Handle design tasks"""
+    # Implementation for design
+    logger.info(f"Executing design task: {task.get('description')}")
+
+
+def handle_code_generation(task: Dict[str, Any]):
+    """Handle code generation tasks"""
+    # Implementation for code generation
+    logger.info(f"Executing code generation task: {task.get('description')}")
+
+
+def handle_testing(task: Dict[str, Any]):
+    """Handle testing tasks"""
+    # Implementation for testing
+    logger.info(f"Executing testing task: {task.get('description')}")
+
+
+def handle_deployment(task: Dict[str, Any]):
+    """Handle deployment tasks"""
+    # Implementation for deployment
+    logger.info(f"Executing deployment task: {task.get('description')}")
+
+
+# Task type -> handler, for runners that dispatch by type (OmniTasker_Broker workers)
+TASK_HANDLERS = {
+    "design": handle_design,
+    "code_generation": handle_code_generation,
+    "testing": handle_testing,
+    "deployment": handle_deployment,
+}
+
+
+def warm_up():
+    """Called once in every worker process before it takes tasks
+
+    Put expensive imports and caches needed by the handlers here so the
+    first task a worker runs does not pay for them.
+    """
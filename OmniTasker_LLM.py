@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+OmniTasker LLM - Pooled chat-completion client with provider failover
+One keep-alive session per provider shared by every caller, a concurrency
+limit, a token-bucket rate limiter per provider and failover from OpenAI to
+Grok (both speak the OpenAI chat-completions protocol)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from OmniTasker_Cache import ResponseCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 60.0
+# Seconds a provider is skipped after a failure that another provider may not share
+FAILURE_COOLDOWN = 30.0
+# Longest wait for a rate-limit token once every provider is out of them
+MAX_RATE_LIMIT_WAIT = 30.0
+
+PROJECT_ANALYSIS_SYSTEM_PROMPT = """You are the planning lead of OmniTasker, a team of AI agents \
+(OmniMinions) that build software: developers (CodeMaster), QA (TestGuardian), designers \
+(DesignMaestro), DevOps (DeployMaster), client relations (ClientBridge), researchers \
+(InsightSeeker), integration specialists (ConnectMaster) and maintainers (SystemKeeper).
+Analyze the user's project idea and answer in plain text with these sections:
+PROJECT OVERVIEW, RECOMMENDED APPROACH (technology stack, timeline, team size),
+ASSIGNED OMNIMINIONS, RECOMMENDED FEATURES, POTENTIAL CHALLENGES and SUCCESS PROBABILITY.
+Be concrete and concise."""
+
+# Responses that mean "try another provider": throttled, server-side or credential trouble
+FAILOVER_STATUSES = frozenset((401, 403, 408, 409, 429, 500, 502, 503, 504))
+
+
+class LLMError(Exception):
+    """No provider could answer the request"""
+
+
+class ProviderUnavailable(LLMError):
+    """This provider failed in a way another provider may not; try the next one"""
+
+
+class LLMCancelled(LLMError):
+    """A streaming request was cancelled by its caller"""
+
+
+@dataclass
+class ProviderConfig:
+    """One OpenAI-compatible backend"""
+    name: str
+    base_url: str
+    model: str
+    api_key: str = ""
+    max_tokens: int = 1500
+    # Token bucket: sustained rate and burst size
+    requests_per_minute: float = 60.0
+    burst: int = 5
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    provider: str
+    model: str
+    latency: float
+    usage: Dict[str, Any] = field(default_factory=dict)
+    cached: bool = False
+    # Streaming only: seconds until the first text arrived
+    first_chunk_latency: Optional[float] = None
+
+
+def provider_configs(settings: Optional[Dict[str, Any]] = None) -> List[ProviderConfig]:
+    """Providers in failover order, keys from the saved settings or the environment
+
+    Only providers with an API key are returned.
+    """
+    settings = settings or {}
+    providers = [
+        ProviderConfig(
+            name="openai",
+            base_url=os.getenv("OPENAI_API_URL", "https://api.openai.com/v1"),
+            model=os.getenv("OPENAI_MODEL", "gpt-4"),
+            api_key=settings.get("openai_api_key") or os.getenv("OPENAI_API_KEY", ""),
+            max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "1500")),
+            requests_per_minute=float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "60")),
+        ),
+        ProviderConfig(
+            name="grok",
+            base_url=os.getenv("GROK_API_URL", "https://api.x.ai/v1"),
+            model=os.getenv("GROK_MODEL", "grok-3"),
+            api_key=settings.get("grok_api_key") or os.getenv("GROK_API_KEY", ""),
+            max_tokens=int(os.getenv("GROK_MAX_TOKENS", "1500")),
+            requests_per_minute=float(os.getenv("GROK_REQUESTS_PER_MINUTE", "60")),
+        ),
+    ]
+    return [provider for provider in providers if provider.api_key]
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, at most ``capacity`` banked"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; returns 0, or the seconds until one will be"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a token is taken; False if that would take longer than ``timeout``"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class _Provider:
+    """A provider's session, rate limiter and health"""
+
+    def __init__(self, config: ProviderConfig, pool_size: int):
+        self.config = config
+        self.bucket = TokenBucket(config.requests_per_minute / 60.0, config.burst)
+        self.session = requests.Session()
+        # Every caller shares this pool, so concurrent requests reuse warm
+        # connections instead of each opening (and TLS-handshaking) its own
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {config.api_key}",
+            "Content-Type": "application/json",
+        })
+        self.unavailable_until = 0.0
+        self.stats = {"requests": 0, "failures": 0, "rate_limited": 0, "total_seconds": 0.0}
+
+    def available(self, now: float) -> bool:
+        return now >= self.unavailable_until
+
+
+class LLMClient:
+    """Chat-completion client shared by the GUI, the engine and its minions
+
+    ``complete`` tries the providers in order. A provider that is
+    throttled, erroring or rejecting its key is put on a cooldown and the
+    request moves to the next one; a provider whose rate-limit bucket is
+    empty is passed over while another has tokens. At most
+    ``max_concurrency`` requests are in flight at once, across all
+    providers; a request only takes a slot once it holds a rate-limit
+    token, so one waiting on a throttled provider does not starve others. ``submit`` runs ``complete`` on the client's own worker
+    threads and returns a Future, for callers (like the Tk thread) that
+    must not block.
+
+    With a ``cache``, a request whose normalized prompt, provider models
+    and parameters were answered before is served from it without an API
+    call.
+    """
+
+    def __init__(self, providers: List[ProviderConfig],
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 cache: Optional[ResponseCache] = None):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._providers: List[_Provider] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"requests": 0, "failovers": 0, "errors": 0}
+        self.configure(providers)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._providers)
+
+    def configure(self, providers: List[ProviderConfig]):
+        """Replace the provider list (e.g. after new keys are saved); unchanged providers keep their pools"""
+        with self._lock:
+            current = {provider.config.name: provider for provider in self._providers}
+            updated = []
+            for config in providers:
+                provider = current.pop(config.name, None)
+                if provider is None or provider.config != config:
+                    if provider is not None:
+                        provider.session.close()
+                    provider = _Provider(config, self.max_concurrency)
+                updated.append(provider)
+            for provider in current.values():
+                provider.session.close()
+            self._providers = updated
+
+    def complete(self, prompt: str, system: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: Optional[int] = None,
+                 use_cache: bool = True) -> LLMResponse:
+        """Send one chat completion, failing over between providers"""
+        providers, key, cached = self._lookup(prompt, system, temperature, max_tokens, use_cache)
+        if cached is not None:
+            return cached
+        response = self._send(providers, prompt, system, temperature, max_tokens)
+        self._store(key, response)
+        return response
+
+    def stream(self, prompt: str, on_chunk: Callable[[str], None],
+               cancel: Optional[threading.Event] = None, system: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: Optional[int] = None,
+               use_cache: bool = True) -> LLMResponse:
+        """Like ``complete``, but calls ``on_chunk`` with each piece of text as it arrives
+
+        Failover is only possible until the first chunk has been delivered.
+        Setting ``cancel`` stops reading (raising LLMCancelled) at the next
+        chunk. A cached response is delivered as a single chunk.
+        """
+        providers, key, cached = self._lookup(prompt, system, temperature, max_tokens, use_cache)
+        if cached is not None:
+            on_chunk(cached.text)
+            return cached
+        response = self._send(providers, prompt, system, temperature, max_tokens, on_chunk, cancel)
+        self._store(key, response)
+        return response
+
+    def submit(self, prompt: str, **kwargs: Any) -> Future:
+        """``complete`` on a worker thread"""
+        return self._executor_for().submit(self.complete, prompt, **kwargs)
+
+    def submit_stream(self, prompt: str, on_chunk: Callable[[str], None], **kwargs: Any) -> Future:
+        """``stream`` on a worker thread; ``on_chunk`` is called on that thread"""
+        return self._executor_for().submit(self.stream, prompt, on_chunk, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["providers"] = {provider.config.name: dict(provider.stats, available=provider.available(time.time()))
+                                  for provider in self._providers}
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            providers, self._providers = self._providers, []
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for provider in providers:
+            provider.session.close()
+
+    def _executor_for(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="omni-llm")
+            return self._executor
+
+    def _lookup(self, prompt: str, system: Optional[str], temperature: float, max_tokens: Optional[int],
+                use_cache: bool) -> Tuple[List[_Provider], Optional[str], Optional[LLMResponse]]:
+        """Providers to try, the request's cache key and its cached response, if any"""
+        with self._lock:
+            providers = list(self._providers)
+            self._stats["requests"] += 1
+        if not providers:
+            raise LLMError("No LLM provider configured (set an OpenAI or Grok API key)")
+        if not use_cache or self.cache is None:
+            return providers, None, None
+
+        key = cache_key(prompt, ",".join(provider.config.model for provider in providers),
+                        system=system, temperature=temperature, max_tokens=max_tokens)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return providers, key, LLMResponse(**json.loads(cached), latency=0.0, cached=True)
+        return providers, key, None
+
+    def _store(self, key: Optional[str], response: LLMResponse):
+        if key is not None:
+            self.cache.put(key, json.dumps({"text": response.text, "provider": response.provider,
+                                            "model": response.model, "usage": response.usage}))
+
+    def _send(self, providers: List[_Provider], prompt: str, system: Optional[str],
+              temperature: float, max_tokens: Optional[int],
+              on_chunk: Optional[Callable[[str], None]] = None,
+              cancel: Optional[threading.Event] = None) -> LLMResponse:
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+
+        errors = []
+        for provider in self._ordered(providers):
+            payload = {
+                "model": provider.config.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens or provider.config.max_tokens,
+            }
+            try:
+                with self._slots:
+                    return self._request(provider, payload, on_chunk, cancel)
+            except ProviderUnavailable as e:
+                errors.append(f"{provider.config.name}: {e}")
+                with self._lock:
+                    self._stats["failovers"] += 1
+            except LLMCancelled:
+                raise
+            except LLMError:
+                self._count_error()
+                raise
+
+        self._count_error()
+        raise LLMError("; ".join(errors) or "Every LLM provider is cooling down")
+
+    def _ordered(self, providers: List[_Provider]):
+        """Healthy providers in order, taking a rate-limit token from each before yielding it
+
+        A provider with an empty bucket is deferred; if every healthy one is
+        empty, wait for whichever refills first. Called without holding a
+        concurrency slot.
+        """
+        now = time.time()
+        healthy = [provider for provider in providers if provider.available(now)]
+        deferred = []
+        for provider in healthy:
+            wait = provider.bucket.try_acquire()
+            if wait == 0.0:
+                yield provider
+            else:
+                self._record(provider, rate_limited=1)
+                deferred.append((wait, provider))
+        for wait, provider in sorted(deferred, key=lambda item: item[0]):
+            if wait <= MAX_RATE_LIMIT_WAIT and provider.bucket.acquire(MAX_RATE_LIMIT_WAIT):
+                yield provider
+
+    def _request(self, provider: _Provider, payload: Dict[str, Any],
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[threading.Event] = None) -> LLMResponse:
+        config = provider.config
+        started = time.perf_counter()
+        self._record(provider, requests=1)
+        if on_chunk is not None:
+            payload["stream"] = True
+        try:
+            response = provider.session.post(f"{config.base_url.rstrip('/')}/chat/completions",
+                                             json=payload, timeout=self.timeout, stream=on_chunk is not None)
+        except requests.RequestException as e:
+            self._fail(provider, FAILURE_COOLDOWN)
+            raise ProviderUnavailable(f"request failed: {e}") from e
+        finally:
+            self._record(provider, total_seconds=time.perf_counter() - started)
+
+        if response.status_code in FAILOVER_STATUSES:
+            response.close()
+            retry_after = response.headers.get("Retry-After", "")
+            self._fail(provider, float(retry_after) if retry_after.isdigit() else FAILURE_COOLDOWN)
+            raise ProviderUnavailable(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            # A malformed request fails the same way everywhere: no failover, no cooldown
+            raise LLMError(f"HTTP {response.status_code}: {response.text[:200]}")
+        if on_chunk is not None:
+            return self._read_stream(provider, response, started, on_chunk, cancel)
+
+        try:
+            body = response.json()
+            text = body["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._fail(provider, FAILURE_COOLDOWN)
+            raise ProviderUnavailable(f"unexpected response: {e}") from e
+        return LLMResponse(text=text, provider=config.name, model=body.get("model", config.model),
+                           latency=time.perf_counter() - started, usage=body.get("usage") or {})
+
+    def _read_stream(self, provider: _Provider, response: requests.Response, started: float,
+                     on_chunk: Callable[[str], None], cancel: Optional[threading.Event]) -> LLMResponse:
+        """Consume a server-sent-events completion ("data: {json}" lines, then "data: [DONE]")"""
+        parts: List[str] = []
+        model = provider.config.model
+        first_chunk = None
+        reading = time.perf_counter()
+        with response:
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if cancel is not None and cancel.is_set():
+                        raise LLMCancelled(f"Cancelled after {len(parts)} chunks")
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    model = event.get("model", model)
+                    text = (event["choices"][0].get("delta") or {}).get("content") if event["choices"] else None
+                    if text:
+                        if first_chunk is None:
+                            first_chunk = time.perf_counter() - started
+                        parts.append(text)
+                        on_chunk(text)
+            except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+                if not parts:
+                    self._fail(provider, FAILURE_COOLDOWN)
+                    raise ProviderUnavailable(f"stream failed: {e}") from e
+                # Part of the answer is already with the caller; another provider cannot continue it
+                raise LLMError(f"{provider.config.name} stream interrupted: {e}") from e
+            finally:
+                self._record(provider, total_seconds=time.perf_counter() - reading)
+        return LLMResponse(text="".join(parts), provider=provider.config.name, model=model,
+                           latency=time.perf_counter() - started, first_chunk_latency=first_chunk)
+
+    def _count_error(self):
+        with self._lock:
+            self._stats["errors"] += 1
+
+    def _record(self, provider: _Provider, **increments: float):
+        """Add to a provider's stats; executor threads update them concurrently"""
+        with self._lock:
+            for key, amount in increments.items():
+                provider.stats[key] += amount
+
+    def _fail(self, provider: _Provider, cooldown: float):
+        self._record(provider, failures=1)
+        provider.unavailable_until = time.time() + cooldown
+        logger.warning(f"LLM provider {provider.config.name} unavailable for {cooldown:.0f}s")
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Log Viewer - Virtualized, tail-following log display
+Memory-maps the log file, keeps an index of line offsets and renders only the
+visible window of lines, so multi-hundred-MB logs open instantly
+"""
+
+import logging
+import mmap
+import os
+import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from tkinter import ttk
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Bytes indexed per step on the Tk thread; a large log is indexed over many steps
+INDEX_CHUNK_BYTES = 256 * 1024
+
+
+def level_markers(level: str) -> List[bytes]:
+    """Byte patterns that identify a record of ``level`` in the log formats we write"""
+    # Plain-text TEXT_FORMAT records and JsonLinesFormatter records
+    return [f" - {level} - ".encode(), f'"level": "{level}"'.encode()]
+
+
+class LogIndex:
+    """Byte-offset index over a growing (and possibly rotated) log file
+
+    ``refresh`` only scans bytes appended since the last call, and at most
+    ``max_bytes`` of them, so a caller on a UI thread can index a large file
+    in steps until ``pending`` is false. If the file is replaced (different
+    inode) or shrinks, it is treated as rotated, re-indexed from the start,
+    and ``generation`` is incremented. Filters are evaluated with
+    ``mmap.find`` over the mapped file and mapped back to line numbers by
+    bisecting the offsets.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offsets = array("Q")
+        self.level: Optional[str] = None
+        self.substring: Optional[str] = None
+        self.matches = array("Q")
+        self._mm: Optional[mmap.mmap] = None
+        self._file = None
+        self._identity = None
+        self._mapped = 0
+        self._scanned_to = 0
+        self._indexed_to = 0
+        self._matched_to = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self.matches) if self.filtered else len(self.offsets)
+
+    @property
+    def filtered(self) -> bool:
+        return bool(self.level or self.substring)
+
+    @property
+    def pending(self) -> bool:
+        """Whether mapped bytes are still waiting to be indexed or matched"""
+        return self._scanned_to < self._mapped or (self.filtered and self._matched_to < self._indexed_to)
+
+    def refresh(self, max_bytes: Optional[int] = None) -> int:
+        """Index newly appended lines, at most ``max_bytes`` of them; returns how many were added"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset()
+            return 0
+
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self._indexed_to:
+            if self._identity is not None:
+                logger.info(f"Log file {self.path} was rotated; re-indexing")
+                self._reset()
+                self.generation += 1
+            self._identity = identity
+
+        if stat.st_size > self._mapped:
+            self._remap(stat.st_size)
+        if self._mm is None:
+            return 0
+
+        before = len(self.offsets)
+        end = self._mapped if max_bytes is None else min(self._mapped, self._scanned_to + max_bytes)
+        position = self._scanned_to
+        start = self._indexed_to
+        while True:
+            newline = self._mm.find(b"\n", position, end)
+            if newline == -1:
+                break
+            self.offsets.append(start)
+            start = position = newline + 1
+        # Only complete lines are indexed; a partial last line waits for its newline
+        self._indexed_to = start
+        self._scanned_to = end
+
+        self._extend_matches(max_bytes)
+        return len(self.offsets) - before
+
+    def set_filter(self, level: Optional[str] = None, substring: Optional[str] = None):
+        """Change the level/substring filter; ``refresh`` rebuilds the match index"""
+        self.level = level or None
+        self.substring = substring or None
+        self.matches = array("Q")
+        self._matched_to = 0
+
+    @property
+    def size(self) -> int:
+        """Bytes of the file mapped so far (indexed or still pending)"""
+        return self._mapped
+
+    def first_row_from(self, offset: int) -> int:
+        """First (possibly filtered) row of a line starting at byte ``offset`` or later"""
+        number = bisect_left(self.offsets, offset)
+        return bisect_left(self.matches, number) if self.filtered else number
+
+    def line_number(self, row: int) -> int:
+        """File line number for a (possibly filtered) row"""
+        return self.matches[row] if self.filtered else row
+
+    def line(self, number: int) -> str:
+        start = self.offsets[number]
+        end = self.offsets[number + 1] if number + 1 < len(self.offsets) else self._indexed_to
+        return self._mm[start:end].decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def rows(self, first: int, count: int) -> List[str]:
+        """Text of ``count`` rows starting at ``first``"""
+        last = min(first + count, len(self))
+        return [self.line(self.line_number(row)) for row in range(first, last)]
+
+    def iter_rows(self, first: int = 0) -> Iterator[str]:
+        for row in range(first, len(self)):
+            yield self.line(self.line_number(row))
+
+    def close(self):
+        self._reset()
+
+    def _extend_matches(self, max_bytes: Optional[int] = None):
+        if not self.filtered or self._mm is None:
+            return
+        if self.substring:
+            primary = [self.substring.encode()]
+        else:
+            primary = level_markers(self.level)
+        secondary = level_markers(self.level) if self.substring and self.level else None
+
+        end = self._indexed_to
+        if max_bytes is not None and self._matched_to + max_bytes < end:
+            # Stop on a line boundary so no match straddles two steps
+            following = bisect_left(self.offsets, self._matched_to + max_bytes)
+            end = self.offsets[following] if following < len(self.offsets) else end
+        position = self._matched_to
+        # Next hit of each pattern; a pattern is only searched again once passed, so
+        # one that never occurs (the JSON marker in a text log) costs one scan, not one per line
+        upcoming = [None] * len(primary)
+        while position < end:
+            upcoming = [self._mm.find(pattern, position, end) if hit is None or -1 < hit < position else hit
+                        for pattern, hit in zip(primary, upcoming)]
+            hits = [hit for hit in upcoming if hit != -1]
+            if not hits:
+                break
+            number = bisect_right(self.offsets, min(hits)) - 1
+            if secondary is None or self._contains_any(self._line_bytes(number), secondary):
+                self.matches.append(number)
+            position = self.offsets[number + 1] if number + 1 < len(self.offsets) else end
+        self._matched_to = end
+
+    @staticmethod
+    def _contains_any(line: bytes, patterns: List[bytes]) -> bool:
+        return any(pattern in line for pattern in patterns)
+
+    def _line_bytes(self, number: int) -> bytes:
+        end = self.offsets[number + 1] if number + 1 < len(self.offsets) else self._indexed_to
+        return self._mm[self.offsets[number]:end]
+
+    def _remap(self, size: int):
+        if self._file is None:
+            self._file = open(self.path, "rb")
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        self._mapped = size
+
+    def _reset(self):
+        if self._mm is not None:
+            self._mm.close()
+        if self._file is not None:
+            self._file.close()
+        self._mm = None
+        self._file = None
+        self._identity = None
+        self._mapped = 0
+        self._scanned_to = 0
+        self._indexed_to = 0
+        self._matched_to = 0
+        self.offsets = array("Q")
+        self.matches = array("Q")
+
+
+class LogViewer(ttk.Frame):
+    """Tk widget showing only the visible window of a LogIndex
+
+    The Text widget never holds more than one screen of lines; the scrollbar
+    is driven by the row position in the index. With "Follow" on, the view
+    polls the file and stays pinned to the newest lines. Indexing runs in
+    ``INDEX_CHUNK_BYTES`` steps scheduled with ``after``, so opening or
+    filtering a large log never blocks the main loop for long.
+    """
+
+    def __init__(self, parent: tk.Misc, path: str, poll_ms: int = 1000, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.index = LogIndex(path)
+        self.poll_ms = poll_ms
+        self.first_row = 0
+        self.cleared_offset = 0  # Lines starting before this byte are hidden by clear()
+        self.visible_rows = 30
+        self._poll_id = None
+        self._step_id = None
+        self._generation = self.index.generation
+
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(controls, text="Level:").pack(side=tk.LEFT)
+        self.level_var = tk.StringVar(value="ALL")
+        level_combo = ttk.Combobox(controls, textvariable=self.level_var, width=10, state="readonly",
+                                   values=("ALL",) + LOG_LEVELS)
+        level_combo.pack(side=tk.LEFT, padx=5)
+        level_combo.bind("<<ComboboxSelected>>", lambda event: self.apply_filter())
+
+        ttk.Label(controls, text="Contains:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(controls, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind("<Return>", lambda event: self.apply_filter())
+
+        self.follow_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(controls, text="Follow", variable=self.follow_var,
+                        command=self._on_follow_toggled).pack(side=tk.LEFT, padx=5)
+
+        self.status_label = ttk.Label(controls, text="")
+        self.status_label.pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.text = tk.Text(body, height=15, wrap=tk.NONE)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.text.bind("<Configure>", self._on_resize)
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll(3))
+
+    @property
+    def base_row(self) -> int:
+        return self.index.first_row_from(self.cleared_offset)
+
+    @property
+    def total_rows(self) -> int:
+        return max(len(self.index) - self.base_row, 0)
+
+    def refresh(self):
+        """Index the next step of new lines and redraw the visible window"""
+        if self._step_id is not None:
+            self.after_cancel(self._step_id)
+            self._step_id = None
+        try:
+            self.index.refresh(INDEX_CHUNK_BYTES)
+        except Exception as e:
+            logger.error(f"Log refresh error: {e}")
+            return
+        if self.index.generation != self._generation:
+            self._generation = self.index.generation
+            self.cleared_offset = 0  # Rotated: the new file has not been cleared
+        if self.index.pending:
+            self._step_id = self.after(1, self.refresh)
+        if self.follow_var.get():
+            self.first_row = max(self.total_rows - self.visible_rows, 0)
+        self.render()
+
+    def start_following(self):
+        """Poll the file for appended lines on the Tk main loop"""
+        self.refresh()
+        self._poll_id = self.after(self.poll_ms, self.start_following)
+
+    def stop_following(self):
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._step_id is not None:
+            self.after_cancel(self._step_id)
+            self._step_id = None
+
+    def apply_filter(self):
+        level = self.level_var.get()
+        self.index.set_filter(level=None if level == "ALL" else level, substring=self.search_var.get())
+        self.first_row = 0
+        self.refresh()
+
+    def clear(self):
+        """Hide everything in the file so far; only lines written from now on are shown"""
+        self.cleared_offset = self.index.size
+        self.first_row = 0
+        self.render()
+
+    def scroll(self, rows: int):
+        self.follow_var.set(False)
+        self._scroll_to(self.first_row + rows)
+
+    def iter_lines(self) -> Iterator[str]:
+        """All rows currently selected by the filter, for export"""
+        return self.index.iter_rows(self.base_row)
+
+    def render(self):
+        total = self.total_rows
+        lines = self.index.rows(self.base_row + self.first_row, self.visible_rows)
+
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(lines))
+        self.text.configure(state=tk.DISABLED)
+
+        if total:
+            self.scrollbar.set(self.first_row / total, min((self.first_row + self.visible_rows) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.status_label.config(text=f"{total:,} lines" + (" (indexing...)" if self.index.pending else ""))
+
+    def _scroll_to(self, row: int):
+        self.first_row = min(max(int(row), 0), max(self.total_rows - self.visible_rows, 0))
+        self.render()
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            self.follow_var.set(False)
+            self._scroll_to(float(args[0]) * self.total_rows)
+        elif action == "scroll":
+            amount = int(args[0])
+            self.scroll(amount * self.visible_rows if args[1] == "pages" else amount)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_follow_toggled(self):
+        if self.follow_var.get():
+            self.refresh()
+
+    def _on_resize(self, event):
+        line_height = self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace")
+        rows = max(int(event.height) // max(int(line_height), 1), 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
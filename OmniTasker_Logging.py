@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Logging - Non-blocking, rotating log pipeline
+Callers only enqueue records; a QueueListener thread formats them, writes them
+to a size- and time-rotated file and gzips old segments
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like '10MB' or '512KB' (plain numbers are bytes)"""
+    value = str(value).strip().upper()
+    for unit, factor in _SIZE_UNITS.items():
+        if value.endswith(unit):
+            return int(float(value[:-len(unit)]) * factor)
+    return int(value)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line, so the log viewer and analytics need no regexes"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotates on size or age, whichever comes first, and gzips old segments
+
+    Rotated files are named ``<log>.1.gz``, ``<log>.2.gz`` and so on. The
+    compression runs on the QueueListener thread, never on a logging caller.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 10 * 1024 ** 2, backup_count: int = 5,
+                 rotate_interval: Optional[float] = 86400.0, encoding: str = "utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.rotate_interval = rotate_interval
+        self.rollover_at = self._next_rollover()
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rotate_interval and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self) -> float:
+        return time.time() + self.rotate_interval if self.rotate_interval else float("inf")
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        if not os.path.exists(source):
+            return
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+def configure_logging(log_dir: str = "logs", filename: str = "omnitasker_ultimate.log",
+                      level: Optional[str] = None, json_lines: Optional[bool] = None,
+                      max_bytes: Optional[int] = None, backup_count: Optional[int] = None,
+                      rotate_interval: Optional[float] = 86400.0,
+                      console: bool = True) -> logging.handlers.QueueListener:
+    """Install the queue-based pipeline on the root logger
+
+    Unset arguments fall back to the LOG_LEVEL, LOG_JSON, LOG_MAX_SIZE and
+    LOG_BACKUP_COUNT environment variables (see .env.example). Calling it
+    again replaces the previous pipeline.
+    """
+    global _listener
+
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    if json_lines is None:
+        json_lines = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
+    if max_bytes is None:
+        max_bytes = parse_size(os.getenv("LOG_MAX_SIZE", "10MB"))
+    if backup_count is None:
+        backup_count = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = CompressingRotatingFileHandler(
+        os.path.join(log_dir, filename),
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+        rotate_interval=rotate_interval
+    )
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+    handlers = [file_handler]
+
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    # Unbounded so that logging never blocks the caller
+    record_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(record_queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(logging.handlers.QueueHandler(record_queue))
+        root.setLevel(level.upper())
+        listener.start()
+        _listener = listener
+
+    return listener
+
+
+def shutdown_logging():
+    """Drain the queue and close the file handlers"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
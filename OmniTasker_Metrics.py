@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Metrics - Write-behind recorder for the metrics table
+Samples go into an in-memory ring buffer and a background flusher writes them
+with executemany in one transaction every N ms or M rows
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+from OmniTasker_Database import OmniDatabase, MetricSample
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_MS = 500
+DEFAULT_BATCH_ROWS = 1000
+DEFAULT_CAPACITY = 100000
+
+
+def format_timestamp(epoch_seconds: float) -> str:
+    """UTC timestamp in the same layout SQLite's CURRENT_TIMESTAMP uses"""
+    moment = datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S.") + f"{moment.microsecond // 1000:03d}"
+
+
+class MetricsRecorder:
+    """Buffers metric samples and persists them off the hot path
+
+    ``record`` only appends to a bounded deque, so callers never wait on
+    disk. When the buffer is full the oldest samples are dropped (and
+    counted); so are the oldest of a failed flush kept for retry beyond
+    ``capacity``. A crash loses at most the samples buffered since the last
+    flush, i.e. one flush interval.
+    """
+
+    def __init__(self, database: OmniDatabase,
+                 flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+                 batch_rows: int = DEFAULT_BATCH_ROWS,
+                 capacity: int = DEFAULT_CAPACITY):
+        self.database = database
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_rows = batch_rows
+        self.capacity = capacity
+
+        self._buffer = deque(maxlen=capacity)
+        self._retry: List[MetricSample] = []
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "last_flush_seconds": 0.0,
+        }
+
+    def record(self, minion_id: str, metric_type: str, value: float, timestamp: Optional[float] = None):
+        """Queue one sample; never blocks on I/O"""
+        if len(self._buffer) >= self.capacity:
+            self._stats["dropped"] += 1
+        self._buffer.append((minion_id, metric_type, float(value), timestamp or time.time()))
+        if len(self._buffer) >= self.batch_rows:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the background flusher thread"""
+        self._thread = threading.Thread(target=self._flush_loop, name="omni-metrics-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the flusher and write whatever is still buffered"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered samples in one transaction; returns rows written"""
+        with self._flush_lock:
+            batch = self._retry
+            self._retry = []
+            for _ in range(len(self._buffer)):
+                minion_id, metric_type, value, timestamp = self._buffer.popleft()
+                batch.append(MetricSample(minion_id, metric_type, value, format_timestamp(timestamp)))
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                self.database.insert_metrics(batch)
+            except Exception as e:
+                # Keep the batch for the next flush rather than losing it, but no more
+                # than the buffer holds: the oldest samples go first, as in record()
+                overflow = len(batch) - self.capacity
+                if overflow > 0:
+                    self._stats["dropped"] += overflow
+                    batch = batch[overflow:]
+                self._retry = batch
+                self._stats["flush_errors"] += 1
+                logger.error(f"Metrics flush error ({len(batch)} samples pending): {e}")
+                return 0
+
+            self._stats["written"] += len(batch)
+            self._stats["flushes"] += 1
+            self._stats["last_flush_seconds"] = time.perf_counter() - started
+            return len(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["buffered"] = len(self._buffer) + len(self._retry)
+        return stats
+
+    def _flush_loop(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Pipeline - Projects as task DAGs
+Expands a project into design -> code -> test -> deploy tasks fanned out per
+component, stores the graph, and releases each task once its dependencies
+have completed so independent branches run in parallel
+"""
+
+import json
+import logging
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Any, Callable, Tuple
+
+from OmniTasker_Database import OmniDatabase
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One pipeline stage
+
+    ``variants`` fans the stage out further within each component (one task
+    per variant); ``per_component`` False makes it a single join task that
+    depends on every task of the ``after`` stages.
+    """
+    name: str
+    task_type: str
+    after: Tuple[str, ...] = ()
+    variants: Tuple[str, ...] = ("",)
+    per_component: bool = True
+    estimated_hours: float = 1.0
+    priority: int = 5
+
+
+PIPELINE_STAGES = (
+    StageSpec("design", "design", estimated_hours=2.0, priority=3),
+    StageSpec("code", "code_generation", after=("design",), estimated_hours=6.0, priority=4),
+    StageSpec("test", "testing", after=("code",), variants=("unit", "integration"), estimated_hours=3.0),
+    StageSpec("deploy", "deployment", after=("test",), per_component=False, estimated_hours=1.0, priority=2),
+)
+
+# Outcomes that let dependent tasks run; anything else skips them
+SUCCESS_OUTCOME = "completed"
+# Task states of a pipeline that has not finished the task yet
+UNFINISHED_STATUSES = ("blocked", "pending", "assigned", "running")
+
+
+def project_components(tech_stack: str) -> List[str]:
+    """Components a project fans out into: one per tech-stack entry"""
+    components = [part.strip() for part in re.split(r"[+,/&]", tech_stack or "") if part.strip()]
+    return components or ["core"]
+
+
+def plan_pipeline(project_id: str, project_name: str, components: Iterable[str],
+                  stages: Iterable[StageSpec] = PIPELINE_STAGES) -> List[Dict[str, Any]]:
+    """Expand a project into tasks with ``depends_on`` edges, in topological order
+
+    Per-component stages depend only on the same component's earlier stage,
+    so each component is an independent branch until a join stage.
+    """
+    components = list(components)
+    tasks: List[Dict[str, Any]] = []
+    by_stage: Dict[str, Dict[Optional[str], List[str]]] = {}
+
+    for stage in stages:
+        produced = by_stage[stage.name] = {}
+        for component in (components if stage.per_component else [None]):
+            if stage.per_component:
+                depends_on = [task_id for previous in stage.after
+                              for task_id in by_stage[previous].get(component, [])]
+            else:
+                depends_on = [task_id for previous in stage.after
+                              for task_ids in by_stage[previous].values() for task_id in task_ids]
+            for variant in stage.variants:
+                label = " ".join(part for part in (stage.name, component, variant) if part)
+                task = {
+                    "id": str(uuid.uuid4()),
+                    "type": stage.task_type,
+                    "project_id": project_id,
+                    "title": f"{project_name}: {label}",
+                    "description": f"{label} for {project_name}",
+                    "priority": stage.priority,
+                    "stage": stage.name,
+                    "component": component,
+                    "estimated_hours": stage.estimated_hours,
+                    "depends_on": depends_on,
+                }
+                tasks.append(task)
+                produced.setdefault(component, []).append(task["id"])
+    return tasks
+
+
+def critical_path(tasks: List[Dict[str, Any]], duration: Callable[[Dict[str, Any]], float]) -> Tuple[float, List[str]]:
+    """Longest dependency chain by ``duration``: (its length, task ids along it)
+
+    ``tasks`` must be in topological order (as plan_pipeline returns them).
+    """
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for task in tasks:
+        start, before = 0.0, None
+        for dependency in task.get("depends_on", ()):
+            if finish.get(dependency, 0.0) > start:
+                start, before = finish[dependency], dependency
+        finish[task["id"]] = start + (duration(task) or 0.0)
+        previous[task["id"]] = before
+
+    if not finish:
+        return 0.0, []
+    task_id = max(finish, key=finish.get)
+    length = finish[task_id]
+    path = []
+    while task_id is not None:
+        path.append(task_id)
+        task_id = previous[task_id]
+    return length, path[::-1]
+
+
+class PipelineExecutor:
+    """Topological executor for project pipelines
+
+    Keeps, per waiting task, the number of dependencies still outstanding
+    and, per task, who waits on it. A completed task decrements its
+    dependents and submits every one that reaches zero, so a task starts
+    the moment its last dependency finishes. A task that fails, times out
+    or is cancelled skips everything downstream of it.
+    """
+
+    def __init__(self, database: OmniDatabase,
+                 submit: Callable[[List[Dict[str, Any]]], Any],
+                 on_progress: Optional[Callable[[str, Dict[str, int]], None]] = None):
+        self.database = database
+        self.submit = submit
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._waiting: Dict[str, Dict[str, Any]] = {}
+        self._outstanding: Dict[str, int] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._project_counts: Dict[str, Dict[str, int]] = {}
+
+    def start_project(self, project_id: str, project_name: str, tech_stack: str = "") -> List[Dict[str, Any]]:
+        """Plan, persist and start a project's pipeline; returns its tasks"""
+        tasks = plan_pipeline(project_id, project_name, project_components(tech_stack))
+        self.database.create_pipeline(tasks)
+        self._load(project_id, tasks, set())
+        length, _ = critical_path(tasks, lambda task: task["estimated_hours"])
+        total = sum(task["estimated_hours"] for task in tasks)
+        logger.info(f"Pipeline for {project_name}: {len(tasks)} tasks, critical path {length:.1f}h of {total:.1f}h of work")
+        return tasks
+
+    def recover(self, project_ids: Iterable[str]) -> int:
+        """Rebuild the pipelines of ``project_ids`` (projects a previous run left unfinished)
+
+        Restores the progress counts of every pipeline, including those
+        with nothing left to release, and reports them once through
+        ``on_progress``. Returns the number of tasks released.
+        """
+        released = 0
+        for project_id in project_ids:
+            rows, edges = self.database.get_pipeline(project_id)
+            if not rows:
+                continue  # Created without a pipeline
+            tasks = {row["id"]: dict(json.loads(row["payload"]), depends_on=[]) for row in rows}
+            for task_id, dependency in edges:
+                if task_id in tasks:
+                    tasks[task_id]["depends_on"].append(dependency)
+            completed = {row["id"] for row in rows if row["status"] == SUCCESS_OUTCOME}
+            blocked = {row["id"] for row in rows if row["status"] == "blocked"}
+            skipped = sum(1 for row in rows if row["status"] == "skipped")
+            failed = {row["id"] for row in rows
+                      if row["id"] not in completed and row["status"] not in UNFINISHED_STATUSES + ("skipped",)}
+            released += self._load(project_id, [task for task in tasks.values() if task["id"] in blocked],
+                                   completed, failed, counts={"total": len(rows), "completed": len(completed),
+                                                              "failed": len(failed), "skipped": skipped})
+            if self.on_progress is not None:
+                with self._lock:
+                    counts = dict(self._project_counts[project_id])
+                self.on_progress(project_id, counts)
+        return released
+
+    def task_finished(self, task: Dict[str, Any], outcome: str):
+        """Engine callback for every finished task; ignores tasks outside pipelines"""
+        if "stage" not in task:
+            return
+        task_id = task["id"]
+        with self._lock:
+            dependents = self._dependents.pop(task_id, ())
+            counts = self._project_counts.get(task.get("project_id"))
+            ready, skipped = [], []
+            if outcome == SUCCESS_OUTCOME:
+                for dependent in dependents:
+                    if dependent not in self._outstanding:
+                        continue  # Already skipped because another dependency failed
+                    self._outstanding[dependent] -= 1
+                    if self._outstanding[dependent] == 0:
+                        ready.append(self._release_locked(dependent))
+            else:
+                skipped = self._skip_locked(dependents)
+            if counts is not None:
+                counts["completed" if outcome == SUCCESS_OUTCOME else "failed"] += 1
+                counts["skipped"] += len(skipped)
+                counts = dict(counts)
+
+        if skipped:
+            self.database.skip_tasks(skipped)
+            logger.warning(f"Task {task_id} {outcome}; skipped {len(skipped)} dependent tasks")
+        if ready:
+            self.submit(ready)
+        if counts is not None and self.on_progress is not None:
+            self.on_progress(task["project_id"], counts)
+
+    def report(self, project_id: str) -> Dict[str, Any]:
+        """Task counts plus planned and (once tasks ran) measured critical path"""
+        rows, edges = self.database.get_pipeline(project_id)
+        depends_on: Dict[str, List[str]] = {}
+        for task_id, dependency in edges:
+            depends_on.setdefault(task_id, []).append(dependency)
+        by_id = {row["id"]: dict(row, depends_on=depends_on.get(row["id"], [])) for row in rows}
+        tasks = self._topological(by_id)
+
+        by_status: Dict[str, int] = {}
+        for task in tasks:
+            by_status[task["status"]] = by_status.get(task["status"], 0) + 1
+
+        planned, path = critical_path(tasks, lambda task: task["estimated_hours"])
+        planned_work = sum(task["estimated_hours"] or 0.0 for task in tasks)
+        report = {
+            "project_id": project_id,
+            "tasks": len(tasks),
+            "by_status": by_status,
+            "critical_path": [by_id[task_id]["title"] for task_id in path],
+            "critical_path_hours": planned,
+            "total_work_hours": planned_work,
+            "max_parallel_speedup": planned_work / planned if planned else 1.0,
+        }
+
+        finished = [task for task in tasks if task["actual_hours"] is not None]
+        if finished:
+            measured, _ = critical_path(tasks, lambda task: (task["actual_hours"] or 0.0) * 3600.0)
+            starts = [task["updated_at"] - task["actual_hours"] * 3600.0 for task in finished]
+            report["measured"] = {
+                "critical_path_seconds": measured,
+                "work_seconds": sum(task["actual_hours"] * 3600.0 for task in finished),
+                "elapsed_seconds": max(task["updated_at"] for task in finished) - min(starts),
+            }
+        return report
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"waiting_tasks": len(self._waiting), "projects": len(self._project_counts)}
+
+    def _load(self, project_id: str, tasks: List[Dict[str, Any]], completed: set,
+              failed: Iterable[str] = (), counts: Optional[Dict[str, int]] = None) -> int:
+        """Index not-yet-released tasks; submit those with nothing outstanding"""
+        failed = set(failed)
+        with self._lock:
+            project_counts = self._project_counts[project_id] = dict(
+                counts or {"total": len(tasks), "completed": 0, "failed": 0, "skipped": 0}
+            )
+            for task in tasks:
+                self._waiting[task["id"]] = task
+                outstanding = 0
+                for dependency in task.get("depends_on", ()):
+                    if dependency not in completed:
+                        outstanding += 1
+                        self._dependents.setdefault(dependency, []).append(task["id"])
+                self._outstanding[task["id"]] = outstanding
+            # Tasks downstream of a failure from before a restart can never run
+            skipped = self._skip_locked([task_id for dependency in failed
+                                         for task_id in self._dependents.pop(dependency, [])])
+            project_counts["skipped"] += len(skipped)
+            ready = [self._release_locked(task["id"]) for task in tasks
+                     if task["id"] in self._outstanding and self._outstanding[task["id"]] == 0]
+        if skipped:
+            self.database.skip_tasks(skipped)
+        if ready:
+            self.submit(ready)
+        return len(ready)
+
+    def _release_locked(self, task_id: str) -> Dict[str, Any]:
+        del self._outstanding[task_id]
+        task = self._waiting.pop(task_id)
+        # Edges live in the database; the scheduler only needs the task itself
+        return {key: value for key, value in task.items() if key != "depends_on"}
+
+    def _skip_locked(self, task_ids: Iterable[str]) -> List[str]:
+        """Drop tasks and, transitively, their dependents; returns the ids dropped"""
+        skipped = []
+        stack = list(task_ids)
+        while stack:
+            task_id = stack.pop()
+            if task_id not in self._waiting:
+                continue
+            del self._waiting[task_id]
+            self._outstanding.pop(task_id, None)
+            skipped.append(task_id)
+            stack.extend(self._dependents.pop(task_id, []))
+        return skipped
+
+    @staticmethod
+    def _topological(by_id: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        remaining = {task_id: len(task["depends_on"]) for task_id, task in by_id.items()}
+        dependents: Dict[str, List[str]] = {}
+        for task_id, task in by_id.items():
+            for dependency in task["depends_on"]:
+                dependents.setdefault(dependency, []).append(task_id)
+        order = [task_id for task_id, count in remaining.items() if count == 0]
+        for task_id in order:
+            for dependent in dependents.get(task_id, ()):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+        return [by_id[task_id] for task_id in order]
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Processes - Multi-process backend for CPU-bound task handlers
+Dispatches tasks by type to a warm pool of worker processes, so code
+formatting, test runs and packaging scale past the GIL across all cores
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Task types sent to worker processes, mapped to "module:function" handlers
+PROCESS_TASK_HANDLERS = {
+    "code_generation": "OmniTasker_Handlers:handle_code_generation",
+    "testing": "OmniTasker_Handlers:handle_testing",
+    "deployment": "OmniTasker_Handlers:handle_deployment",
+}
+
+# How often one task is resubmitted after its worker process died
+DEFAULT_MAX_RETRIES = 2
+
+# Engine bookkeeping that a worker never needs; left out of the payload
+LOCAL_TASK_FIELDS = ("resume_status", "assigned_at", "enqueued_at", "outcome", "finished_at", "error")
+
+# Handlers resolved once per worker process by _worker_init
+_worker_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def _resolve(path: str) -> Callable:
+    module_name, _, function_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _worker_init(handler_paths: Dict[str, str], log_level: int):
+    """Warm start: import every handler module and run its warm_up() once"""
+    logging.basicConfig(level=log_level, format="%(asctime)s - %(levelname)s - [%(process)d] %(message)s")
+    warmed = set()
+    for task_type, path in handler_paths.items():
+        _worker_handlers[task_type] = _resolve(path)
+        module = importlib.import_module(path.partition(":")[0])
+        if module.__name__ not in warmed and hasattr(module, "warm_up"):
+            module.warm_up()
+            warmed.add(module.__name__)
+
+
+def _worker_run(task_type: str, payload: bytes) -> bytes:
+    result = _worker_handlers[task_type](pickle.loads(payload))
+    return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _worker_ping() -> int:
+    time.sleep(0.05)  # Keep each ping busy long enough that every worker gets spawned
+    return os.getpid()
+
+
+class ProcessTaskPool:
+    """Runs task handlers in a pool of long-lived worker processes
+
+    ``run`` blocks the calling thread (an execution engine worker, which
+    keeps doing timeout and cancellation bookkeeping) while a process does
+    the work. Tasks travel as a pickled dict without engine-only fields and
+    results come back pickled. If a worker dies, ProcessPoolExecutor marks
+    the whole pool broken; the first caller to notice swaps in a fresh pool
+    and every affected task is resubmitted, up to ``max_retries`` times.
+    """
+
+    def __init__(self, handlers: Optional[Dict[str, str]] = None,
+                 max_workers: Optional[int] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 start_method: str = "spawn"):
+        self.handlers = dict(handlers or PROCESS_TASK_HANDLERS)
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+        self.max_retries = max_retries
+        self._context = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._closed = False
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "retried": 0, "recycled": 0}
+
+    def handles(self, task_type: Optional[str]) -> bool:
+        return task_type in self.handlers
+
+    def start(self, warm: bool = True):
+        """Create the pool and, with ``warm``, spawn and initialize every worker now"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+            executor = self._executor
+        if warm:
+            started = time.perf_counter()
+            futures = [executor.submit(_worker_ping) for _ in range(self.max_workers)]
+            pids = {future.result() for future in futures}
+            logger.info(f"Process pool warmed {len(pids)} workers in {time.perf_counter() - started:.2f}s")
+
+    def run(self, task: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """Execute ``task`` in a worker process and return the handler's result"""
+        payload = pickle.dumps(
+            {key: value for key, value in task.items() if key not in LOCAL_TASK_FIELDS},
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        attempt = 0
+        while True:
+            executor, generation = self._current()
+            try:
+                future = executor.submit(_worker_run, task["type"], payload)
+                with self._lock:
+                    self._stats["submitted"] += 1
+                result = pickle.loads(future.result(timeout))
+            except BrokenProcessPool:
+                self._recycle(generation)
+                attempt += 1
+                if attempt > self.max_retries:
+                    with self._lock:
+                        self._stats["failed"] += 1
+                    raise
+                with self._lock:
+                    self._stats["retried"] += 1
+                logger.warning(f"Worker process died running task {task['id']}; retrying ({attempt}/{self.max_retries})")
+                continue
+            except Exception:
+                with self._lock:
+                    self._stats["failed"] += 1
+                raise
+            with self._lock:
+                self._stats["completed"] += 1
+            return result
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._closed = True
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        stats["task_types"] = sorted(self.handlers)
+        return stats
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_worker_init,
+            initargs=(self.handlers, logging.getLogger().getEffectiveLevel())
+        )
+
+    def _current(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Process pool is shut down")
+            if self._executor is None:
+                self._executor = self._new_executor()
+            return self._executor, self._generation
+
+    def _recycle(self, generation: int):
+        """Replace a broken pool once, however many callers saw it break"""
+        with self._lock:
+            if generation != self._generation or self._closed:
+                return
+            broken = self._executor
+            self._executor = self._new_executor()
+            self._generation += 1
+            self._stats["recycled"] += 1
+        logger.warning("Process pool broken by a crashed worker; started a fresh pool")
+        if broken is not None:
+            broken.shutdown(wait=False)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Prometheus - /metrics exporter for the orchestration engine
+Times the orchestration steps and task handlers, counts finished tasks per
+type and outcome, and reads queue depth and minion counts at scrape time
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from typing import Optional, Callable
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, make_wsgi_app
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Clear of the Prometheus server's own 9090 and node_exporter's 9100
+DEFAULT_METRICS_PORT = 9181
+
+# Orchestration steps timed per call (engine method names)
+TIMED_STEPS = ("assign_tasks_to_minions", "monitor_task_progress", "handle_completed_tasks", "process_task_queue")
+# Steps run in a tight loop take microseconds; the default buckets start at 5ms
+STEP_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Task events buffered for the counters; a burst beyond this is dropped (and counted by the bus)
+EVENT_BUFFER = 100000
+
+FINAL_TASK_STATUSES = frozenset(("completed", "failed", "timeout", "cancelled"))
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass  # One line per scrape would flood the log
+
+
+class EngineStateCollector:
+    """Gauges computed from the engine's own state when Prometheus scrapes
+
+    Nothing is updated on the hot path: queue depth and minion counts
+    are read once per scrape.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        engine = self.engine
+        scheduler = engine.scheduler.get_stats()
+        execution = engine.execution_engine.get_stats()
+
+        depth = GaugeMetricFamily("omnitasker_task_queue_depth",
+                                  "Tasks waiting, by stage of the dispatch path", labels=["stage"])
+        depth.add_metric(["scheduler"], scheduler["pending_tasks"])
+        depth.add_metric(["assigned"], scheduler["ready_assignments"] + engine.task_queue.qsize())
+        depth.add_metric(["executor"], execution["queue_depth"])
+        yield depth
+
+        yield GaugeMetricFamily("omnitasker_tasks_in_flight", "Tasks executing right now",
+                                value=execution["in_flight"])
+
+        minions = GaugeMetricFamily("omnitasker_minions", "OmniMinions by status", labels=["status"])
+        for status, count in engine.omni_minions.status_counts().items():
+            minions.add_metric([status], count)
+        yield minions
+
+        yield GaugeMetricFamily("omnitasker_active_projects", "Projects in the engine",
+                                value=len(engine.active_projects))
+
+
+class PrometheusExporter:
+    """Instruments an OmniTaskerEngine and serves its metrics on /metrics
+
+    Instrumentation replaces the timed engine methods on the instance
+    with wrappers, so an engine without an exporter runs the original
+    methods untouched: disabled metrics cost nothing. ``instrument`` must
+    run before the engine starts its loops (the async core registers the
+    methods it was given). Tasks run in the process pool bypass the
+    handlers, so the pool's ``run`` is timed under the same histogram;
+    the engine instruments a pool started after the exporter through
+    ``instrument_process_pool``. Finished-task counters follow the
+    engine's task events on a subscriber thread, off the dispatch path.
+    """
+
+    def __init__(self, engine, registry: Optional[CollectorRegistry] = None):
+        self.engine = engine
+        # A private registry, so several engines in one process do not collide
+        self.registry = registry or CollectorRegistry()
+        self.step_seconds = Histogram(
+            "omnitasker_orchestration_step_seconds", "Duration of one orchestration step",
+            ["step"], buckets=STEP_BUCKETS, registry=self.registry
+        )
+        self.handler_seconds = Histogram(
+            "omnitasker_task_handler_seconds", "Duration of a task handler call",
+            ["task_type"], registry=self.registry
+        )
+        self.tasks_submitted = Counter(
+            "omnitasker_tasks_submitted", "Tasks queued for dispatch", ["task_type"], registry=self.registry
+        )
+        self.tasks_finished = Counter(
+            "omnitasker_tasks_finished", "Tasks finished, by type and outcome",
+            ["task_type", "outcome"], registry=self.registry
+        )
+        self.registry.register(EngineStateCollector(engine))
+        self._server = None
+        self._subscription = None
+        self._instrumented = False
+
+    def instrument(self):
+        """Wrap the orchestration steps and task handlers of the engine"""
+        if self._instrumented:
+            return
+        self._instrumented = True
+        for step in TIMED_STEPS:
+            setattr(self.engine, step, self._timed(getattr(self.engine, step), self.step_seconds.labels(step)))
+        for task_type in ("design", "code_generation", "testing", "deployment"):
+            name = f"handle_{task_type}_task"
+            setattr(self.engine, name, self._timed(getattr(self.engine, name), self.handler_seconds.labels(task_type)))
+        if self.engine.process_pool is not None:
+            self.instrument_process_pool(self.engine.process_pool)
+
+    def instrument_process_pool(self, pool):
+        """Time ``pool.run`` (a ProcessTaskPool) per task type, like the in-process handlers"""
+        run = pool.run
+        handler_seconds = self.handler_seconds
+
+        @functools.wraps(run)
+        def timed_run(task, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return run(task, *args, **kwargs)
+            finally:
+                handler_seconds.labels(task.get("type") or "unknown").observe(time.perf_counter() - started)
+        pool.run = timed_run
+
+    def start(self, port: int = DEFAULT_METRICS_PORT, host: str = "localhost"):
+        """Instrument the engine and serve /metrics on a background thread"""
+        self.instrument()
+        self._subscription = self.engine.events.subscribe(("task",), capacity=EVENT_BUFFER)
+        threading.Thread(target=self._count_tasks, name="omni-metrics-events", daemon=True).start()
+
+        self._server = make_server(host, port, make_wsgi_app(self.registry), handler_class=_QuietHandler)
+        threading.Thread(target=self._server.serve_forever, name="omni-metrics-http", daemon=True).start()
+        logger.info(f"Prometheus metrics on http://{host}:{self._server.server_port}/metrics")
+
+    @property
+    def port(self) -> Optional[int]:
+        return self._server.server_port if self._server is not None else None
+
+    def stop(self):
+        if self._subscription is not None:
+            self._subscription.close()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @staticmethod
+    def _timed(func: Callable, histogram) -> Callable:
+        observe = histogram.observe
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - started)
+            return timed_async
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - started)
+        return timed
+
+    def _count_tasks(self):
+        subscription = self._subscription
+        while not subscription.closed:
+            for event in subscription.get(timeout=1.0):
+                task = event.payload
+                task_type = task.get("type") or "unknown"
+                if task["status"] == "pending":
+                    self.tasks_submitted.labels(task_type).inc()
+                elif task["status"] in FINAL_TASK_STATUSES:
+                    self.tasks_finished.labels(task_type, task["status"]).inc()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Registry - Column-oriented store for the OmniMinion fleet
+Statuses, roles and performance metrics live in NumPy arrays so fleet-wide
+counts and health scans are vectorized; callers get OmniMinion-like views
+"""
+
+import logging
+import threading
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per-minion performance metrics, one float64 column each
+METRIC_FIELDS = ("tasks_completed", "success_rate", "avg_completion_time", "efficiency_score", "tasks_failed")
+METRIC_DEFAULTS = (0, 100.0, 0.0, 100.0, 0)
+METRIC_INDEX = {name: column for column, name in enumerate(METRIC_FIELDS)}
+# Metrics handed back as int, like the counters of the original dict
+INTEGER_METRICS = frozenset(("tasks_completed", "tasks_failed"))
+
+INITIAL_CAPACITY = 64
+
+# Status code 0 marks a free slot
+FREE_SLOT = "<free>"
+
+
+@dataclass
+class OmniMinion:
+    """Represents a specialized OmniMinion agent"""
+    id: str
+    name: str
+    role: str
+    specialization: str
+    status: str = "idle"
+    current_task: Optional[str] = None
+    capabilities: List[str] = None
+    performance_metrics: Dict[str, float] = None
+
+    def __post_init__(self):
+        if self.capabilities is None:
+            self.capabilities = []
+        if self.performance_metrics is None:
+            self.performance_metrics = dict(zip(METRIC_FIELDS, METRIC_DEFAULTS))
+
+
+class Interner:
+    """Maps strings to small consecutive ints and back"""
+
+    def __init__(self, *names: str):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        code = self.ids.get(name)
+        if code is None:
+            code = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+class MinionMetricsView(MutableMapping):
+    """``performance_metrics`` of one minion, backed by a row of the metrics array"""
+
+    __slots__ = ("_registry", "_slot")
+
+    def __init__(self, registry: "MinionRegistry", slot: int):
+        self._registry = registry
+        self._slot = slot
+
+    def __getitem__(self, key: str):
+        value = self._registry._metrics[self._slot, METRIC_INDEX[key]]
+        return int(value) if key in INTEGER_METRICS else float(value)
+
+    def __setitem__(self, key: str, value: float):
+        if key not in METRIC_INDEX:
+            raise KeyError(f"Unknown minion metric: {key}")
+        with self._registry._lock:
+            self._registry._metrics[self._slot, METRIC_INDEX[key]] = value
+
+    def __delitem__(self, key: str):
+        raise TypeError("Minion metrics cannot be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(METRIC_FIELDS)
+
+    def __len__(self) -> int:
+        return len(METRIC_FIELDS)
+
+
+class MinionView:
+    """OmniMinion-compatible handle on one registry slot
+
+    Reads and writes go straight to the registry's columns. ``capabilities``
+    returns a fresh list, so mutating it does not change the minion.
+    """
+
+    __slots__ = ("_registry", "_slot", "id")
+
+    def __init__(self, registry: "MinionRegistry", slot: int, minion_id: str):
+        self._registry = registry
+        self._slot = slot
+        self.id = minion_id
+
+    @property
+    def name(self) -> str:
+        return self._registry._names[self._slot]
+
+    @property
+    def role(self) -> str:
+        return self._registry.roles.names[self._registry._role[self._slot]]
+
+    @property
+    def specialization(self) -> str:
+        return self._registry._specializations[self._slot]
+
+    @property
+    def status(self) -> str:
+        return self._registry.statuses.names[self._registry._status[self._slot]]
+
+    @status.setter
+    def status(self, status: str):
+        registry = self._registry
+        code = registry._status_code(status)
+        # Under the lock so a concurrent resize cannot drop the write
+        with registry._lock:
+            registry._status[self._slot] = code
+
+    @property
+    def current_task(self) -> Optional[str]:
+        return self._registry._current_task[self._slot]
+
+    @current_task.setter
+    def current_task(self, task: Optional[str]):
+        self._registry._current_task[self._slot] = task
+
+    @property
+    def capabilities(self) -> List[str]:
+        return list(self._registry._capability_names[self._registry._capabilities[self._slot]])
+
+    @property
+    def performance_metrics(self) -> MinionMetricsView:
+        return MinionMetricsView(self._registry, self._slot)
+
+    def snapshot(self) -> OmniMinion:
+        return OmniMinion(
+            id=self.id,
+            name=self.name,
+            role=self.role,
+            specialization=self.specialization,
+            status=self.status,
+            current_task=self.current_task,
+            capabilities=self.capabilities,
+            performance_metrics=dict(self.performance_metrics)
+        )
+
+    def __repr__(self) -> str:
+        return f"MinionView(id={self.id!r}, role={self.role!r}, status={self.status!r})"
+
+
+class MinionRegistry(MutableMapping):
+    """Fleet of minions stored column-wise, keyed by minion id
+
+    Behaves like the ``Dict[str, OmniMinion]`` it replaces: lookups return
+    MinionViews, assigning an OmniMinion adds or replaces one, and ``pop``
+    returns a detached OmniMinion. Status and role are small-int codes
+    into interned string tables and the metrics are one float64 matrix, so
+    a minion costs a few dozen bytes plus its strings, and aggregates like
+    ``count_status`` are single NumPy passes. Minions sharing a capability
+    set share one interned tuple of capability ids.
+
+    Iteration works on a snapshot of the ids, so it is safe while other
+    threads add or remove minions.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.statuses = Interner(FREE_SLOT, "idle", "active", "assigned", "working", "offline", "error")
+        self.roles = Interner()
+        self.capability_ids = Interner()
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # High-water mark of used slots
+
+        self._status = np.zeros(capacity, dtype=np.uint8)
+        self._role = np.zeros(capacity, dtype=np.uint16)
+        self._metrics = np.zeros((capacity, len(METRIC_FIELDS)), dtype=np.float64)
+        self._names: List[Optional[str]] = [None] * capacity
+        self._specializations: List[Optional[str]] = [None] * capacity
+        self._current_task: List[Optional[str]] = [None] * capacity
+        self._capabilities: List[Tuple[int, ...]] = [()] * capacity
+        # Each distinct capability-id tuple is stored once, with its names
+        self._capability_names: Dict[Tuple[int, ...], Tuple[str, ...]] = {(): ()}
+        self._capability_sets: Dict[Tuple[int, ...], Tuple[int, ...]] = {(): ()}
+
+    # -- mapping protocol --------------------------------------------------
+
+    def __getitem__(self, minion_id: str) -> MinionView:
+        return MinionView(self, self._slots[minion_id], minion_id)
+
+    def __setitem__(self, minion_id: str, minion: OmniMinion):
+        if minion.id != minion_id:
+            raise ValueError(f"Minion id {minion.id!r} stored under {minion_id!r}")
+        self.add(minion)
+
+    def __delitem__(self, minion_id: str):
+        with self._lock:
+            slot = self._slots.pop(minion_id)
+            self._status[slot] = 0
+            self._current_task[slot] = None
+            self._free.append(slot)
+
+    def __contains__(self, minion_id: object) -> bool:
+        return minion_id in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def pop(self, minion_id: str, *default) -> Any:
+        """Remove a minion and return it as a detached OmniMinion"""
+        try:
+            minion = self[minion_id].snapshot()
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[minion_id]
+        return minion
+
+    # -- population --------------------------------------------------------
+
+    def add(self, minion: OmniMinion) -> MinionView:
+        """Store ``minion`` (replacing any minion with the same id) and return its view"""
+        status = self._status_code(minion.status)
+        metrics = dict(zip(METRIC_FIELDS, METRIC_DEFAULTS))
+        metrics.update({key: value for key, value in (minion.performance_metrics or {}).items() if key in metrics})
+
+        with self._lock:
+            capabilities = tuple(self.capability_ids.intern(name) for name in (minion.capabilities or ()))
+            if capabilities not in self._capability_sets:
+                self._capability_sets[capabilities] = capabilities
+                self._capability_names[capabilities] = tuple(self.capability_ids.names[i] for i in capabilities)
+            slot = self._slots.get(minion.id)
+            if slot is None:
+                slot = self._allocate_locked()
+            self._status[slot] = status
+            self._role[slot] = self.roles.intern(minion.role)
+            self._metrics[slot] = [metrics[key] for key in METRIC_FIELDS]
+            self._names[slot] = minion.name
+            self._specializations[slot] = minion.specialization
+            self._current_task[slot] = minion.current_task
+            self._capabilities[slot] = self._capability_sets[capabilities]
+            self._slots[minion.id] = slot
+        return MinionView(self, slot, minion.id)
+
+    # -- vectorized aggregates ---------------------------------------------
+
+    def status_counts(self) -> Dict[str, int]:
+        """Minions per status"""
+        counts = np.bincount(self._status[:self._size], minlength=len(self.statuses.names))
+        return {name: int(count) for name, count in zip(self.statuses.names[1:], counts[1:]) if count}
+
+    def count_status(self, *statuses: str) -> int:
+        """Number of minions in any of ``statuses``"""
+        codes = [self.statuses.ids[status] for status in statuses if status in self.statuses.ids]
+        if not codes:
+            return 0
+        counts = np.bincount(self._status[:self._size], minlength=len(self.statuses.names))
+        return int(counts[codes].sum())
+
+    def role_counts(self) -> Dict[str, int]:
+        """Minions per role"""
+        used = self._status[:self._size] != 0
+        counts = np.bincount(self._role[:self._size][used], minlength=len(self.roles.names))
+        return {name: int(count) for name, count in zip(self.roles.names, counts) if count}
+
+    def metric_values(self, metric: str) -> np.ndarray:
+        """One metric for every stored minion (a copy)"""
+        used = self._status[:self._size] != 0
+        return self._metrics[:self._size, METRIC_INDEX[metric]][used]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Fleet-wide aggregates in one pass per column"""
+        used = self._status[:self._size] != 0
+        metrics = self._metrics[:self._size][used]
+        return {
+            "minions": len(self._slots),
+            "by_status": self.status_counts(),
+            "by_role": self.role_counts(),
+            "tasks_completed": int(metrics[:, METRIC_INDEX["tasks_completed"]].sum()),
+            "tasks_failed": int(metrics[:, METRIC_INDEX["tasks_failed"]].sum()),
+            "mean_success_rate": float(metrics[:, METRIC_INDEX["success_rate"]].mean()) if len(metrics) else 100.0,
+            "memory_bytes": self._status.nbytes + self._role.nbytes + self._metrics.nbytes,
+        }
+
+    # -- internals ---------------------------------------------------------
+
+    def _status_code(self, status: str) -> int:
+        code = self.statuses.ids.get(status)
+        if code is None:
+            with self._lock:
+                code = self.statuses.intern(status)
+        return code
+
+    def _allocate_locked(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == len(self._status):
+            self._grow_locked(2 * len(self._status))
+        self._size += 1
+        return self._size - 1
+
+    def _grow_locked(self, capacity: int):
+        extra = capacity - len(self._status)
+        self._status = np.concatenate([self._status, np.zeros(extra, dtype=np.uint8)])
+        self._role = np.concatenate([self._role, np.zeros(extra, dtype=np.uint16)])
+        self._metrics = np.concatenate([self._metrics, np.zeros((extra, len(METRIC_FIELDS)))])
+        self._names.extend([None] * extra)
+        self._specializations.extend([None] * extra)
+        self._current_task.extend([None] * extra)
+        self._capabilities.extend([()] * extra)
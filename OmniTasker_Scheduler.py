@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Scheduler - Priority-aware task dispatch for OmniMinions
+Keeps pending tasks in heaps ordered by the tasks.priority column and an
+inverted index from capability to idle minions, so matching is O(log n)
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower values are dispatched first; matches the tasks.priority column default
+DEFAULT_PRIORITY = 5
+
+# Capability a built-in task type needs when the task does not name one itself
+TASK_TYPE_CAPABILITIES = {
+    "design": "visual_design",
+    "code_generation": "code_generation",
+    "testing": "test_design",
+    "deployment": "infrastructure",
+}
+
+# Minion statuses that can accept new work
+AVAILABLE_STATUSES = ("idle", "active", "assigned")
+
+
+class TaskScheduler:
+    """Matches queued tasks to idle minions by capability and priority
+
+    Pending tasks live in one heap per required capability, keyed by
+    (priority, sequence) so equal priorities stay FIFO. Idle minions are
+    indexed by every capability they offer. The invariant is that no pending
+    task ever has an idle minion able to run it: a task is matched on submit
+    if a capable minion is idle, and a released minion immediately takes the
+    best task among the heaps of its own capabilities.
+    """
+
+    def __init__(self, minions: Optional[Dict[str, Any]] = None):
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._pending: Dict[str, List[Tuple[int, int, Dict[str, Any]]]] = {}
+        self._idle: Dict[str, Dict[str, None]] = {}
+        self._capabilities: Dict[str, Tuple[str, ...]] = {}
+        self._busy = set()
+        self._ready = deque()
+        self._signalled = False
+        self._listeners: List[Callable[[], None]] = []
+
+        for minion in (minions or {}).values():
+            self.add_minion(minion)
+
+    def add_minion(self, minion: Any):
+        """Index a minion's capabilities and make it available if it is idle"""
+        with self._condition:
+            self._capabilities[minion.id] = tuple(minion.capabilities or ())
+            if minion.status in AVAILABLE_STATUSES:
+                self._release_locked(minion.id)
+            else:
+                self._busy.add(minion.id)
+
+    def remove_minion(self, minion_id: str) -> bool:
+        """Forget an idle minion; False (and nothing removed) if it is busy or unknown"""
+        with self._condition:
+            if minion_id not in self._capabilities or minion_id in self._busy:
+                return False
+            for capability in self._capabilities.pop(minion_id):
+                idle = self._idle.get(capability)
+                if idle:
+                    idle.pop(minion_id, None)
+            return True
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call ``callback`` (outside the lock) whenever waiters are notified"""
+        self._listeners.append(callback)
+
+    def submit(self, task: Dict[str, Any]) -> str:
+        """Queue a task, matching it immediately if a capable minion is idle"""
+        with self._condition:
+            task_id = self._submit_locked(task)
+            self._condition.notify_all()
+        self._notify_listeners()
+        return task_id
+
+    def submit_many(self, tasks: Iterable[Dict[str, Any]]) -> List[str]:
+        """Queue a batch of tasks under one lock acquisition and one wakeup"""
+        with self._condition:
+            task_ids = [self._submit_locked(task) for task in tasks]
+            if task_ids:
+                self._condition.notify_all()
+        if task_ids:
+            self._notify_listeners()
+        return task_ids
+
+    def release_minion(self, minion_id: str):
+        """Return a minion to the pool, handing it the best pending task it can run"""
+        with self._condition:
+            if minion_id not in self._capabilities:
+                return
+            self._release_locked(minion_id)
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    def take_ready(self) -> List[Tuple[Dict[str, Any], str]]:
+        """Drain the (task, minion_id) pairs matched since the last call"""
+        with self._condition:
+            ready = list(self._ready)
+            self._ready.clear()
+        return ready
+
+    def wake(self):
+        """Wake any thread blocked in wait_for_work"""
+        with self._condition:
+            self._signalled = True
+            self._condition.notify_all()
+        self._notify_listeners()
+
+    def wait_for_work(self, timeout: Optional[float] = None) -> bool:
+        """Block until a task is matched, wake() is called, or timeout elapses"""
+        with self._condition:
+            if not self._ready and not self._signalled:
+                self._condition.wait(timeout)
+            self._signalled = False
+            return bool(self._ready)
+
+    def pending_count(self) -> int:
+        """Number of tasks waiting for a capable minion"""
+        with self._condition:
+            return sum(len(heap) for heap in self._pending.values())
+
+    def get_backlog(self) -> Dict[str, Tuple[int, float]]:
+        """Per capability: (queued tasks, enqueue time of the longest-waiting one)
+
+        Scans every heap, so it is meant for periodic checks, not hot paths.
+        """
+        with self._condition:
+            return {
+                capability: (len(heap), min(entry[2]["enqueued_at"] for entry in heap))
+                for capability, heap in self._pending.items() if heap
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and minion availability"""
+        with self._condition:
+            idle_minions = set()
+            for minion_ids in self._idle.values():
+                idle_minions.update(minion_ids)
+            return {
+                "pending_tasks": sum(len(heap) for heap in self._pending.values()),
+                "pending_by_capability": {
+                    capability: len(heap) for capability, heap in self._pending.items() if heap
+                },
+                "ready_assignments": len(self._ready),
+                "idle_minions": len(idle_minions),
+                "busy_minions": len(self._busy),
+            }
+
+    def _notify_listeners(self):
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Scheduler listener error: {e}")
+
+    def _submit_locked(self, task: Dict[str, Any]) -> str:
+        task.setdefault("id", str(uuid.uuid4()))
+        task.setdefault("priority", DEFAULT_PRIORITY)
+        task.setdefault("capability", TASK_TYPE_CAPABILITIES.get(task.get("type"), task.get("type")))
+        task.setdefault("enqueued_at", time.time())
+
+        capability = task["capability"]
+        idle = self._idle.get(capability)
+        if idle:
+            minion_id = next(iter(idle))
+            self._claim_locked(minion_id)
+            self._ready.append((task, minion_id))
+        else:
+            heapq.heappush(
+                self._pending.setdefault(capability, []),
+                (int(task["priority"]), next(self._sequence), task)
+            )
+        return task["id"]
+
+    def _release_locked(self, minion_id: str):
+        # Pick the best head among the heaps this minion can serve
+        best_heap = None
+        for capability in self._capabilities[minion_id]:
+            heap = self._pending.get(capability)
+            if heap and (best_heap is None or heap[0][:2] < best_heap[0][:2]):
+                best_heap = heap
+
+        if best_heap is not None:
+            _, _, task = heapq.heappop(best_heap)
+            self._busy.add(minion_id)
+            self._ready.append((task, minion_id))
+            return
+
+        self._busy.discard(minion_id)
+        for capability in self._capabilities[minion_id]:
+            self._idle.setdefault(capability, {})[minion_id] = None
+
+    def _claim_locked(self, minion_id: str):
+        for capability in self._capabilities[minion_id]:
+            idle = self._idle.get(capability)
+            if idle:
+                idle.pop(minion_id, None)
+        self._busy.add(minion_id)
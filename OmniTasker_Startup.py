@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Startup - Cold-start profiling
+Times the engine and GUI init phases and breaks down module import cost
+for the --profile-startup mode
+"""
+
+import functools
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Collects wall-clock durations of named startup phases
+
+    Recording is always on (two ``perf_counter`` calls per phase), so the
+    numbers are there whenever --profile-startup asks for a report.
+    """
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def timed(self, func: Callable) -> Callable:
+        """Decorator recording each call of ``func`` as a phase named after it"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(func.__qualname__, time.perf_counter() - started)
+        return wrapper
+
+    def measure_imports(self, module: str, top: int = 15) -> List[Tuple[str, float]]:
+        """Per-dependency import cost of ``module`` in a fresh interpreter
+
+        Runs ``python -X importtime`` so already-imported modules in this
+        process do not hide their cost. Returns ``(name, seconds)`` for the
+        module itself followed by its ``top`` most expensive direct imports.
+        """
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, timeout=120, env=env
+        )
+        total = None
+        direct = []
+        # Children are printed before their parent, so collect depth-1 lines
+        # until the next top-level line and keep them if it is ``module``
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|", 2)
+            if not cumulative.strip().isdigit():
+                continue
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            seconds = int(cumulative) / 1e6
+            if depth == 1:
+                direct.append((name.strip(), seconds))
+            elif depth == 0:
+                if name.strip() == module:
+                    total = (name.strip(), seconds)
+                    break
+                direct = []
+        if result.returncode != 0:
+            logger.warning(f"Import profiling of {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+        direct.sort(key=lambda item: item[1], reverse=True)
+        return ([total] if total else []) + direct[:top]
+
+    def report(self, module: Optional[str] = None) -> Dict[str, Any]:
+        report = {
+            "since_profiler_created": time.perf_counter() - self.created,
+            "since_process_start": None,
+            "phases": [{"phase": name, "seconds": seconds} for name, seconds in self.phases],
+        }
+        try:
+            import psutil
+            report["since_process_start"] = time.time() - psutil.Process().create_time()
+        except Exception:
+            pass  # Interpreter start-up is not visible without psutil
+        if module:
+            report["imports"] = [{"module": name, "seconds": seconds}
+                                 for name, seconds in self.measure_imports(module)]
+        return report
+
+    def format_report(self, module: Optional[str] = None) -> str:
+        report = self.report(module)
+        lines = ["=== STARTUP PROFILE ===", "", "Init phases:"]
+        for entry in report["phases"]:
+            lines.append(f"  {entry['phase']:<48} {entry['seconds'] * 1000:9.1f} ms")
+        if "imports" in report:
+            lines += ["", "Imports (fresh interpreter, cumulative):"]
+            for entry in report["imports"]:
+                lines.append(f"  {entry['module']:<48} {entry['seconds'] * 1000:9.1f} ms")
+        lines += ["", f"Ready after {report['since_profiler_created'] * 1000:.1f} ms since profiling began"]
+        if report["since_process_start"] is not None:
+            lines.append(f"Ready after {report['since_process_start'] * 1000:.1f} ms since process start")
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
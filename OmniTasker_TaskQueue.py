@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Task Queue - Durable task queue on the tasks table
+Enqueues are group-committed by a writer thread; dispatch leases a task with
+a visibility timeout, and unfinished tasks are replayed after a restart
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+
+from OmniTasker_Database import OmniDatabase
+
+logger = logging.getLogger(__name__)
+
+# A leased task not finished within its timeout plus this margin is re-delivered
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+LEASE_MARGIN_SECONDS = 30.0
+# Deliveries before a task that keeps getting lost is failed
+DEFAULT_MAX_ATTEMPTS = 3
+# Consecutive failed group commits after which queued lease/finish updates are dropped
+MAX_COMMIT_RETRIES = 5
+COMMIT_RETRY_DELAY = 0.1
+
+
+class _Commit:
+    """Completion handle for one group commit"""
+
+    __slots__ = ("done", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class DurableTaskQueue:
+    """Persists task state transitions in the tasks table
+
+    Callers never open transactions themselves: every operation is queued
+    for a single writer thread, which applies whatever has accumulated in
+    one transaction. ``enqueue`` blocks until its commit (so an accepted
+    task survives a crash) but shares it with every concurrent enqueue and
+    lease/finish update, which keeps per-task latency well under a
+    millisecond at high rates. Lease and finish updates do not wait; when a
+    commit fails they are retried with the next one (enqueues fail back to
+    their caller instead), up to ``MAX_COMMIT_RETRIES`` failures in a row.
+
+    The in-memory scheduler still does the matching; this class is the
+    record that lets ``replay`` rebuild it after a restart.
+    """
+
+    def __init__(self, database: OmniDatabase,
+                 visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.database = database
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._operations: List[Tuple[str, tuple]] = []
+        self._commit = _Commit()
+        self._committing: Optional[_Commit] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._stats = {"enqueued": 0, "commits": 0, "operations": 0, "commit_errors": 0,
+                       "operations_lost": 0, "last_commit_seconds": 0.0, "replayed": 0, "redelivered": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._writer_loop, name="omni-task-queue-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Commit everything queued so far and stop the writer"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is committed; False on timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                commit = self._commit if self._operations else self._committing
+            if commit is None or commit.done.is_set():
+                return True
+            # Loops when a failed commit put its updates back for the next one
+            if not commit.done.wait(max(0.0, deadline - time.monotonic())):
+                return False
+
+    def enqueue(self, tasks: Iterable[Dict[str, Any]], wait: bool = True):
+        """Append tasks (which must have ids); with ``wait``, return once they are committed"""
+        now = time.time()
+        operations = [
+            ("enqueue", (
+                task["id"], task.get("project_id"),
+                task.get("title") or task.get("description") or task.get("type") or task["id"],
+                task.get("description", ""), task.get("priority"), task.get("type"),
+                json.dumps(task, default=str), now
+            ))
+            for task in tasks
+        ]
+        commit = self._submit(operations)
+        if wait:
+            commit.done.wait()
+            if commit.error is not None:
+                raise commit.error
+
+    def lease(self, task: Dict[str, Any], minion_id: str):
+        """Record a dispatch; the task becomes deliverable again if its lease runs out"""
+        now = time.time()
+        expires = now + float(task.get("timeout") or self.visibility_timeout) + LEASE_MARGIN_SECONDS
+        self._submit([("lease", (minion_id, expires, now, task["id"]))])
+
+    def finish(self, task: Dict[str, Any], outcome: str):
+        now = time.time()
+        hours = (now - task["assigned_at"]) / 3600.0 if task.get("assigned_at") else None
+        self._submit([("finish", (outcome, hours, now, task["id"]))])
+
+    def release(self, task_ids: Iterable[str]):
+        """Hand leased tasks back to the queue (e.g. unfinished at shutdown)"""
+        now = time.time()
+        self._submit([("release", (now, task_id)) for task_id in task_ids])
+
+    def replay(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Tasks to re-submit after a restart: every queued task and every leased one
+
+        Also returns, separately, the leased tasks out of attempts, which the
+        caller must finish as failed. Call it before anything is dispatched:
+        nothing can be running in a process that has just started, so a lease
+        still in the table belonged to the previous run and is not waited out.
+        """
+        tasks, exhausted = self._redeliver(self.database.replayable_tasks())
+        self._stats["replayed"] += len(tasks)
+        if tasks:
+            logger.info(f"Replaying {len(tasks)} unfinished tasks from the durable queue")
+        return tasks, exhausted
+
+    def expired(self, exclude: Iterable[str] = ()) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Leased tasks whose visibility timeout passed, other than ``exclude`` (still running here)
+
+        Returns the tasks to re-deliver and those out of attempts, as ``replay`` does.
+        """
+        exclude = set(exclude)
+        rows = [row for row in self.database.expired_task_leases(time.time()) if row["id"] not in exclude]
+        tasks, exhausted = self._redeliver(rows)
+        self._stats["redelivered"] += len(tasks)
+        if tasks:
+            logger.warning(f"Re-delivering {len(tasks)} tasks with expired leases")
+        return tasks, exhausted
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        with self._condition:
+            stats["queued_operations"] = len(self._operations)
+        return stats
+
+    def _redeliver(self, rows) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split rows into tasks to queue again and tasks out of attempts
+
+        Exhausted tasks are left as they are: the caller finishes them, so the
+        failure reaches its pipeline and listeners as well as this table.
+        """
+        tasks, released, exhausted = [], [], []
+        for row in rows:
+            task = json.loads(row["payload"])
+            task.setdefault("id", row["id"])
+            if row["attempts"] >= self.max_attempts:
+                logger.error(f"Task {task['id']} failed: lease expired {self.max_attempts} times")
+                exhausted.append(task)
+                continue
+            if row["status"] == "assigned":
+                released.append(row["id"])
+            tasks.append(task)
+
+        if released:
+            self.release(released)
+        return tasks, exhausted
+
+    def _submit(self, operations: List[Tuple[str, tuple]]) -> _Commit:
+        if not operations:
+            # Nothing for the writer to do, so no commit would ever complete this one
+            commit = _Commit()
+            commit.done.set()
+            return commit
+        with self._condition:
+            if self._thread is not None and not self._stopping:
+                self._operations.extend(operations)
+                self._condition.notify()
+                return self._commit
+        # No writer (not started yet, or shut down): commit inline
+        commit = _Commit()
+        self.database.apply_task_operations(operations)
+        commit.done.set()
+        return commit
+
+    def _writer_loop(self):
+        while True:
+            with self._condition:
+                while not self._operations and not self._stopping:
+                    self._condition.wait()
+                if not self._operations:
+                    return
+                # Everything queued while the previous commit ran goes in this one
+                operations, self._operations = self._operations, []
+                commit, self._commit = self._commit, _Commit()
+                self._committing = commit
+
+            started = time.perf_counter()
+            try:
+                self.database.apply_task_operations(operations)
+            except Exception as e:
+                commit.error = e
+                self._stats["commit_errors"] += 1
+                self._failures += 1
+                self._retry([operation for operation in operations if operation[0] != "enqueue"], e)
+            else:
+                self._failures = 0
+                self._stats["commits"] += 1
+                self._stats["operations"] += len(operations)
+                self._stats["enqueued"] += sum(1 for name, _ in operations if name == "enqueue")
+                self._stats["last_commit_seconds"] = time.perf_counter() - started
+            commit.done.set()
+
+    def _retry(self, operations: List[Tuple[str, tuple]], error: BaseException):
+        """Queue the updates of a failed commit ahead of newer ones, or drop them after repeated failures"""
+        if self._failures > MAX_COMMIT_RETRIES:
+            self._stats["operations_lost"] += len(operations)
+            logger.error(f"Task queue commit error ({len(operations)} updates lost after "
+                         f"{MAX_COMMIT_RETRIES} retries): {error}")
+            self._failures = 0
+            return
+        logger.warning(f"Task queue commit error (retry {self._failures} of {MAX_COMMIT_RETRIES}): {error}")
+        # Enqueues already failed back to their callers; back off before the retry
+        time.sleep(COMMIT_RETRY_DELAY * self._failures)
+        with self._condition:
+            self._operations[:0] = operations
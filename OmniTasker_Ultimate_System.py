@@ -5,266 +5,69 @@ Implements the full OmniTasker prompt with 25 specialized OmniMinions
 Autonomous project management from ideation to deployment
 """
 
+from OmniTasker_Startup import startup_profiler
+
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext
-import threading
-import subprocess
-import json
+from tkinter import ttk, messagebox, scrolledtext
 import logging
-import time
 import os
-import sys
-from pathlib import Path
+import threading
 from datetime import datetime
-import queue
-import uuid
-import requests
-import yaml
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
-import sqlite3
-import hashlib
-import shutil
+from typing import Optional
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/omnitasker_ultimate.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+# Rarely used modules (file dialogs here, asyncio and the async core in the
+# engine) are imported where they are first needed to keep cold start short
+from OmniTasker_Engine import OmniTaskerEngine, build_arg_parser, run_headless
+from OmniTasker_Widgets import KeyedTreeRenderer, UIUpdateBus
+from OmniTasker_LogViewer import LogViewer
+from OmniTasker_Logging import configure_logging
 
-@dataclass
-class OmniMinion:
-    """Represents a specialized OmniMinion agent"""
-    id: str
-    name: str
-    role: str
-    specialization: str
-    status: str = "idle"
-    current_task: Optional[str] = None
-    capabilities: List[str] = None
-    performance_metrics: Dict[str, float] = None
-    
-    def __post_init__(self):
-        if self.capabilities is None:
-            self.capabilities = []
-        if self.performance_metrics is None:
-            self.performance_metrics = {
-                "tasks_completed": 0,
-                "success_rate": 100.0,
-                "avg_completion_time": 0.0,
-                "efficiency_score": 100.0
-            }
+# Logging handlers are installed by configure_logging() in main()
+logger = logging.getLogger(__name__)
 
 class OmniTaskerUltimateSystem:
     """Main OmniTasker system orchestrating 25 specialized agents"""
     
-    def __init__(self):
+    def __init__(self, engine: Optional[OmniTaskerEngine] = None):
         self.root = tk.Tk()
         self.root.title("OmniTasker Ultimate System - AI Agent Orchestrator")
         self.root.geometry("1400x900")
         self.root.configure(bg='#1e1e1e')
         
-        # Initialize system components
-        self.omni_minions = self._initialize_omni_minions()
-        self.task_queue = queue.Queue()
-        self.project_database = self._initialize_database()
-        self.active_projects = {}
-        self.system_metrics = {
-            "total_projects": 0,
-            "completed_projects": 0,
-            "active_agents": 25,
-            "system_uptime": datetime.now(),
-            "success_rate": 100.0
-        }
+        # Background threads post widget updates here instead of touching Tk
+        self.ui_bus = UIUpdateBus(self.root)
+        self.ui_bus.start()
+        
+        # The headless engine owns minions, scheduling, storage and monitoring;
+        # this window is one client of it
+        self.engine = engine or OmniTaskerEngine()
+        self.omni_minions = self.engine.omni_minions
+        self.active_projects = self.engine.active_projects
+        self.system_metrics = self.engine.system_metrics
+        self.project_database = self.engine.project_database
         
         # GUI Components
         self.setup_gui()
-        self.setup_monitoring()
         
         # Start background processes
-        self.start_agent_orchestration()
-        
-        logger.info("OmniTasker Ultimate System initialized with 25 OmniMinions")
-    
-    def _initialize_omni_minions(self) -> Dict[str, OmniMinion]:
-        """Initialize 25 specialized OmniMinion agents"""
-        minions = {}
-        
-        # 5 Coders
-        for i in range(1, 6):
-            minions[f"coder_{i}"] = OmniMinion(
-                id=f"coder_{i}",
-                name=f"CodeMaster-{i}",
-                role="Developer",
-                specialization=["Python", "JavaScript", "Java", "C++", "Go"][i-1],
-                capabilities=[
-                    "code_generation", "debugging", "optimization", 
-                    "testing", "documentation", "refactoring"
-                ]
-            )
-        
-        # 4 Testers
-        test_types = ["Unit Testing", "Integration Testing", "Load Testing", "Security Testing"]
-        for i, test_type in enumerate(test_types, 1):
-            minions[f"tester_{i}"] = OmniMinion(
-                id=f"tester_{i}",
-                name=f"TestGuardian-{i}",
-                role="Quality Assurance",
-                specialization=test_type,
-                capabilities=[
-                    "test_design", "automation", "performance_analysis",
-                    "security_scanning", "regression_testing"
-                ]
-            )
-        
-        # 3 Designers
-        design_types = ["UI/UX Design", "Wireframing", "Prototyping"]
-        for i, design_type in enumerate(design_types, 1):
-            minions[f"designer_{i}"] = OmniMinion(
-                id=f"designer_{i}",
-                name=f"DesignMaestro-{i}",
-                role="Designer",
-                specialization=design_type,
-                capabilities=[
-                    "visual_design", "user_experience", "accessibility",
-                    "responsive_design", "brand_consistency"
-                ]
-            )
-        
-        # 3 DevOps Engineers
-        devops_types = ["CI/CD", "Deployment", "Monitoring"]
-        for i, devops_type in enumerate(devops_types, 1):
-            minions[f"devops_{i}"] = OmniMinion(
-                id=f"devops_{i}",
-                name=f"DeployMaster-{i}",
-                role="DevOps Engineer",
-                specialization=devops_type,
-                capabilities=[
-                    "infrastructure", "automation", "scaling",
-                    "security", "monitoring", "optimization"
-                ]
-            )
-        
-        # 3 Client Liaisons
-        liaison_types = ["Communication", "Documentation", "Reporting"]
-        for i, liaison_type in enumerate(liaison_types, 1):
-            minions[f"liaison_{i}"] = OmniMinion(
-                id=f"liaison_{i}",
-                name=f"ClientBridge-{i}",
-                role="Client Relations",
-                specialization=liaison_type,
-                capabilities=[
-                    "client_communication", "requirement_analysis",
-                    "project_reporting", "stakeholder_management"
-                ]
-            )
-        
-        # 2 Researchers
-        research_types = ["Market Analysis", "Technology Trends"]
-        for i, research_type in enumerate(research_types, 1):
-            minions[f"researcher_{i}"] = OmniMinion(
-                id=f"researcher_{i}",
-                name=f"InsightSeeker-{i}",
-                role="Researcher",
-                specialization=research_type,
-                capabilities=[
-                    "market_research", "trend_analysis", "competitive_analysis",
-                    "technology_evaluation", "feasibility_assessment"
-                ]
-            )
-        
-        # 2 Integrators
-        integration_types = ["API Integration", "Third-party Services"]
-        for i, integration_type in enumerate(integration_types, 1):
-            minions[f"integrator_{i}"] = OmniMinion(
-                id=f"integrator_{i}",
-                name=f"ConnectMaster-{i}",
-                role="Integration Specialist",
-                specialization=integration_type,
-                capabilities=[
-                    "api_integration", "service_connection", "data_mapping",
-                    "authentication", "error_handling"
-                ]
-            )
-        
-        # 3 Maintainers
-        maintenance_types = ["Updates", "Optimization", "Support"]
-        for i, maintenance_type in enumerate(maintenance_types, 1):
-            minions[f"maintainer_{i}"] = OmniMinion(
-                id=f"maintainer_{i}",
-                name=f"SystemKeeper-{i}",
-                role="Maintenance Specialist",
-                specialization=maintenance_type,
-                capabilities=[
-                    "system_maintenance", "performance_optimization",
-                    "bug_fixing", "user_support", "documentation_updates"
-                ]
-            )
-        
-        return minions
-    
-    def _initialize_database(self) -> str:
-        """Initialize SQLite database for project management"""
-        db_path = "data/omnitasker_ultimate.db"
-        os.makedirs("data", exist_ok=True)
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Create projects table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'planning',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                assigned_minions TEXT,
-                progress REAL DEFAULT 0.0,
-                metadata TEXT
-            )
-        """)
-        
-        # Create tasks table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id TEXT PRIMARY KEY,
-                project_id TEXT,
-                minion_id TEXT,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'pending',
-                priority INTEGER DEFAULT 5,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed_at TIMESTAMP,
-                estimated_hours REAL,
-                actual_hours REAL,
-                FOREIGN KEY (project_id) REFERENCES projects (id)
-            )
-        """)
-        
-        # Create metrics table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                minion_id TEXT,
-                metric_type TEXT,
-                value REAL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-        
-        return db_path
-    
+        self.engine.add_listener(self._on_engine_event)
+        self.engine.start()
+        
+        logger.info(f"OmniTasker Ultimate System initialized with {len(self.omni_minions)} OmniMinions")
+    
+    def _on_engine_event(self, event: str):
+        """Route engine notifications (any thread) to the matching widget refresh"""
+        if event == "minions":
+            # Agent counts change with minion status; refresh them live, not every 30 s
+            self.ui_bus.post("minions_tree", self.update_minions_display)
+            self.ui_bus.post("metric_labels", self.update_system_metrics)
+        elif event == "projects":
+            self.ui_bus.post("project_tree", self.update_project_display)
+            self.ui_bus.post("metric_labels", self.update_system_metrics)
+        elif event == "metrics":
+            self.ui_bus.post("metric_labels", self.update_system_metrics)
+    
+    @startup_profiler.timed
     def setup_gui(self):
         """Setup the main GUI interface"""
         # Create main notebook for tabs
@@ -380,6 +183,7 @@ class OmniTaskerUltimateSystem:
             self.project_tree.column(col, width=150)
         
         self.project_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.project_tree_renderer = KeyedTreeRenderer(self.project_tree)
         
         # Project actions
         actions_frame = ttk.Frame(list_frame)
@@ -402,18 +206,15 @@ class OmniTaskerUltimateSystem:
         roles_frame = ttk.Frame(overview_frame)
         roles_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        role_counts = {
-            "Developers": 5, "Testers": 4, "Designers": 3,
-            "DevOps": 3, "Client Relations": 3, "Researchers": 2,
-            "Integrators": 2, "Maintainers": 3
-        }
-        
-        for i, (role, count) in enumerate(role_counts.items()):
+        # Roles come from the fleet config; counts follow the autoscaler
+        self.role_count_labels = {}
+        for i, (role, count) in enumerate(self.omni_minions.role_counts().items()):
             role_frame = ttk.Frame(roles_frame)
             role_frame.grid(row=i//4, column=i%4, padx=10, pady=5, sticky="ew")
             
             ttk.Label(role_frame, text=role, font=('Arial', 10, 'bold')).pack()
-            ttk.Label(role_frame, text=f"{count} agents", font=('Arial', 12)).pack()
+            self.role_count_labels[role] = ttk.Label(role_frame, text=f"{count} agents", font=('Arial', 12))
+            self.role_count_labels[role].pack()
         
         # Minions list
         list_frame = ttk.LabelFrame(minions_frame, text="Agent Status")
@@ -428,6 +229,7 @@ class OmniTaskerUltimateSystem:
             self.minions_tree.column(col, width=120)
         
         self.minions_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.minions_tree_renderer = KeyedTreeRenderer(self.minions_tree)
         
         # Populate minions tree
         self.update_minions_display()
@@ -457,8 +259,10 @@ class OmniTaskerUltimateSystem:
         logs_frame = ttk.LabelFrame(monitoring_frame, text="System Logs")
         logs_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        self.logs_text = scrolledtext.ScrolledText(logs_frame, height=15)
-        self.logs_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Renders only the visible lines and tails the file incrementally
+        self.log_viewer = LogViewer(logs_frame, "logs/omnitasker_ultimate.log")
+        self.log_viewer.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.log_viewer.start_following()
         
         # Log controls
         log_controls = ttk.Frame(logs_frame)
@@ -501,50 +305,6 @@ class OmniTaskerUltimateSystem:
         # Save settings button
         ttk.Button(settings_frame, text="💾 Save Settings", command=self.save_settings).pack(pady=20)
     
-    def setup_monitoring(self):
-        """Setup background monitoring"""
-        def monitor_system():
-            while True:
-                try:
-                    # Update system metrics
-                    self.update_system_metrics()
-                    
-                    # Check agent health
-                    self.check_agent_health()
-                    
-                    # Process task queue
-                    self.process_task_queue()
-                    
-                    time.sleep(30)  # Update every 30 seconds
-                except Exception as e:
-                    logger.error(f"Monitoring error: {e}")
-                    time.sleep(60)
-        
-        monitor_thread = threading.Thread(target=monitor_system, daemon=True)
-        monitor_thread.start()
-    
-    def start_agent_orchestration(self):
-        """Start the agent orchestration system"""
-        def orchestrate():
-            while True:
-                try:
-                    # Assign tasks to available minions
-                    self.assign_tasks_to_minions()
-                    
-                    # Monitor task progress
-                    self.monitor_task_progress()
-                    
-                    # Handle completed tasks
-                    self.handle_completed_tasks()
-                    
-                    time.sleep(10)  # Check every 10 seconds
-                except Exception as e:
-                    logger.error(f"Orchestration error: {e}")
-                    time.sleep(30)
-        
-        orchestration_thread = threading.Thread(target=orchestrate, daemon=True)
-        orchestration_thread.start()
-    
     def create_new_project(self):
         """Create a new project with AI assistance"""
         dialog = ProjectCreationDialog(self.root, self)
@@ -560,89 +320,20 @@ class OmniTaskerUltimateSystem:
             messagebox.showerror("Error", "Project name is required")
             return
         
-        project_id = str(uuid.uuid4())
-        
-        # Save to database
-        conn = sqlite3.connect(self.project_database)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO projects (id, name, description, status, assigned_minions, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            project_id, name, description, "planning",
-            json.dumps([]), json.dumps({"tech_stack": tech_stack})
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        # Add to active projects
-        self.active_projects[project_id] = {
-            "name": name,
-            "description": description,
-            "status": "planning",
-            "tech_stack": tech_stack,
-            "assigned_minions": [],
-            "progress": 0.0
-        }
-        
-        # Update display
-        self.update_project_display()
+        # Persists the project, auto-assigns minions and refreshes the trees
+        self.engine.create_project(name, description, tech_stack)
         
         # Clear form
         self.project_name_var.set("")
         self.project_desc_text.delete("1.0", tk.END)
         
-        # Auto-assign minions
-        self.auto_assign_minions(project_id)
-        
         messagebox.showinfo("Success", f"Project '{name}' created successfully!")
-        logger.info(f"Created new project: {name} (ID: {project_id})")
-    
-    def auto_assign_minions(self, project_id: str):
-        """Automatically assign appropriate minions to a project"""
-        project = self.active_projects.get(project_id)
-        if not project:
-            return
-        
-        # Assign based on project requirements
-        assigned_minions = []
-        
-        # Always assign core team
-        core_roles = ['coder_1', 'tester_1', 'designer_1', 'devops_1', 'liaison_1']
-        assigned_minions.extend(core_roles)
-        
-        # Assign based on tech stack
-        tech_stack = project.get('tech_stack', '')
-        if 'React' in tech_stack or 'JavaScript' in tech_stack:
-            assigned_minions.append('coder_2')  # JavaScript specialist
-        if 'Python' in tech_stack or 'Django' in tech_stack or 'Flask' in tech_stack:
-            assigned_minions.append('coder_1')  # Python specialist
-        
-        # Update project
-        project['assigned_minions'] = assigned_minions
-        
-        # Update minion status
-        for minion_id in assigned_minions:
-            if minion_id in self.omni_minions:
-                self.omni_minions[minion_id].status = "assigned"
-                self.omni_minions[minion_id].current_task = f"Working on {project['name']}"
-        
-        logger.info(f"Auto-assigned {len(assigned_minions)} minions to project {project_id}")
     
     def deploy_all_minions(self):
-        """Deploy all 25 OmniMinions"""
+        """Deploy every OmniMinion in the fleet"""
         try:
-            deployed_count = 0
-            for minion_id, minion in self.omni_minions.items():
-                if minion.status == "idle":
-                    minion.status = "active"
-                    deployed_count += 1
-            
-            self.update_minions_display()
+            deployed_count = self.engine.deploy_all_minions()
             messagebox.showinfo("Success", f"Deployed {deployed_count} OmniMinions successfully!")
-            logger.info(f"Deployed {deployed_count} OmniMinions")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to deploy minions: {e}")
@@ -651,31 +342,8 @@ class OmniTaskerUltimateSystem:
     def generate_comprehensive_report(self):
         """Generate a comprehensive system report"""
         try:
-            report_data = {
-                "timestamp": datetime.now().isoformat(),
-                "system_metrics": self.system_metrics,
-                "active_projects": len(self.active_projects),
-                "minion_status": {}
-            }
-            
-            # Collect minion data
-            for minion_id, minion in self.omni_minions.items():
-                report_data["minion_status"][minion_id] = {
-                    "name": minion.name,
-                    "role": minion.role,
-                    "status": minion.status,
-                    "performance": minion.performance_metrics
-                }
-            
-            # Generate report file
-            report_path = f"reports/system_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            os.makedirs("reports", exist_ok=True)
-            
-            with open(report_path, 'w') as f:
-                json.dump(report_data, f, indent=2)
-            
+            report_path = self.engine.generate_report()
             messagebox.showinfo("Success", f"Report generated: {report_path}")
-            logger.info(f"Generated comprehensive report: {report_path}")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate report: {e}")
@@ -684,12 +352,7 @@ class OmniTaskerUltimateSystem:
     def run_system_health_check(self):
         """Run comprehensive system health check"""
         try:
-            health_status = {
-                "database": self.check_database_health(),
-                "minions": self.check_minions_health(),
-                "resources": self.check_system_resources(),
-                "logs": self.check_log_health()
-            }
+            health_status = self.engine.run_health_checks()
             
             # Display results
             result_window = tk.Toplevel(self.root)
@@ -707,90 +370,49 @@ class OmniTaskerUltimateSystem:
             
             text_widget.insert(tk.END, f"\nCheck completed at: {datetime.now()}\n")
             
-            logger.info("System health check completed")
-            
         except Exception as e:
             messagebox.showerror("Error", f"Health check failed: {e}")
             logger.error(f"Health check error: {e}")
     
-    def check_database_health(self) -> bool:
-        """Check database connectivity and integrity"""
-        try:
-            conn = sqlite3.connect(self.project_database)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM projects")
-            conn.close()
-            return True
-        except Exception:
-            return False
-    
-    def check_minions_health(self) -> bool:
-        """Check if all minions are responsive"""
-        try:
-            active_count = sum(1 for minion in self.omni_minions.values() if minion.status != "error")
-            return active_count >= 20  # At least 80% should be healthy
-        except Exception:
-            return False
-    
-    def check_system_resources(self) -> bool:
-        """Check system resource availability"""
-        try:
-            import psutil
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            disk_percent = psutil.disk_usage('/').percent
-            
-            return cpu_percent < 90 and memory_percent < 90 and disk_percent < 90
-        except Exception:
-            return True  # Assume healthy if can't check
-    
-    def check_log_health(self) -> bool:
-        """Check log file accessibility"""
-        try:
-            log_path = "logs/omnitasker_ultimate.log"
-            return os.path.exists(log_path) and os.access(log_path, os.W_OK)
-        except Exception:
-            return False
-    
     def update_system_metrics(self):
         """Update system metrics display"""
         try:
-            # Update metrics
-            self.system_metrics["active_projects"] = len(self.active_projects)
-            self.system_metrics["active_agents"] = sum(
-                1 for minion in self.omni_minions.values() 
-                if minion.status in ["active", "assigned", "working"]
-            )
-            
-            # Update GUI
-            if hasattr(self, 'metric_labels'):
-                self.metric_labels["active_projects"].config(text=str(self.system_metrics["active_projects"]))
-                self.metric_labels["completed_projects"].config(text=str(self.system_metrics["completed_projects"]))
-                self.metric_labels["active_agents"].config(text=str(self.system_metrics["active_agents"]))
-                self.metric_labels["success_rate"].config(text=f"{self.system_metrics['success_rate']:.1f}%")
+            label_texts = {
+                "active_projects": str(self.system_metrics.get("active_projects", len(self.active_projects))),
+                "completed_projects": str(self.system_metrics["completed_projects"]),
+                "active_agents": str(self.system_metrics["active_agents"]),
+                "success_rate": f"{self.system_metrics['success_rate']:.1f}%"
+            }
+            for key, text in label_texts.items():
+                self.metric_labels[key].config(text=text)
             
         except Exception as e:
-            logger.error(f"Metrics update error: {e}")
+            logger.error(f"Metrics display update error: {e}")
     
     def update_minions_display(self):
         """Update the minions tree display"""
         try:
-            # Clear existing items
-            for item in self.minions_tree.get_children():
-                self.minions_tree.delete(item)
-            
-            # Add minions
-            for minion_id, minion in self.omni_minions.items():
+            rows = []
+            for minion_id, minion in list(self.omni_minions.items()):
                 performance_score = minion.performance_metrics.get("efficiency_score", 100.0)
                 
-                self.minions_tree.insert("", tk.END, values=(
+                rows.append((minion_id, (
                     minion.name,
                     minion.role,
                     minion.specialization,
                     minion.status.title(),
                     minion.current_task or "None",
                     f"{performance_score:.1f}%"
-                ))
+                )))
+            
+            # Only changed cells and added/removed rows touch Tk
+            self.minions_tree_renderer.render(rows)
+            
+            role_counts = self.omni_minions.role_counts()
+            for role, label in self.role_count_labels.items():
+                text = f"{role_counts.get(role, 0)} agents"
+                if label.cget("text") != text:
+                    label.config(text=text)
                 
         except Exception as e:
             logger.error(f"Minions display update error: {e}")
@@ -798,87 +420,23 @@ class OmniTaskerUltimateSystem:
     def update_project_display(self):
         """Update the projects tree display"""
         try:
-            # Clear existing items
-            for item in self.project_tree.get_children():
-                self.project_tree.delete(item)
-            
-            # Add projects
-            for project_id, project in self.active_projects.items():
+            rows = []
+            for project_id, project in list(self.active_projects.items()):
                 assigned_count = len(project.get("assigned_minions", []))
                 
-                self.project_tree.insert("", tk.END, values=(
+                rows.append((project_id, (
                     project["name"],
                     project["status"].title(),
                     f"{project.get('progress', 0):.1f}%",
                     f"{assigned_count} agents",
-                    datetime.now().strftime("%Y-%m-%d")
-                ))
-                
-        except Exception as e:
-            logger.error(f"Projects display update error: {e}")
-    
-    def process_task_queue(self):
-        """Process pending tasks in the queue"""
-        try:
-            while not self.task_queue.empty():
-                task = self.task_queue.get_nowait()
-                self.execute_task(task)
-        except queue.Empty:
-            pass
-        except Exception as e:
-            logger.error(f"Task queue processing error: {e}")
-    
-    def execute_task(self, task: Dict[str, Any]):
-        """Execute a specific task"""
-        try:
-            task_type = task.get("type")
+                    project.get("created_at", "")
+                )))
             
-            if task_type == "code_generation":
-                self.handle_code_generation_task(task)
-            elif task_type == "testing":
-                self.handle_testing_task(task)
-            elif task_type == "deployment":
-                self.handle_deployment_task(task)
-            else:
-                logger.warning(f"Unknown task type: {task_type}")
+            # Only changed cells and added/removed rows touch Tk
+            self.project_tree_renderer.render(rows)
                 
         except Exception as e:
-            logger.error(f"Task execution error: {e}")
-    
-    def handle_code_generation_task(self, task: Dict[str, Any]):
-        """Handle code generation tasks"""
-        # Implementation for code generation
-        logger.info(f"Executing code generation task: {task.get('description')}")
-    
-    def handle_testing_task(self, task: Dict[str, Any]):
-        """Handle testing tasks"""
-        # Implementation for testing
-        logger.info(f"Executing testing task: {task.get('description')}")
-    
-    def handle_deployment_task(self, task: Dict[str, Any]):
-        """Handle deployment tasks"""
-        # Implementation for deployment
-        logger.info(f"Executing deployment task: {task.get('description')}")
-    
-    def assign_tasks_to_minions(self):
-        """Assign pending tasks to available minions"""
-        # Implementation for task assignment logic
-        pass
-    
-    def monitor_task_progress(self):
-        """Monitor progress of active tasks"""
-        # Implementation for progress monitoring
-        pass
-    
-    def handle_completed_tasks(self):
-        """Handle tasks that have been completed"""
-        # Implementation for completed task handling
-        pass
-    
-    def check_agent_health(self):
-        """Check health status of all agents"""
-        # Implementation for agent health checking
-        pass
+            logger.error(f"Projects display update error: {e}")
     
     # Additional GUI event handlers
     def view_project_details(self):
@@ -934,35 +492,26 @@ class OmniTaskerUltimateSystem:
     
     def refresh_logs(self):
         """Refresh the logs display"""
-        try:
-            log_path = "logs/omnitasker_ultimate.log"
-            if os.path.exists(log_path):
-                with open(log_path, 'r') as f:
-                    logs = f.read()
-                
-                self.logs_text.delete("1.0", tk.END)
-                self.logs_text.insert(tk.END, logs)
-                self.logs_text.see(tk.END)
-            
-        except Exception as e:
-            logger.error(f"Log refresh error: {e}")
+        self.log_viewer.refresh()
     
     def clear_logs(self):
         """Clear the logs display"""
-        self.logs_text.delete("1.0", tk.END)
+        self.log_viewer.clear()
     
     def export_logs(self):
         """Export logs to file"""
         try:
+            from tkinter import filedialog
             filename = filedialog.asksaveasfilename(
                 defaultextension=".log",
                 filetypes=[("Log files", "*.log"), ("Text files", "*.txt")]
             )
             
             if filename:
-                logs_content = self.logs_text.get("1.0", tk.END)
+                # Exports the lines matching the current filter, streamed from the index
                 with open(filename, 'w') as f:
-                    f.write(logs_content)
+                    for line in self.log_viewer.iter_lines():
+                        f.write(line + "\n")
                 
                 messagebox.showinfo("Success", f"Logs exported to {filename}")
                 
@@ -972,27 +521,21 @@ class OmniTaskerUltimateSystem:
     def save_settings(self):
         """Save system settings"""
         try:
-            settings = {
+            self.engine.save_settings({
                 "openai_api_key": self.openai_key_var.get(),
                 "grok_api_key": self.grok_key_var.get(),
                 "max_concurrent_tasks": self.max_tasks_var.get(),
-                "autosave_interval": self.autosave_var.get()
-            }
-            
-            settings_path = "config/settings.json"
-            os.makedirs("config", exist_ok=True)
-            
-            with open(settings_path, 'w') as f:
-                json.dump(settings, f, indent=2)
+                "autosave_interval": self.autosave_var.get(),
+                "metrics_retention_hours": self.engine.metrics_retention_hours
+            })
             
             messagebox.showinfo("Success", "Settings saved successfully!")
-            logger.info("System settings saved")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {e}")
             logger.error(f"Settings save error: {e}")
     
-    def run(self):
+    def run(self, profile_startup: bool = False):
         """Start the OmniTasker Ultimate System"""
         try:
             # Initialize directories
@@ -1008,6 +551,10 @@ class OmniTaskerUltimateSystem:
             self.update_project_display()
             
             # Start GUI
+            self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+            if profile_startup:
+                # Report once the first frame is drawn and the loop goes idle
+                self.root.after_idle(self.report_startup_profile)
             logger.info("OmniTasker Ultimate System started successfully")
             self.root.mainloop()
             
@@ -1015,21 +562,30 @@ class OmniTaskerUltimateSystem:
             logger.error(f"System startup error: {e}")
             messagebox.showerror("Startup Error", f"Failed to start system: {e}")
     
+    def report_startup_profile(self):
+        """Print the --profile-startup breakdown and close the window"""
+        print(startup_profiler.format_report("OmniTasker_Ultimate_System"))
+        self.on_close()
+    
+    def on_close(self):
+        """Flush buffered state before the main window closes"""
+        self.shutdown()
+        self.root.destroy()
+    
+    def shutdown(self):
+        """Detach from the window and stop the engine"""
+        self.ui_bus.stop()
+        self.engine.shutdown()
+        logger.info("OmniTasker Ultimate System shut down")
+    
+    @startup_profiler.timed
     def load_settings(self):
         """Load system settings"""
-        try:
-            settings_path = "config/settings.json"
-            if os.path.exists(settings_path):
-                with open(settings_path, 'r') as f:
-                    settings = json.load(f)
-                
-                self.openai_key_var.set(settings.get("openai_api_key", ""))
-                self.grok_key_var.set(settings.get("grok_api_key", ""))
-                self.max_tasks_var.set(settings.get("max_concurrent_tasks", 25))
-                self.autosave_var.set(settings.get("autosave_interval", 5))
-                
-        except Exception as e:
-            logger.error(f"Settings load error: {e}")
+        settings = self.engine.load_settings()
+        self.openai_key_var.set(settings.get("openai_api_key", ""))
+        self.grok_key_var.set(settings.get("grok_api_key", ""))
+        self.max_tasks_var.set(settings.get("max_concurrent_tasks", 25))
+        self.autosave_var.set(settings.get("autosave_interval", 5))
 
 class ProjectCreationDialog:
     """Dialog for creating new projects with AI assistance"""
@@ -1042,6 +598,12 @@ class ProjectCreationDialog:
         self.dialog.title("🚀 Create New Project - AI Assisted")
         self.dialog.geometry("800x600")
         self.dialog.configure(bg='#2d2d2d')
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        # Streamed analysis text waiting for the next UI bus tick
+        self._stream_lock = threading.Lock()
+        self._stream_buffer = []
+        self._cancel = None
         
         self.setup_dialog()
     
@@ -1064,7 +626,12 @@ class ProjectCreationDialog:
         self.idea_text.pack(fill=tk.X, padx=10, pady=(0, 10))
         
         # AI Analysis button
-        ttk.Button(idea_frame, text="🤖 Analyze with AI", command=self.analyze_project_idea).pack(pady=10)
+        analyze_frame = ttk.Frame(idea_frame)
+        analyze_frame.pack(pady=10)
+        self.analyze_button = ttk.Button(analyze_frame, text="🤖 Analyze with AI", command=self.analyze_project_idea)
+        self.analyze_button.pack(side=tk.LEFT, padx=5)
+        self.stop_button = ttk.Button(analyze_frame, text="⏹ Stop", command=self.stop_analysis, state="disabled")
+        self.stop_button.pack(side=tk.LEFT, padx=5)
         
         # Analysis results
         results_frame = ttk.LabelFrame(main_frame, text="AI Analysis Results")
@@ -1078,7 +645,7 @@ class ProjectCreationDialog:
         button_frame.pack(fill=tk.X, pady=(10, 0))
         
         ttk.Button(button_frame, text="✅ Create Project", command=self.create_project).pack(side=tk.RIGHT, padx=(5, 0))
-        ttk.Button(button_frame, text="❌ Cancel", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        ttk.Button(button_frame, text="❌ Cancel", command=self.close).pack(side=tk.RIGHT)
     
     def analyze_project_idea(self):
         """Analyze project idea with AI"""
@@ -1090,14 +657,69 @@ class ProjectCreationDialog:
         
         self.results_text.delete("1.0", tk.END)
         self.results_text.insert(tk.END, "🤖 Analyzing project idea...\n\n")
-        
-        # Simulate AI analysis (replace with actual AI integration)
-        analysis = self.simulate_ai_analysis(idea)
-        
-        self.results_text.insert(tk.END, analysis)
+        self.analyze_button.state(["disabled"])
+        self.stop_button.state(["!disabled"])
+        
+        # The model output is read on the LLM client's threads and handed to the
+        # Tk thread through the UI bus, which batches it into one insert per tick
+        cancel = self._cancel = threading.Event()
+        future = self.system.engine.stream_project_analysis(idea, self.receive_chunk, cancel=cancel)
+        future.add_done_callback(
+            lambda done: self.system.ui_bus.post(("analysis", id(self)), self.finish_analysis, idea, cancel, done)
+        )
+    
+    def receive_chunk(self, text: str):
+        """Buffer streamed text (LLM worker thread)"""
+        with self._stream_lock:
+            self._stream_buffer.append(text)
+        self.system.ui_bus.post(("analysis_stream", id(self)), self.flush_stream)
+    
+    def flush_stream(self):
+        """Append everything streamed since the last tick (Tk thread)"""
+        with self._stream_lock:
+            text = "".join(self._stream_buffer)
+            self._stream_buffer.clear()
+        if text and self.dialog.winfo_exists():
+            self.results_text.insert(tk.END, text)
+            self.results_text.see(tk.END)
+    
+    def stop_analysis(self):
+        """Cancel the analysis being streamed"""
+        if self._cancel is not None:
+            self._cancel.set()
+    
+    def finish_analysis(self, idea: str, cancel: threading.Event, future):
+        """Render the end of an analysis (Tk thread)"""
+        if not self.dialog.winfo_exists() or cancel is not self._cancel:
+            return
+        self.flush_stream()
+        self.analyze_button.state(["!disabled"])
+        self.stop_button.state(["disabled"])
+        self._cancel = None
+        try:
+            response = future.result()
+            source = "cached" if response.cached else f"{response.latency:.1f}s"
+            self.results_text.insert(tk.END, f"\n\n📊 Analysis by {response.provider} ({response.model}, {source})")
+        except Exception as e:
+            if cancel.is_set():
+                self.results_text.insert(tk.END, "\n\n⏹ Analysis stopped")
+            elif self.results_text.get("3.0", tk.END).strip():
+                # Part of the analysis arrived before the stream broke
+                self.results_text.insert(tk.END, f"\n\n⚠️ Analysis interrupted: {e}")
+            else:
+                logger.warning(f"AI analysis unavailable: {e}")
+                self.results_text.delete("1.0", tk.END)
+                self.results_text.insert(tk.END, f"⚠️ AI analysis unavailable ({e})\nShowing an offline estimate instead.\n\n")
+                self.results_text.insert(tk.END, self.simulate_ai_analysis(idea))
+        self.results_text.see(tk.END)
+    
+    def close(self):
+        """Stop any analysis in progress and close the dialog"""
+        self.stop_analysis()
+        self.dialog.destroy()
     
     def simulate_ai_analysis(self, idea: str) -> str:
-        """Simulate AI analysis of project idea"""
+        """Offline analysis of a project idea, used when no LLM provider answers"""
         return f"""📊 PROJECT ANALYSIS COMPLETE
 
 🎯 PROJECT OVERVIEW:
@@ -1147,38 +769,43 @@ Click 'Create Project' to start development with your AI team!
         # Extract project name from idea (simple approach)
         project_name = idea.split('.')[0][:50] if '.' in idea else idea[:50]
         
-        # Create project in main system
-        project_id = str(uuid.uuid4())
-        
-        self.system.active_projects[project_id] = {
-            "name": project_name,
-            "description": idea,
-            "status": "planning",
-            "tech_stack": "React + Node.js",
-            "assigned_minions": [
+        # Create project in main system (the engine refreshes the displays)
+        self.system.engine.create_project(
+            project_name, idea, "React + Node.js",
+            assigned_minions=[
                 "coder_1", "coder_2", "tester_1", "designer_1",
                 "devops_1", "liaison_1", "researcher_1", "integrator_1"
-            ],
-            "progress": 0.0
-        }
-        
-        # Update displays
-        self.system.update_project_display()
+            ]
+        )
         
         messagebox.showinfo("Success", f"Project '{project_name}' created with AI assistance!")
         logger.info(f"AI-assisted project created: {project_name}")
         
-        self.dialog.destroy()
+        self.close()
 
 def main():
     """Main entry point"""
+    parser = build_arg_parser()
+    parser.add_argument("--headless", action="store_true",
+                        help="run the engine without the Tk GUI")
+    args = parser.parse_args()
+    
+    if args.headless:
+        run_headless(args)
+        return
+    
     try:
-        # Create logs directory
-        os.makedirs('logs', exist_ok=True)
-        
-        # Initialize and run the system
-        system = OmniTaskerUltimateSystem()
-        system.run()
+        # Non-blocking, rotating log pipeline (creates logs/ if needed)
+        configure_logging(json_lines=args.log_json)
+        
+        # Start the engine, then attach the GUI to it
+        engine = OmniTaskerEngine(fleet_path=args.fleet)
+        engine.start(use_async_core=args.async_core, process_workers=args.process_workers,
+                     broker_path=args.broker, metrics_port=args.metrics_port)
+        if args.api:
+            engine.start_api(args.api_host, args.api_port)
+        system = OmniTaskerUltimateSystem(engine)
+        system.run(profile_startup=args.profile_startup)
         
     except Exception as e:
         print(f"Failed to start OmniTasker Ultimate System: {e}")
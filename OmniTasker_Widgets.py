@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+OmniTasker Widgets - Tk helpers for the OmniTasker GUI
+Incremental rendering for large Treeviews and a thread-safe UI update bus
+"""
+
+import logging
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Dict, Iterable, Tuple, Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedTreeRenderer:
+    """Keeps a ttk.Treeview in sync with keyed rows, touching only what changed
+
+    Rows are identified by a stable iid (minion_id, project_id, ...). The
+    values last written for each row are cached, so a refresh costs one Tk
+    call per changed cell plus one per added or removed row, instead of
+    deleting and re-inserting the whole tree. Stable iids also keep the
+    user's selection and scroll position across refreshes.
+    """
+
+    def __init__(self, tree: ttk.Treeview):
+        self.tree = tree
+        self.columns = tuple(tree["columns"])
+        self._rendered: Dict[str, Tuple] = {}
+
+    def render(self, rows: Iterable[Tuple[str, Tuple]]) -> Dict[str, int]:
+        """Apply ``(iid, values)`` rows; returns counts of inserted/updated/deleted rows"""
+        counts = {"inserted": 0, "updated": 0, "deleted": 0}
+        seen = set()
+
+        for iid, values in rows:
+            values = tuple(values)
+            seen.add(iid)
+            previous = self._rendered.get(iid)
+
+            if previous is None:
+                self.tree.insert("", tk.END, iid=iid, values=values)
+                counts["inserted"] += 1
+            elif previous != values:
+                for column, old, new in zip(self.columns, previous, values):
+                    if old != new:
+                        self.tree.set(iid, column, new)
+                counts["updated"] += 1
+            else:
+                continue
+            self._rendered[iid] = values
+
+        for iid in [iid for iid in self._rendered if iid not in seen]:
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+            del self._rendered[iid]
+            counts["deleted"] += 1
+
+        return counts
+
+    def clear(self):
+        """Remove every row this renderer owns"""
+        self.render(())
+
+
+class UIUpdateBus:
+    """Queues widget updates from background threads for the Tk main loop
+
+    Tkinter is not thread-safe, so worker threads ``post`` callables here
+    instead of touching widgets. The main loop drains the queue in batches on
+    a ``root.after`` tick. Posts share a key per widget (or per refresh), and
+    a newer post replaces an older one that has not run yet, so a burst of
+    updates to one widget costs a single redraw per tick.
+    """
+
+    def __init__(self, root: tk.Misc, interval_ms: int = 100, max_batch: int = 500):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[Hashable, Tuple[Callable, tuple, dict]]" = OrderedDict()
+        self._after_id = None
+        self._stats = {"posted": 0, "coalesced": 0, "applied": 0, "errors": 0}
+
+    def post(self, key: Hashable, callback: Callable, *args: Any, **kwargs: Any):
+        """Schedule ``callback(*args, **kwargs)`` on the Tk thread (callable from any thread)"""
+        with self._lock:
+            self._stats["posted"] += 1
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+                del self._pending[key]
+            self._pending[key] = (callback, args, kwargs)
+
+    def start(self):
+        """Begin draining on the Tk main loop"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def _drain(self):
+        with self._lock:
+            batch = []
+            while self._pending and len(batch) < self.max_batch:
+                batch.append(self._pending.popitem(last=False)[1])
+
+        for callback, args, kwargs in batch:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"UI update error: {e}")
+        self._stats["applied"] += len(batch)
+
+        self._after_id = self.root.after(self.interval_ms, self._drain)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite task broker on a temporary database
+Leasing by capability, lease ownership, reaping expired leases and
+following changes with changes_since
+"""
+
+import pytest
+
+from OmniTasker_Broker import TaskBroker
+
+
+@pytest.fixture
+def broker(tmp_path):
+    broker = TaskBroker(str(tmp_path / "broker.db"), max_attempts=2)
+    broker.initialize_schema()
+    yield broker
+    broker.close()
+
+
+def expire_leases(broker):
+    with broker._write() as conn:
+        conn.execute("UPDATE broker_tasks SET lease_expires = 0 WHERE state = 'leased'")
+
+
+def states(broker):
+    return broker.get_stats()["tasks"]
+
+
+def test_lease_matches_capabilities_in_priority_order(broker):
+    broker.enqueue([
+        {"id": "design", "type": "design", "priority": 5},
+        {"id": "urgent", "type": "code_generation", "priority": 1},
+        {"id": "later", "type": "code_generation", "priority": 9},
+    ])
+    leased = broker.lease("worker-1", "coder", ["code_generation"], limit=5)
+    assert [(task["id"], task["attempt"]) for task in leased] == [("urgent", 1), ("later", 1)]
+    assert broker.lease("worker-1", "coder", ["code_generation"]) == []
+    assert states(broker) == {"queued": 1, "leased": 2}
+
+
+def test_only_the_current_lease_can_complete(broker):
+    broker.enqueue([{"id": "t1", "type": "design"}])
+    first = broker.lease("worker-1", "designer", ["visual_design"])[0]
+    expire_leases(broker)
+    assert broker.reap() == 1
+
+    second = broker.lease("worker-2", "designer", ["visual_design"])[0]
+    assert second["attempt"] == 2
+    assert not broker.complete("t1", "worker-1", first["attempt"], result="stale")
+    assert broker.complete("t1", "worker-2", second["attempt"], result="fresh")
+    assert states(broker) == {"done": 1}
+
+
+def test_reap_fails_tasks_out_of_attempts(broker):
+    broker.enqueue([{"id": "t1", "type": "design"}])
+    for worker_id in ("worker-1", "worker-2"):
+        assert broker.lease(worker_id, "designer", ["visual_design"])
+        expire_leases(broker)
+        broker.reap()
+
+    assert states(broker) == {"failed": 1}
+    rows, _ = broker.changes_since()
+    assert rows[-1]["error"] == "lease expired 2 times"
+
+
+def test_idle_polls_and_reaps_do_not_write(broker):
+    cursor = broker.current_cursor()
+    assert broker.lease("worker-1", "designer", ["visual_design"]) == []
+    assert broker.reap() == 0
+    assert broker.current_cursor() == cursor
+
+
+def test_changes_since_pages_through_one_large_operation(broker):
+    cursor = broker.current_cursor()
+    task_ids = broker.enqueue([{"type": "design"} for _ in range(1500)])
+
+    seen = []
+    while True:
+        rows, cursor = broker.changes_since(cursor, limit=1000)
+        if not rows:
+            break
+        seen.extend(row["id"] for row in rows)
+    assert seen == task_ids
+
+    # Later transitions show up after the cursor, earlier ones do not come back
+    broker.lease("worker-1", "designer", ["visual_design"])
+    rows, _ = broker.changes_since(cursor)
+    assert [(row["id"], row["state"]) for row in rows] == [(task_ids[0], "leased")]
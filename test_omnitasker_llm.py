@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled LLM client against local stub chat-completion servers
+Failover, Retry-After cooldowns and server-sent-events streaming
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from OmniTasker_LLM import LLMClient, LLMError, ProviderConfig
+
+
+class StubProvider:
+    """OpenAI-compatible /chat/completions endpoint answering from a script
+
+    ``responses`` is consumed one entry per request; the last entry repeats.
+    An entry is ``(status, headers, body)``; a list body is streamed as
+    server-sent events, one ``data:`` line per text piece.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append(json.loads(body))
+                status, headers, reply = stub.responses.pop(0) if len(stub.responses) > 1 else stub.responses[0]
+                if isinstance(reply, list):
+                    payload = "".join(
+                        f"data: {json.dumps({'model': 'stub', 'choices': [{'delta': {'content': piece}}]})}\n\n"
+                        for piece in reply
+                    ) + "data: [DONE]\n\n"
+                    content_type = "text/event-stream"
+                else:
+                    payload = json.dumps(reply)
+                    content_type = "application/json"
+                data = payload.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def config(self, name: str, **kwargs) -> ProviderConfig:
+        return ProviderConfig(name=name, base_url=f"http://127.0.0.1:{self.server.server_port}/v1",
+                              model=f"{name}-model", api_key="test-key", **kwargs)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def completion(text: str):
+    return 200, {}, {"model": "stub", "choices": [{"message": {"content": text}}], "usage": {"total_tokens": 3}}
+
+
+@pytest.fixture
+def stubs():
+    created = []
+
+    def make(*responses):
+        stub = StubProvider(responses)
+        created.append(stub)
+        return stub
+
+    yield make
+    for stub in created:
+        stub.close()
+
+
+def test_fails_over_to_next_provider(stubs):
+    openai = stubs((503, {}, {"error": "overloaded"}))
+    grok = stubs(completion("from grok"))
+    client = LLMClient([openai.config("openai"), grok.config("grok")])
+    try:
+        response = client.complete("Plan a todo app", use_cache=False)
+        assert (response.text, response.provider) == ("from grok", "grok")
+        assert grok.requests[0]["model"] == "grok-model"
+
+        stats = client.get_stats()
+        assert stats["failovers"] == 1
+        assert stats["providers"]["openai"]["failures"] == 1
+        assert not stats["providers"]["openai"]["available"]
+    finally:
+        client.close()
+
+
+def test_client_error_does_not_fail_over(stubs):
+    openai = stubs((400, {}, {"error": "bad request"}))
+    grok = stubs(completion("from grok"))
+    client = LLMClient([openai.config("openai"), grok.config("grok")])
+    try:
+        with pytest.raises(LLMError):
+            client.complete("Plan a todo app", use_cache=False)
+        assert grok.requests == []
+    finally:
+        client.close()
+
+
+def test_retry_after_sets_the_cooldown(stubs):
+    openai = stubs((429, {"Retry-After": "120"}, {"error": "rate limited"}), completion("from openai"))
+    grok = stubs(completion("from grok"))
+    client = LLMClient([openai.config("openai"), grok.config("grok")])
+    try:
+        assert client.complete("first", use_cache=False).provider == "grok"
+        # openai stays skipped for its Retry-After, although its stub would answer now
+        assert client.complete("second", use_cache=False).provider == "grok"
+        assert len(openai.requests) == 1
+
+        cooldown = client._providers[0].unavailable_until - time.time()
+        assert 110 < cooldown <= 120
+    finally:
+        client.close()
+
+
+def test_streams_server_sent_events(stubs):
+    openai = stubs((200, {}, ["Hello", ", ", "world"]))
+    client = LLMClient([openai.config("openai")])
+    chunks = []
+    try:
+        response = client.stream("Say hello", chunks.append, use_cache=False)
+        assert chunks == ["Hello", ", ", "world"]
+        assert response.text == "Hello, world"
+        assert response.first_chunk_latency is not None
+        assert openai.requests[0]["stream"] is True
+    finally:
+        client.close()
+
+
+def test_stream_fails_over_before_the_first_chunk(stubs):
+    openai = stubs((502, {}, {"error": "bad gateway"}))
+    grok = stubs((200, {}, ["from ", "grok"]))
+    client = LLMClient([openai.config("openai"), grok.config("grok")])
+    chunks = []
+    try:
+        response = client.stream("Say hello", chunks.append, use_cache=False)
+        assert response.provider == "grok"
+        assert "".join(chunks) == "from grok"
+    finally:
+        client.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for project pipelines on a temporary SQLite database
+Planning, critical paths, release order, failure handling and recovery
+after a restart
+"""
+
+import pytest
+
+from OmniTasker_Database import OmniDatabase
+from OmniTasker_Pipeline import PipelineExecutor, critical_path, plan_pipeline
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = OmniDatabase(str(tmp_path / "omnitasker.db"))
+    database.initialize_schema()
+    yield database
+    database.close()
+
+
+class Pipelines:
+    """A PipelineExecutor whose submissions and progress reports are recorded"""
+
+    def __init__(self, database):
+        self.submitted = []
+        self.progress = {}
+        self.executor = PipelineExecutor(database, self.submitted.extend, self.progress.__setitem__)
+
+    def released(self):
+        return [(task["stage"], task["component"]) for task in self.submitted]
+
+    def finish(self, stage, outcome="completed"):
+        """Finish every submitted task of ``stage``"""
+        for task in [task for task in self.submitted if task["stage"] == stage]:
+            self.executor.task_finished(task, outcome)
+
+
+def statuses(database):
+    rows = database.pool.connection().execute("SELECT status, COUNT(*) AS count FROM tasks GROUP BY status")
+    return {row["status"]: row["count"] for row in rows}
+
+
+def test_plan_fans_out_per_component_until_the_join():
+    tasks = plan_pipeline("p1", "Shop", ["web", "api"])
+    by_id = {task["id"]: task for task in tasks}
+
+    assert [task["stage"] for task in tasks].count("test") == 4
+    deploy = tasks[-1]
+    assert deploy["stage"] == "deploy" and deploy["component"] is None
+    assert sorted(by_id[dependency]["stage"] for dependency in deploy["depends_on"]) == ["test"] * 4
+    # Each component's branch only depends on its own earlier stage
+    for task in tasks:
+        if task["component"] is not None:
+            assert all(by_id[dependency]["component"] == task["component"] for dependency in task["depends_on"])
+
+
+def test_critical_path_follows_the_longest_chain():
+    tasks = [
+        {"id": "design", "hours": 2.0},
+        {"id": "slow", "hours": 5.0, "depends_on": ["design"]},
+        {"id": "fast", "hours": 1.0, "depends_on": ["design"]},
+        {"id": "deploy", "hours": 1.0, "depends_on": ["slow", "fast"]},
+    ]
+    assert critical_path(tasks, lambda task: task["hours"]) == (8.0, ["design", "slow", "deploy"])
+    assert critical_path([], lambda task: 1.0) == (0.0, [])
+
+
+def test_tasks_are_released_once_their_dependencies_complete(database):
+    pipelines = Pipelines(database)
+    pipelines.executor.start_project("p1", "Shop", "web + api")
+    assert pipelines.released() == [("design", "web"), ("design", "api")]
+
+    # One component's branch moves on without waiting for the other
+    web_design = pipelines.submitted[0]
+    pipelines.executor.task_finished(web_design, "completed")
+    assert pipelines.released()[2:] == [("code", "web")]
+
+    pipelines.executor.task_finished(pipelines.submitted[1], "completed")
+    pipelines.finish("code")
+    assert ("deploy", None) not in pipelines.released()
+    pipelines.finish("test")
+    assert pipelines.released()[-1] == ("deploy", None)
+    pipelines.finish("deploy")
+    assert pipelines.progress["p1"] == {"total": 9, "completed": 9, "failed": 0, "skipped": 0}
+
+
+def test_failure_skips_everything_downstream(database):
+    pipelines = Pipelines(database)
+    pipelines.executor.start_project("p1", "Shop", "web + api")
+    web_design, api_design = pipelines.submitted
+    pipelines.executor.task_finished(web_design, "failed")
+
+    # code, two tests and the deploy join of the failed branch
+    assert pipelines.progress["p1"] == {"total": 9, "completed": 0, "failed": 1, "skipped": 4}
+    assert statuses(database)["skipped"] == 4
+
+    pipelines.executor.task_finished(api_design, "completed")
+    pipelines.finish("code")
+    pipelines.finish("test")
+    assert ("deploy", None) not in pipelines.released()
+    assert pipelines.executor.get_stats()["waiting_tasks"] == 0
+
+
+def test_recover_resumes_where_the_previous_run_stopped(database):
+    first_run = Pipelines(database)
+    first_run.executor.start_project("p1", "Shop", "web")
+    design = first_run.submitted[0]
+    with database.pool.transaction() as conn:
+        conn.execute("UPDATE tasks SET status = 'completed' WHERE id = ?", (design["id"],))
+
+    pipelines = Pipelines(database)
+    assert pipelines.executor.recover(["p1", "unknown"]) == 1
+    assert pipelines.released() == [("code", "web")]
+    assert pipelines.progress == {"p1": {"total": 5, "completed": 1, "failed": 0, "skipped": 0}}
+    assert pipelines.executor.get_stats()["waiting_tasks"] == 3
+
+
+def test_engine_restart_fails_tasks_out_of_attempts(tmp_path, monkeypatch):
+    from OmniTasker_Engine import OmniTaskerEngine
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OMNITASKER_FLEET", raising=False)
+    first_run = OmniTaskerEngine()
+    project_id = first_run.create_project("Shop", tech_stack="web")
+    with first_run.project_database.pool.transaction() as conn:
+        # The previous run lost the released design task on every delivery
+        conn.execute("UPDATE tasks SET status = 'assigned', attempts = 3 WHERE status = 'pending'")
+    first_run.project_database.close()
+
+    engine = OmniTaskerEngine()
+    engine.start(use_async_core=True, process_workers=0, broker_path="", metrics_port=0)
+    try:
+        assert engine.active_projects[project_id]["status"] == "failed"
+        assert engine.pipeline_report(project_id)["by_status"] == {"failed": 1, "skipped": 4}
+    finally:
+        engine.shutdown()
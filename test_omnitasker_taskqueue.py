@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable task queue on a temporary SQLite database
+Group commits, leases and their expiry, replay after a restart and tasks
+that run out of delivery attempts
+"""
+
+import pytest
+
+from OmniTasker_Database import OmniDatabase
+from OmniTasker_TaskQueue import DurableTaskQueue
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = OmniDatabase(str(tmp_path / "omnitasker.db"))
+    database.initialize_schema()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def durable_queue(database):
+    durable_queue = DurableTaskQueue(database, max_attempts=2)
+    durable_queue.start()
+    yield durable_queue
+    durable_queue.stop()
+
+
+def task(task_id: str, priority: int = 5):
+    return {"id": task_id, "type": "design", "title": task_id, "priority": priority}
+
+
+def statuses(database):
+    rows = database.pool.connection().execute("SELECT id, status, attempts FROM tasks")
+    return {row["id"]: (row["status"], row["attempts"]) for row in rows}
+
+
+def expire_leases(database):
+    with database.pool.transaction() as conn:
+        conn.execute("UPDATE tasks SET lease_expires = 0 WHERE status = 'assigned'")
+
+
+def test_enqueue_is_committed_before_it_returns(database, durable_queue):
+    durable_queue.enqueue([task("low", priority=7), task("high", priority=1)])
+    assert statuses(database) == {"low": ("pending", 0), "high": ("pending", 0)}
+
+    tasks, exhausted = durable_queue.replay()
+    assert [replayed["id"] for replayed in tasks] == ["high", "low"]
+    assert exhausted == []
+
+
+def test_replay_requeues_leased_tasks(database, durable_queue):
+    durable_queue.enqueue([task("a"), task("b")])
+    durable_queue.lease(task("a"), "coder_1")
+    assert durable_queue.flush()
+    assert statuses(database)["a"] == ("assigned", 1)
+
+    # After a restart a lease is not waited out, expired or not
+    tasks, exhausted = durable_queue.replay()
+    assert sorted(replayed["id"] for replayed in tasks) == ["a", "b"]
+    assert durable_queue.flush()
+    assert statuses(database)["a"] == ("pending", 1)
+
+
+def test_expired_skips_tasks_still_running(database, durable_queue):
+    durable_queue.enqueue([task("running"), task("lost")])
+    durable_queue.lease(task("running"), "coder_1")
+    durable_queue.lease(task("lost"), "coder_2")
+    assert durable_queue.flush()
+    assert durable_queue.expired() == ([], [])
+
+    expire_leases(database)
+    tasks, exhausted = durable_queue.expired(exclude=["running"])
+    assert [redelivered["id"] for redelivered in tasks] == ["lost"]
+    assert durable_queue.flush()
+    assert statuses(database) == {"running": ("assigned", 1), "lost": ("pending", 1)}
+
+
+def test_exhausted_tasks_are_returned_for_the_caller_to_fail(database, durable_queue):
+    durable_queue.enqueue([task("flaky")])
+    for minion_id in ("coder_1", "coder_2"):
+        durable_queue.lease(task("flaky"), minion_id)
+        assert durable_queue.flush()
+        expire_leases(database)
+        tasks, exhausted = durable_queue.expired()
+
+    assert tasks == []
+    assert [failed["id"] for failed in exhausted] == ["flaky"]
+    # Left leased: finishing it is up to the caller, so its pipeline hears of the failure
+    assert durable_queue.flush()
+    assert statuses(database)["flaky"] == ("assigned", 2)
+
+
+def test_failed_commit_updates_are_retried(database, durable_queue, monkeypatch):
+    durable_queue.enqueue([task("a")])
+    apply = database.apply_task_operations
+    calls = []
+
+    def fail_once(operations):
+        calls.append(operations)
+        if len(calls) == 1:
+            raise RuntimeError("disk I/O error")
+        apply(operations)
+
+    monkeypatch.setattr(database, "apply_task_operations", fail_once)
+    durable_queue.finish(task("a"), "completed")
+    assert durable_queue.flush()
+    assert len(calls) == 2
+    assert statuses(database)["a"] == ("completed", 0)
+    assert durable_queue.get_stats()["commit_errors"] == 1